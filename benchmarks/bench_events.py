@@ -0,0 +1,71 @@
+"""
+Event hook overhead benchmark: nanoseconds per submit + run for
+submit_task / run_next_task and for batched submit_many / run_batch, with
+no listeners, with a no-op listener on every event, and with the logging
+listeners installed by events.log_to() while the logger is disabled.
+
+Usage:
+    python benchmarks/bench_events.py
+    python benchmarks/bench_events.py --jobs 500000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import Scheduler  # noqa: E402
+from task_scheduler.events import EVENTS  # noqa: E402
+
+
+def noop(*args):
+    pass
+
+
+def make(mode):
+    s = Scheduler(53)
+    if mode == "noop":
+        for event in EVENTS:
+            s.events.add(event, noop)
+    elif mode == "logging":
+        s.events.log_to(level=logging.DEBUG)
+    return s
+
+
+def single(s, n):
+    start = time.perf_counter()
+    for i in range(n):
+        s.submit_task(i)
+    for _ in range(n):
+        s.run_next_task()
+    return time.perf_counter() - start
+
+
+def batched(s, n, batch=256):
+    start = time.perf_counter()
+    for lo in range(0, n, batch):
+        s.submit_many(range(lo, min(lo + batch, n)))
+        s.run_batch(batch)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("task_scheduler").setLevel(logging.WARNING)
+
+    print(f"{'listeners':>10} {'ns/op single':>13} {'ns/op batch':>12}")
+    for mode in ("none", "noop", "logging"):
+        one = min(single(make(mode), args.jobs) for _ in range(args.repeat))
+        many = min(batched(make(mode), args.jobs) for _ in range(args.repeat))
+        print(f"{mode:>10} {1e9 * one / args.jobs:>13.0f} {1e9 * many / args.jobs:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+History analytics benchmark: p99 queue wait and per-minute throughput over a
+large history, computed by iterating Job objects from display_history()
+versus the columnar HistoryColumns queries (NumPy when installed).
+
+Usage:
+    python benchmarks/bench_history.py
+    python benchmarks/bench_history.py --jobs 5000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import Job  # noqa: E402
+from task_scheduler import history_columns  # noqa: E402
+from task_scheduler.history_list import HistoryList  # noqa: E402
+
+
+def build(n):
+    base = datetime(2025, 1, 1)
+    history = HistoryList()
+    jobs = []
+    for i in range(n):
+        job = Job(i, submit_timestamp=base + timedelta(milliseconds=i))
+        job.status = "executed"
+        job.execution_timestamp = job.submit_timestamp + timedelta(microseconds=(i * 7919) % 100000)
+        job.end_timestamp = job.execution_timestamp
+        jobs.append(job)
+    history.extend(jobs)
+    return base, history
+
+
+def from_objects(history, since):
+    waits = []
+    buckets = {}
+    for job in history.display_history():
+        if job.end_timestamp < since:
+            continue
+        waits.append((job.execution_timestamp - job.submit_timestamp).total_seconds())
+        minute = int((job.end_timestamp - since).total_seconds() // 60)
+        buckets[minute] = buckets.get(minute, 0) + 1
+    waits.sort()
+    return waits[int(0.99 * (len(waits) - 1))], len(buckets)
+
+
+def from_columns(history, since):
+    cols = history.columns()
+    p99 = cols.wait_percentiles((99,), since=since)[99]
+    return p99, len(cols.throughput(60.0, since=since))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000000)
+    args = parser.parse_args()
+
+    base, history = build(args.jobs)
+    since = base + timedelta(milliseconds=args.jobs // 2)
+    backend = "numpy" if history_columns.np is not None else "array"
+
+    start = time.perf_counter()
+    history.columns()
+    build_time = time.perf_counter() - start
+
+    for name, query in (("objects", from_objects), (f"columns/{backend}", from_columns)):
+        start = time.perf_counter()
+        p99, buckets = query(history, since)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>14}: p99 wait {p99:.6f}s, {buckets} minute buckets in {elapsed:.3f}s")
+    print(f"{'':>14}  (one-off column build: {build_time:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
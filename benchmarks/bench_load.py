@@ -0,0 +1,120 @@
+"""
+Restart benchmark: time and peak RSS of Scheduler.load_from_file.
+
+Each measurement runs in a fresh subprocess so peak RSS (ru_maxrss) only
+covers the load itself. Three file layouts are compared:
+  - legacy:    the old pretty-printed JSON document (json.load + per-record inserts)
+  - streaming: the line-per-record snapshot written by save_to_file
+  - binary:    the fixed-width snapshot written by save_to_file(format="binary")
+
+Usage:
+    python benchmarks/bench_load.py                 # 10^6 and 10^7 jobs
+    python benchmarks/bench_load.py --sizes 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import Job  # noqa: E402
+from task_scheduler.binary_snapshot import write_binary_snapshot  # noqa: E402
+from task_scheduler.snapshot_io import write_json_snapshot  # noqa: E402
+
+
+def make_records(n):
+    """Half queued, half executed job dicts with realistic timestamps."""
+    base = datetime(2025, 1, 1)
+    queue, history = [], []
+    for i in range(n):
+        submitted = base + timedelta(microseconds=i * 37)
+        if i % 2:
+            queue.append({"job_id": i, "submit_timestamp": submitted.isoformat(),
+                          "status": "queued", "execution_timestamp": None})
+        else:
+            history.append({"job_id": i, "submit_timestamp": submitted.isoformat(),
+                            "status": "executed",
+                            "execution_timestamp": (submitted + timedelta(seconds=1)).isoformat()})
+    return queue, history
+
+
+def write_files(n, directory):
+    queue, history = make_records(n)
+    legacy = os.path.join(directory, f"legacy_{n}.json")
+    with open(legacy, "w") as f:
+        json.dump({"queue": queue, "history": history}, f, indent=2)
+    streaming = os.path.join(directory, f"streaming_{n}.json")
+    write_json_snapshot(streaming, 0, {"queue": queue, "scheduled": [], "history": history})
+    binary = os.path.join(directory, f"binary_{n}.bin")
+    write_binary_snapshot(binary, 0, [Job.from_dict(d) for d in queue],
+                          [Job.from_dict(d) for d in history])
+    return legacy, streaming, binary
+
+
+def legacy_load(filename):
+    """The original load_from_file: whole-document parse, checked inserts, old-size table."""
+    from task_scheduler import Scheduler, Job
+    s = Scheduler(7)
+    with open(filename) as f:
+        data = json.load(f)
+    for d in data.get("queue", []):
+        s.hash.insert(s.queue.enqueue(Job.from_dict(d)))
+    for d in data.get("history", []):
+        job = Job.from_dict(d)
+        s.hash.insert(s.history.add_to_history(job))
+        s.executed_ids.add(job.job_id)
+    return s
+
+
+def child(mode, filename):
+    """Run one load and print seconds and peak RSS (MB) as JSON."""
+    from task_scheduler import Scheduler
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        s = legacy_load(filename)
+    else:
+        s = Scheduler(7)
+        s.load_from_file(filename)
+    elapsed = time.perf_counter() - start
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": rss_mb,
+                      "jobs": s.queue.size + len(s.executed_ids)}))
+
+
+def measure(mode, filename):
+    out = subprocess.run([sys.executable, __file__, "--child", mode, filename],
+                         check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 6, 10 ** 7])
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    print(f"{'jobs':>10} {'layout':>10} {'file MB':>9} {'load s':>8} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as d:
+        for n in args.sizes:
+            legacy, streaming, binary = write_files(n, d)
+            for mode, path in (("legacy", legacy), ("streaming", streaming), ("binary", binary)):
+                r = measure(mode, path)
+                size_mb = os.path.getsize(path) / 2 ** 20
+                print(f"{n:>10} {mode:>10} {size_mb:>9.1f} {r['seconds']:>8.2f} {r['peak_rss_mb']:>12.1f}")
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
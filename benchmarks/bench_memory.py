@@ -0,0 +1,78 @@
+"""
+Memory benchmark: bytes per queued job and per history job, measured with
+tracemalloc, for the default Job representation and Scheduler(compact=True);
+and bytes per executed ID for each dedup store, with mostly monotonic IDs
+(one gap every 1000 IDs).
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --jobs 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import Scheduler  # noqa: E402
+from task_scheduler.dedup import make_dedup  # noqa: E402
+
+DEDUP_STORES = (("exact", {}), ("intervals", {}),
+                ("bloom", {"capacity": 1000000, "error_rate": 0.01}), ("ttl", {"ttl": 3600}))
+
+
+def measure(n, compact):
+    """Return (bytes per queued job, bytes per history job)."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    s = Scheduler(53, compact=compact)
+    s.submit_many(range(n))
+    queued = tracemalloc.get_traced_memory()[0] - base
+    s.run_all()
+    gc.collect()
+    executed = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return queued / n, executed / n
+
+
+def measure_dedup(n, kind, options):
+    """Return bytes per ID held by a dedup store."""
+    ids = [i + i // 1000 for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    store = make_dedup(kind, **options)
+    store.update(ids)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return used / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} {'jobs':>10} {'B/queued job':>13} {'B/history job':>14}")
+    results = {}
+    for mode, compact in (("default", False), ("compact", True)):
+        results[mode] = measure(args.jobs, compact)
+        q, h = results[mode]
+        print(f"{mode:>8} {args.jobs:>10} {q:>13.1f} {h:>14.1f}")
+    q0, h0 = results["default"]
+    q1, h1 = results["compact"]
+    print(f"compact saves {100 * (1 - q1 / q0):.0f}% per queued job, {100 * (1 - h1 / h0):.0f}% per history job")
+
+    print()
+    print(f"{'dedup':>10} {'ids':>10} {'B/id':>8}")
+    for kind, options in DEDUP_STORES:
+        print(f"{kind:>10} {args.jobs:>10} {measure_dedup(args.jobs, kind, options):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Network benchmark: requests/sec, jobs/sec and latency percentiles of
+SchedulerServer over loopback for batch sizes 1 to 1000.
+
+The server runs in its own process. For each batch size the client sends
+submit_many, then find_jobs, then run_batch requests of that many jobs,
+keeping --inflight requests pipelined over a pool of --connections.
+Latency is measured per request, from send to response.
+
+Usage:
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --batches 1 10 100 1000 --inflight 32
+    python benchmarks/bench_server.py --unix /tmp/sched.sock
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import SchedulerClient, SchedulerServer  # noqa: E402
+
+
+def serve(conn, path):
+    async def run():
+        server = SchedulerServer(path=path, hash_size=65521, metrics=False)
+        await server.start()
+        conn.send(server.address)
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+async def drive(client, requests, inflight, make_call):
+    """Run `requests` calls with `inflight` in flight; return (seconds, latencies)."""
+    latencies = []
+    remaining = iter(range(requests))
+    clock = time.perf_counter
+
+    async def worker():
+        for i in remaining:
+            t0 = clock()
+            await make_call(i)
+            latencies.append(clock() - t0)
+
+    start = clock()
+    await asyncio.gather(*(worker() for _ in range(inflight)))
+    return clock() - start, latencies
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * p // 100)]
+
+
+async def bench(address, args):
+    host, port, path = (None, None, address) if isinstance(address, str) else (*address, None)
+    next_id = 0
+    print(f"{'op':>12} {'batch':>6} {'requests':>9} {'req/s':>10} {'jobs/s':>11} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    async with SchedulerClient(host or "127.0.0.1", port or 0, path=path,
+                               pool_size=args.connections) as client:
+        for batch in args.batches:
+            requests = max(10, min(args.requests, args.jobs // batch))
+            base = next_id
+            next_id += requests * batch
+
+            def ids(i):
+                lo = base + i * batch
+                return range(lo, lo + batch)
+
+            ops = (("submit_many", lambda i: client.submit_many(ids(i))),
+                   ("find_jobs", lambda i: client.find_jobs(ids(i))),
+                   ("run_batch", lambda i: client.run_batch(batch)))
+            for name, call in ops:
+                seconds, latencies = await drive(client, requests, args.inflight, call)
+                print(f"{name:>12} {batch:>6} {requests:>9} {requests / seconds:>10,.0f} "
+                      f"{requests * batch / seconds:>11,.0f} {percentile(latencies, 50) * 1e3:>8.2f} "
+                      f"{percentile(latencies, 99) * 1e3:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", nargs="+", type=int, default=[1, 10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=5000, help="maximum requests per op and batch size")
+    parser.add_argument("--jobs", type=int, default=200000, help="maximum jobs per op and batch size")
+    parser.add_argument("--inflight", type=int, default=16, help="pipelined requests in flight")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--unix", help="use this Unix socket path instead of TCP loopback")
+    args = parser.parse_args()
+
+    parent, child = multiprocessing.Pipe()
+    proc = multiprocessing.Process(target=serve, args=(child, args.unix), daemon=True)
+    proc.start()
+    try:
+        address = parent.recv()
+        print(f"{os.cpu_count() or 1} CPU core(s), server at {address}, "
+              f"{args.inflight} in flight over {args.connections} connection(s)")
+        asyncio.run(bench(address, args))
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
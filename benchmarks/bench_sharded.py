@@ -0,0 +1,50 @@
+"""
+Sharding benchmark: jobs/sec of submit_many + run_all through
+ShardedScheduler for an increasing number of shard processes, compared with
+a single in-process Scheduler. Throughput should grow roughly linearly with
+the shard count up to the number of CPU cores.
+
+Usage:
+    python benchmarks/bench_sharded.py
+    python benchmarks/bench_sharded.py --jobs 2000000 --shards 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import Scheduler, ShardedScheduler  # noqa: E402
+
+
+def drive(sched, jobs, batch):
+    start = time.perf_counter()
+    for lo in range(0, jobs, batch):
+        sched.submit_many(range(lo, min(lo + batch, jobs)))
+        sched.run_all()
+    return time.perf_counter() - start
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_shards = sorted({1, 2, 4, cores} & set(range(1, cores + 1))) or [1]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500000)
+    parser.add_argument("--batch", type=int, default=50000)
+    parser.add_argument("--shards", nargs="+", type=int, default=default_shards)
+    args = parser.parse_args()
+
+    print(f"{cores} CPU core(s), {args.jobs} jobs in batches of {args.batch}")
+    base = args.jobs / drive(Scheduler(53, metrics=False), args.jobs, args.batch)
+    print(f"{'in-process':>12} {base:>12,.0f} jobs/s")
+    for shards in args.shards:
+        with ShardedScheduler(shards=shards, metrics=False) as sched:
+            rate = args.jobs / drive(sched, args.jobs, args.batch)
+        print(f"{shards:>9} sh. {rate:>12,.0f} jobs/s  ({rate / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
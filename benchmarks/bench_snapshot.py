@@ -0,0 +1,105 @@
+"""
+Snapshot benchmark: run-loop latency while the state is being saved.
+
+A scheduler is filled with --history executed jobs and --queue queued jobs,
+then a loop submits and runs one job at a time for --seconds. Part way
+through, the loop saves a snapshot with save_to_file (which holds the loop
+for the whole write), save_async(method="thread") or
+save_async(method="fork"). For each mode it reports how long the save call
+held the loop, how long the file took to finish, and the p50 / p99 / max
+latency of the loop's submit+run steps while the snapshot was being
+written, next to a run with no snapshot.
+
+Usage:
+    python benchmarks/bench_snapshot.py
+    python benchmarks/bench_snapshot.py --history 1000000 --modes sync thread fork
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import Scheduler  # noqa: E402
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] if values else 0.0
+
+
+def build(history, queued):
+    sched = Scheduler(metrics=False)
+    sched.submit_many(range(history))
+    sched.run_all()
+    sched.submit_many(range(history, history + queued))
+    return sched
+
+
+def run(sched, mode, filename, seconds, next_id):
+    """Submit+run jobs for `seconds`, saving once a fifth of the way in."""
+    steps = []
+    window = []
+    blocked = written = 0.0
+    handle = None
+    saved = mode == "none"
+    start = time.perf_counter()
+    end = start + seconds
+    while True:
+        t0 = time.perf_counter()
+        if t0 >= end and (handle is None or handle.done()):
+            break
+        saving = not saved and t0 >= start + seconds / 5
+        if saving:
+            saved = True
+            if mode == "sync":
+                sched.save_to_file(filename)
+            else:
+                handle = sched.save_async(filename, method=mode)
+            blocked = time.perf_counter() - t0
+        writing = handle is not None and not handle.done()
+        sched.submit_task(next_id)
+        sched.run_next_task()
+        next_id += 1
+        steps.append(time.perf_counter() - t0)
+        if mode == "none" or saving or writing:
+            window.append(steps[-1])
+        if mode == "sync" and saving:
+            written = blocked
+    if handle is not None:
+        handle.result()
+        written = handle.elapsed
+    return next_id, blocked, written, window, len(steps) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=300000)
+    parser.add_argument("--queue", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=3.0, help="length of each run (extended until the save finishes)")
+    parser.add_argument("--modes", nargs="+", default=["none", "sync", "thread", "fork"],
+                        choices=["none", "sync", "thread", "fork"])
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count() or 1} CPU core(s), {args.history} history jobs, {args.queue} queued")
+    print(f"{'mode':>7} {'held loop ms':>13} {'write s':>8} {'p50 us':>8} {'p99 us':>8} "
+          f"{'max ms':>8} {'steps/s':>9}")
+    next_id = 10 ** 9
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "snapshot.json")
+        for mode in args.modes:
+            if mode == "fork" and not hasattr(os, "fork"):
+                print(f"{mode:>7} (os.fork() not available)")
+                continue
+            sched = build(args.history, args.queue)
+            next_id, blocked, written, window, rate = run(sched, mode, filename, args.seconds, next_id)
+            print(f"{mode:>7} {blocked * 1e3:>13.1f} {written:>8.2f} {percentile(window, 50) * 1e6:>8.1f} "
+                  f"{percentile(window, 99) * 1e6:>8.1f} {max(window, default=0) * 1e3:>8.1f} {rate:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Work-stealing benchmark: drain throughput of WorkStealingScheduler against
+a shared-queue pool (ConcurrentScheduler with the same number of runner
+threads calling run_batch) at 1, 4, 16 and 64 workers.
+
+Job durations are skewed: each job sleeps for a Pareto-distributed time
+(many short jobs, a few long ones), and --hot of the jobs share one
+affinity key, so one worker's deque starts with most of the backlog and
+the others must steal to stay busy. Sleeping releases the GIL, so the
+workers overlap as they would on I/O-bound jobs.
+
+Usage:
+    python benchmarks/bench_stealing.py
+    python benchmarks/bench_stealing.py --jobs 20000 --workers 1 4 16 64 --hot 0.8
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from task_scheduler import ConcurrentScheduler, WorkStealingScheduler  # noqa: E402
+
+
+def durations(jobs, scale_ms, cap_ms, seed):
+    rng = random.Random(seed)
+    return [min(cap_ms, scale_ms * rng.paretovariate(1.5)) / 1000 for _ in range(jobs)]
+
+
+def fill(sched, sleeps, hot, seed):
+    rng = random.Random(seed)
+    for job_id, seconds in enumerate(sleeps):
+        # Hot jobs share affinity key 0; the rest spread by job_id
+        key = 0 if rng.random() < hot else job_id
+        sched.submit_task(job_id, func=time.sleep, args=(seconds,), kwargs={}, priority=key)
+
+
+def drain_shared(sched, workers, batch):
+    def work():
+        while sched.run_batch(batch):
+            pass
+
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 4, 16, 64])
+    parser.add_argument("--batch", type=int, default=1, help="jobs a worker takes at a time")
+    parser.add_argument("--hot", type=float, default=0.5, help="fraction of jobs pinned to one worker")
+    parser.add_argument("--scale-ms", type=float, default=0.2, help="shortest job duration")
+    parser.add_argument("--cap-ms", type=float, default=50.0, help="longest job duration")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sleeps = durations(args.jobs, args.scale_ms, args.cap_ms, args.seed)
+    print(f"{os.cpu_count() or 1} CPU core(s), {args.jobs} jobs, {sum(sleeps):.2f}s of total sleep, "
+          f"{args.hot:.0%} hot")
+    print(f"{'workers':>8} {'shared jobs/s':>14} {'stealing jobs/s':>16} {'speedup':>8} {'steals':>7}")
+    for workers in args.workers:
+        shared = ConcurrentScheduler(metrics=False)
+        fill(shared, sleeps, args.hot, args.seed)
+        shared_rate = args.jobs / drain_shared(shared, workers, args.batch)
+
+        stealing = WorkStealingScheduler(workers=workers, affinity=lambda job: job.priority, metrics=False)
+        fill(stealing, sleeps, args.hot, args.seed)
+        start = time.perf_counter()
+        stealing.drain(args.batch)
+        stealing_rate = args.jobs / (time.perf_counter() - start)
+        print(f"{workers:>8} {shared_rate:>14,.0f} {stealing_rate:>16,.0f} "
+              f"{stealing_rate / shared_rate:>7.2f}x {stealing.queue.steals:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Scalability benchmark suite with regression gates.
+
+Measures Scheduler.submit_task, run_next_task, run_all, find_job,
+save_to_file / load_from_file and HashTable insert / search / remove at
+several job counts and initial hash sizes. Every (case, jobs, hash size)
+runs in a fresh subprocess and reports ops/sec, per-operation latency
+percentiles (for cases timed one call at a time) and peak RSS.
+
+HashTable cases run twice: with the default resizing, and at a fixed size
+(max_load_factor=None) to expose the cost of long chains. Fixed-size runs
+whose average chain would exceed --max-chain are skipped and reported as
+such, since they take quadratic time.
+
+Usage:
+    python benchmarks/bench_suite.py run --output results.json
+    python benchmarks/bench_suite.py run --sizes 1000 1000000 --hash-sizes 53 65521
+    python benchmarks/bench_suite.py run --cases find_job hash_search --output new.json
+    python benchmarks/bench_suite.py run --repeat 3 --baseline baseline.json
+    python benchmarks/bench_suite.py compare baseline.json new.json --threshold 0.15
+
+`compare` exits with status 1 when any shared measurement regressed by more
+than the threshold: lower ops/sec, higher p99 latency or higher peak RSS.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASES = ("submit_task", "run_next_task", "run_all", "find_job", "save_to_file", "load_from_file",
+         "hash_insert", "hash_search", "hash_remove",
+         "hash_insert_fixed", "hash_search_fixed", "hash_remove_fixed")
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_HASH_SIZES = (53, 65521)
+
+
+# ----------------------------------------------------------------------
+# Cases. Each returns (seconds, latencies_ns or None, operations).
+# ----------------------------------------------------------------------
+
+def _timed_each(func, args):
+    """Call func once per argument, timing every call."""
+    clock = time.perf_counter_ns
+    latencies = []
+    record = latencies.append
+    start = clock()
+    for arg in args:
+        t0 = clock()
+        func(arg)
+        record(clock() - t0)
+    return (clock() - start) / 1e9, latencies, len(latencies)
+
+
+def _timed_once(func, ops):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start, None, ops
+
+
+def _filled(n, hash_size, executed=0):
+    from task_scheduler import Scheduler
+    s = Scheduler(hash_size)
+    s.submit_many(range(n))
+    if executed:
+        s.run_batch(executed)
+    return s
+
+
+def case_submit_task(n, hash_size):
+    from task_scheduler import Scheduler
+    return _timed_each(Scheduler(hash_size).submit_task, range(n))
+
+
+def case_run_next_task(n, hash_size):
+    s = _filled(n, hash_size)
+    return _timed_each(lambda _: s.run_next_task(), range(n))
+
+
+def case_run_all(n, hash_size):
+    s = _filled(n, hash_size)
+    return _timed_once(s.run_all, n)
+
+
+def case_find_job(n, hash_size):
+    # Half the jobs are in history, half still queued; look up all of them
+    s = _filled(n, hash_size, executed=n // 2)
+    step = 7919 if n % 7919 else 7907
+    return _timed_each(s.find_job, ((i * step) % n for i in range(n)))
+
+
+def case_save_to_file(n, hash_size):
+    s = _filled(n, hash_size, executed=n // 2)
+    with tempfile.TemporaryDirectory() as d:
+        return _timed_once(lambda: s.save_to_file(os.path.join(d, "state.json")), n)
+
+
+def case_load_from_file(n, hash_size):
+    from task_scheduler import Scheduler
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "state.json")
+        _filled(n, hash_size, executed=n // 2).save_to_file(path)
+        return _timed_once(lambda: Scheduler(hash_size).load_from_file(path), n)
+
+
+def _table(n, hash_size, fixed, fill):
+    from task_scheduler import HashTable, Job
+    options = {"max_load_factor": None, "min_load_factor": None} if fixed else {}
+    table = HashTable(hash_size, **options)
+    jobs = [Job(i) for i in range(n)]
+    if fill:
+        for job in jobs:
+            table.insert(job)
+    return table, jobs
+
+
+def case_hash_insert(n, hash_size, fixed=False):
+    table, jobs = _table(n, hash_size, fixed, fill=False)
+    return _timed_each(table.insert, jobs)
+
+
+def case_hash_search(n, hash_size, fixed=False):
+    table, _ = _table(n, hash_size, fixed, fill=True)
+    return _timed_each(table.search, range(n))
+
+
+def case_hash_remove(n, hash_size, fixed=False):
+    table, _ = _table(n, hash_size, fixed, fill=True)
+    return _timed_each(table.remove, range(n))
+
+
+def run_case(case, n, hash_size):
+    """Run one case in this process and return its result dict."""
+    if case.endswith("_fixed"):
+        seconds, latencies, ops = globals()["case_" + case[:-6]](n, hash_size, fixed=True)
+    else:
+        seconds, latencies, ops = globals()["case_" + case](n, hash_size)
+    result = {"case": case, "jobs": n, "hash_size": hash_size, "seconds": seconds,
+              "ops_per_sec": ops / seconds if seconds else None,
+              "p50_us": None, "p95_us": None, "p99_us": None,
+              "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if latencies:
+        latencies.sort()
+        for p in (50, 95, 99):
+            result[f"p{p}_us"] = latencies[min(len(latencies) - 1, len(latencies) * p // 100)] / 1000
+    return result
+
+
+# ----------------------------------------------------------------------
+# Commands
+# ----------------------------------------------------------------------
+
+def measure(case, n, hash_size, max_chain, repeat=1):
+    """Run a case `repeat` times in subprocesses and keep the fastest run."""
+    if case.endswith("_fixed") and n / hash_size > max_chain:
+        return {"case": case, "jobs": n, "hash_size": hash_size,
+                "skipped": f"average chain {n // hash_size} > --max-chain {max_chain}"}
+    runs = []
+    for _ in range(max(1, repeat)):
+        out = subprocess.run([sys.executable, __file__, "child", case, str(n), str(hash_size)],
+                             check=True, capture_output=True, text=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return max(runs, key=lambda r: r["ops_per_sec"] or 0)
+
+
+def command_run(args):
+    results = []
+    print(f"{'case':>18} {'jobs':>8} {'hash':>6} {'ops/sec':>12} {'p50 us':>8} {'p99 us':>8} {'RSS MB':>7}")
+    for case in args.cases:
+        for n in args.sizes:
+            for hash_size in args.hash_sizes:
+                r = measure(case, n, hash_size, args.max_chain, args.repeat)
+                results.append(r)
+                if "skipped" in r:
+                    print(f"{case:>18} {n:>8} {hash_size:>6}  skipped: {r['skipped']}")
+                    continue
+                print(f"{case:>18} {n:>8} {hash_size:>6} {r['ops_per_sec']:>12,.0f} "
+                      f"{_fmt(r['p50_us']):>8} {_fmt(r['p99_us']):>8} {r['peak_rss_mb']:>7.1f}")
+
+    report = {"meta": {"created": datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "sizes": args.sizes, "hash_sizes": args.hash_sizes},
+              "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print("Wrote", args.output)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            return report_regressions(json.load(f), report, args.threshold)
+    return 0
+
+
+def find_regressions(baseline, current, threshold):
+    """
+    Compare two reports. Returns a list of (key, metric, old, new) for
+    measurements present in both that got worse by more than threshold.
+    """
+    def index(report):
+        return {(r["case"], r["jobs"], r["hash_size"]): r
+                for r in report["results"] if "skipped" not in r}
+
+    old_results = index(baseline)
+    regressions = []
+    for key, new in sorted(index(current).items()):
+        old = old_results.get(key)
+        if old is None:
+            continue
+        if old["ops_per_sec"] and new["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            regressions.append((key, "ops_per_sec", old["ops_per_sec"], new["ops_per_sec"]))
+        for metric in ("p99_us", "peak_rss_mb"):
+            if old.get(metric) and new.get(metric) and new[metric] > old[metric] * (1 + threshold):
+                regressions.append((key, metric, old[metric], new[metric]))
+    return regressions
+
+
+def report_regressions(baseline, current, threshold):
+    regressions = find_regressions(baseline, current, threshold)
+    if not regressions:
+        print(f"No regressions above {threshold:.0%}.")
+        return 0
+    print(f"{len(regressions)} regression(s) above {threshold:.0%}:")
+    for (case, n, hash_size), metric, old, new in regressions:
+        print(f"  {case} jobs={n} hash={hash_size}: {metric} {old:,.2f} -> {new:,.2f} "
+              f"({(new - old) / old:+.0%})")
+    return 1
+
+
+def command_compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    return report_regressions(baseline, current, args.threshold)
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    run.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    run.add_argument("--hash-sizes", nargs="+", type=int, default=list(DEFAULT_HASH_SIZES))
+    run.add_argument("--max-chain", type=int, default=200,
+                     help="skip fixed-size hash cases with longer average chains")
+    run.add_argument("--repeat", type=int, default=1,
+                     help="runs per measurement; the fastest is kept (use 3+ for gating)")
+    run.add_argument("--output", help="write results as JSON")
+    run.add_argument("--baseline", help="compare against this results file when done")
+    run.add_argument("--threshold", type=float, default=0.10)
+
+    compare = commands.add_parser("compare", help="compare two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="allowed relative slowdown (0.10 = 10%%)")
+
+    child = commands.add_parser("child")
+    child.add_argument("case", choices=CASES)
+    child.add_argument("jobs", type=int)
+    child.add_argument("hash_size", type=int)
+
+    args = parser.parse_args()
+    if args.command == "child":
+        print(json.dumps(run_case(args.case, args.jobs, args.hash_size)))
+        return 0
+    if args.command == "compare":
+        return command_compare(args)
+    return command_run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,13 +6,19 @@ I wrote this in a simple, clean style suitable for a university project.
 Each function now includes full documentation explaining purpose,
 parameters, and return values.
 """
+import logging
+
 from task_scheduler import Scheduler
 
 if __name__ == "__main__":
     # Define file path for saving/loading state
     filePath = "state_history/state_history.json"
+    # Report scheduler events (submit, run, save, load) on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Creating an object from the scheduler class
     scheduler = Scheduler(7)
+    scheduler.events.log_to()
 
     scheduler.submit_task(10)
     scheduler.submit_task(15)
@@ -27,6 +33,7 @@ if __name__ == "__main__":
     scheduler.save_to_file(filePath)
 
     new_scheduler = Scheduler(7)
+    new_scheduler.events.log_to()
     new_scheduler.load_from_file(filePath)
     new_scheduler.show_queue()
     new_scheduler.show_history()
@@ -4,12 +4,30 @@ Contains all classes for the task scheduling system.
 """
 
 from .job import Job
+from .compact_job import CompactJob
 from .node import Node
 from .linked_queue import LinkedQueue
+from .priority_queue import PriorityQueue
 from .history_list import HistoryList
+from .history_columns import HistoryColumns
 from .hash_table import HashTable
+from .timer_wheel import TimerWheel
+from .journal import Journal
+from .events import EventHooks
+from .dedup import IntervalSet, BloomDedup, TTLDedup
+from .metrics import LatencyHistogram, SchedulerMetrics
+from .admission import QueueFullError, TokenBucket
+from .binary_snapshot import MappedSnapshot
+from .background_save import SnapshotHandle
 from .scheduler import Scheduler
+from .async_scheduler import AsyncScheduler, JobHandle
+from .concurrent_scheduler import ConcurrentScheduler
+from .work_stealing import WorkStealingScheduler
+from .sharded_scheduler import ShardedScheduler
+from .server import SchedulerServer
+from .client import SchedulerClient
 
-__all__ = ['Job', 'Node', 'LinkedQueue', 'HistoryList', 'HashTable', 'Scheduler']
+__all__ = ['Job', 'CompactJob', 'Node', 'LinkedQueue', 'PriorityQueue', 'HistoryList', 'HistoryColumns', 'HashTable', 'TimerWheel', 'Journal', 'EventHooks', 'IntervalSet', 'BloomDedup', 'TTLDedup', 'LatencyHistogram', 'SchedulerMetrics', 'QueueFullError', 'TokenBucket', 'MappedSnapshot', 'SnapshotHandle', 'Scheduler',
+           'AsyncScheduler', 'JobHandle', 'ConcurrentScheduler', 'WorkStealingScheduler', 'ShardedScheduler', 'SchedulerServer', 'SchedulerClient']
 
 
@@ -0,0 +1,255 @@
+"""
+Admission Control Module
+
+Helpers a Scheduler uses to bound its queue: the QueueFullError raised
+when a submission cannot be admitted, the ShedOrder that picks which
+queued jobs to drop, and a token-bucket rate limiter that smooths
+submission bursts.
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+from datetime import datetime
+
+from .node import Node
+
+
+# What a Scheduler does when its queue is at capacity
+OVERFLOW_POLICIES = ("reject", "block", "shed")
+
+
+class QueueFullError(ValueError):
+    """
+    Raised when a submission is refused because the queue is at capacity
+    (or the rate limiter would make it wait longer than allowed). It is a
+    ValueError, so callers that already handle duplicate-job errors keep
+    working.
+    """
+
+
+class ShedOrder:
+    """
+    Queued jobs in the order overflow="shed" drops them, as a min-heap
+    with lazy deletion: entries of jobs that left the queue (ran, were
+    cancelled or shed) are skipped when popped, and the heap is rebuilt
+    once they make up most of it. Pushing and popping are O(log n), so a
+    shed costs O(k log n) for k victims instead of a scan of the queue.
+
+    Whether an entry is still live is asked of the scheduler (is_queued),
+    since a storage backend may hand out copies of jobs rather than the
+    objects that were submitted. The lowest-value job is dropped first:
+      - "fifo" and "priority": lowest priority (None counts as 0), and
+        among equals the oldest, since it has waited longest and is the
+        most likely to be stale;
+      - "deadline": jobs without a deadline, then the latest deadline
+        (the least urgent under EDF), oldest first among equals.
+    A new job is newer than every queued job, so it displaces a queued
+    job of equal value and is refused only when it is worth less.
+    """
+
+    def __init__(self, policy, is_queued):
+        """
+        Purpose:
+            Create an empty shed order for a queue policy.
+
+        Parameters:
+            policy (str): "fifo", "priority" or "deadline".
+            is_queued (callable): job -> bool, whether that job (not a
+                later one that reused its ID) is still waiting in the queue.
+
+        Returns:
+            None
+        """
+        if policy == "deadline":
+            self.value = lambda job: ((0, 0.0) if job.deadline is None
+                                      else (1, -job.deadline.timestamp()))
+        else:
+            self.value = lambda job: (job.priority or 0,)
+        self.is_queued = is_queued
+        self.heap = []
+        self._seq = itertools.count()
+        # Runners outside the queue lock (work stealing) also push promotions
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, jobs, live):
+        """
+        Purpose:
+            Add newly queued jobs.
+
+        Parameters:
+            jobs (list[Job])
+            live (int): Jobs in the queue now, to decide when stale
+                entries are worth dropping.
+
+        Returns:
+            None
+        """
+        value = self.value
+        seq = self._seq
+        with self._lock:
+            for job in jobs:
+                heapq.heappush(self.heap, (value(job), next(seq), job))
+            if len(self.heap) > 2 * live + 64:
+                self._prune()
+
+    def _prune(self):
+        """Drop stale entries, keeping the newest live entry of each job ID."""
+        latest = {}
+        is_queued = self.is_queued
+        for entry in self.heap:
+            if is_queued(entry[2]):
+                key = entry[2].job_id
+                if key not in latest or latest[key][1] < entry[1]:
+                    latest[key] = entry
+        self.heap = list(latest.values())
+        heapq.heapify(self.heap)
+
+    def victims(self, need, incoming):
+        """
+        Purpose:
+            Pick the `need` lowest-value jobs among the queued and the
+            incoming ones and remove them from the order, provided none
+            of the incoming jobs is among them.
+
+        Parameters:
+            need (int): Jobs that must leave the queue.
+            incoming (list[Job]): Jobs waiting to be admitted.
+
+        Returns:
+            list[Job] or None: Queued jobs to shed, or None (nothing
+                removed) if an incoming job is worth less than them.
+        """
+        with self._lock:
+            popped = []
+            taken = set()
+            heap = self.heap
+            is_queued = self.is_queued
+            while heap and len(popped) < need:
+                entry = heapq.heappop(heap)
+                # A re-armed recurring job can have an older entry as well
+                if entry[2].job_id not in taken and is_queued(entry[2]):
+                    taken.add(entry[2].job_id)
+                    popped.append(entry)
+            value = self.value
+            seq = self._seq
+            lowest = heapq.nsmallest(need, popped + [(value(job), next(seq), job) for job in incoming])
+            new = {id(job) for job in incoming}
+            if len(popped) < need or any(id(entry[2]) in new for entry in lowest):
+                for entry in popped:
+                    heapq.heappush(heap, entry)
+                return None
+            return [entry[2] for entry in popped]
+
+    def rebuild(self, jobs):
+        """
+        Purpose:
+            Replace the order with the given queued jobs, taking their
+            order as their age (oldest first).
+
+        Parameters:
+            jobs (iterable[Job])
+
+        Returns:
+            None
+        """
+        value = self.value
+        seq = self._seq
+        with self._lock:
+            self.heap = [(value(job), next(seq), job) for job in jobs]
+            heapq.heapify(self.heap)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` tokens are added per second up to
+    `burst`, and each submitted job takes one. A caller that finds the
+    bucket short reserves its tokens anyway and sleeps for the deficit,
+    so concurrent callers are spaced out at `rate` without polling.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Purpose:
+            Create a full bucket.
+
+        Parameters:
+            rate (float): Tokens (jobs) per second.
+            burst (float or None): Bucket size, i.e. jobs accepted at once
+                without waiting (default: one second's worth, at least 1).
+            clock (callable): Returns the current time in seconds.
+            sleep (callable): Waits a number of seconds.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If rate or burst is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive.")
+        burst = max(1.0, rate) if burst is None else burst
+        if burst <= 0:
+            raise ValueError("Burst size must be positive.")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1, timeout=None):
+        """
+        Purpose:
+            Take n tokens, waiting until they are available.
+
+        Parameters:
+            n (int): Tokens to take.
+            timeout (float or None): Longest acceptable wait in seconds;
+                None waits as long as needed.
+
+        Returns:
+            float: Seconds waited (0.0 when tokens were available).
+
+        Raises:
+            QueueFullError: If the wait would exceed timeout (no tokens
+                are taken).
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = (n - self.tokens) / self.rate if self.tokens < n else 0.0
+            if timeout is not None and wait > timeout:
+                raise QueueFullError(f"Rate limit of {self.rate:g} jobs/s would delay "
+                                     f"submission by {wait:.3f}s.")
+            self.tokens -= n
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+def job_footprint(job_class):
+    """
+    Purpose:
+        Estimate the memory one queued job takes (object, attribute dict,
+        timestamp and queue node), to turn a byte budget into a depth.
+
+    Parameters:
+        job_class (type): Job or CompactJob.
+
+    Returns:
+        int: Approximate bytes per queued job.
+    """
+    job = job_class(0, datetime.now())
+    size = sys.getsizeof(job) + sys.getsizeof(Node(job))
+    attrs = getattr(job, "__dict__", None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs) + sys.getsizeof(job.submit_timestamp)
+    return size
@@ -0,0 +1,277 @@
+"""
+AsyncScheduler Class Module
+"""
+
+import asyncio
+import functools
+import inspect
+from datetime import datetime
+
+from .scheduler import Scheduler
+
+
+class JobHandle:
+    """
+    Awaitable handle for a job submitted through AsyncScheduler.
+    """
+
+    def __init__(self, job, future):
+        """
+        Purpose:
+            Wrap a job and the future that completes when it has run.
+
+        Parameters:
+            job (Job): The submitted job.
+            future (asyncio.Future): Resolved with the job's return value.
+
+        Returns:
+            None
+        """
+        self.job = job
+        self._future = future
+
+    @property
+    def job_id(self):
+        return self.job.job_id
+
+    def done(self):
+        """
+        Purpose:
+            Check whether the job has finished.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True once the job has run (successfully or not).
+        """
+        return self._future.done()
+
+    async def result(self):
+        """
+        Purpose:
+            Wait for the job to finish and return what its callable returned.
+
+        Parameters:
+            None
+
+        Returns:
+            The job's return value (None for jobs without a callable).
+
+        Raises:
+            Exception: Whatever the job's callable raised.
+        """
+        return await asyncio.shield(self._future)
+
+
+class AsyncScheduler:
+    """
+    asyncio front-end for Scheduler. Jobs are stored in the wrapped
+    Scheduler's queue, hash table and history as usual, but are run by a
+    single worker task on the event loop: coroutine functions are awaited
+    directly, plain functions are sent to the loop's default executor, and
+    a semaphore bounds how many jobs are in flight at once.
+    """
+
+    def __init__(self, scheduler=None, concurrency=100, poll_interval=0.05, **scheduler_options):
+        """
+        Purpose:
+            Create an async front-end around a new or existing Scheduler.
+
+        Parameters:
+            scheduler (Scheduler or None): Scheduler to wrap. A new one is
+                built from scheduler_options when None.
+            concurrency (int): Maximum number of jobs running at once.
+            poll_interval (float): How often (seconds) an idle worker wakes
+                up to check for delayed jobs that have come due.
+            scheduler_options: Keyword arguments for Scheduler().
+
+        Returns:
+            None
+        """
+        self.scheduler = scheduler if scheduler is not None else Scheduler(**scheduler_options)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._handles = {}
+        self._tasks = set()
+        self._slots = None
+        self._wakeup = None
+        self._progress = None
+        self._worker = None
+        self._closing = False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def start(self):
+        """
+        Purpose:
+            Start the worker loop on the running event loop.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self._worker is not None:
+            return
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._progress = asyncio.Event()
+        self._closing = False
+        self._worker = asyncio.get_running_loop().create_task(self._worker_loop())
+
+    async def stop(self, wait=True):
+        """
+        Purpose:
+            Stop the worker loop.
+
+        Parameters:
+            wait (bool): Let in-flight jobs finish before returning.
+                Queued jobs that have not started stay in the queue.
+
+        Returns:
+            None
+        """
+        if self._worker is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._worker
+        self._worker = None
+        if wait and self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+    async def submit_task(self, job_id, func=None, args=(), kwargs=None, **options):
+        """
+        Purpose:
+            Submit a job and get an awaitable handle for it.
+
+        Parameters:
+            job_id (int)
+            func (callable or None): Coroutine function or plain function.
+            args (tuple): Positional arguments for func.
+            kwargs (dict or None): Keyword arguments for func.
+            options: Other Scheduler.submit_task arguments (priority,
+                deadline, run_at, interval, handler).
+
+        Returns:
+            JobHandle: Resolves when the job has run.
+
+        Raises:
+            ValueError: If the job is duplicated (see Scheduler.submit_task).
+        """
+        job = self.scheduler.submit_task(job_id, func=func, args=args, kwargs=kwargs, **options)
+        future = asyncio.get_running_loop().create_future()
+        self._handles[job_id] = future
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return JobHandle(job, future)
+
+    def find_job(self, job_id):
+        """
+        Purpose:
+            Locate a job (see Scheduler.find_job). Non-blocking.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            tuple or None: Same as Scheduler.find_job.
+        """
+        return self.scheduler.find_job(job_id)
+
+    async def join(self):
+        """
+        Purpose:
+            Wait until the queue is empty and no job is running. While
+            queued jobs are waiting for the worker, sleep until it takes one
+            (or stops) instead of polling.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If jobs are queued but no worker is running to take
+                them (start() was not called, or stop() ran first).
+        """
+        while True:
+            if self._tasks:
+                await asyncio.wait(set(self._tasks))
+            elif self.scheduler.queue.is_empty():
+                return
+            elif self._worker is None or self._worker.done():
+                raise ValueError("Jobs are queued but no worker is running; call start() first.")
+            else:
+                self._progress.clear()
+                await self._progress.wait()
+
+    async def _worker_loop(self):
+        """Take jobs from the queue and start them while slots are free."""
+        sched = self.scheduler
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._closing:
+                await self._slots.acquire()
+                sched._promote_due()
+                jobs = sched.queue.dequeue_many(1)
+                if not jobs:
+                    self._slots.release()
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                job = jobs[0]
+                job.status = "running"
+                if sched.events.on_dequeue:
+                    sched.events.emit("on_dequeue", jobs)
+                task = loop.create_task(self._run_job(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                self._progress.set()
+        finally:
+            # Wake join() so it sees the worker has stopped
+            self._progress.set()
+
+    async def _run_job(self, job):
+        """Run one job, record it in history and resolve its handle."""
+        sched = self.scheduler
+        error = None
+        result = None
+        try:
+            func = sched._callable_for(job)
+            job.execution_timestamp = datetime.now()
+            if func is None:
+                pass
+            elif inspect.iscoroutinefunction(func):
+                result = await func(*job.args, **job.kwargs)
+            else:
+                call = functools.partial(func, *job.args, **job.kwargs)
+                result = await asyncio.get_running_loop().run_in_executor(None, call)
+        except Exception as exc:
+            error = exc
+        finally:
+            self._slots.release()
+
+        job.end_timestamp = datetime.now()
+        job.result = result
+        job.error = repr(error) if error is not None else None
+        sched._record_executed([job], job.end_timestamp)
+
+        future = self._handles.pop(job.job_id, None)
+        if future is not None and not future.done():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
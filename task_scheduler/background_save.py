@@ -0,0 +1,169 @@
+"""
+Background Save Module
+
+Writers used by Scheduler.save_async to write a snapshot without holding
+up the caller, and the SnapshotHandle that reports how the write went.
+"""
+
+import os
+import threading
+import time
+
+
+# How save_async writes: a forked child that sees a copy-on-write image of
+# the scheduler, or a thread that writes a point-in-time capture
+SAVE_METHODS = ("fork", "thread")
+
+
+class SnapshotHandle:
+    """
+    Status of one background save. The snapshot file is replaced only when
+    the write succeeds, so until then readers see the previous version.
+    """
+
+    def __init__(self, filename, method):
+        """
+        Purpose:
+            Create a handle for a save that is about to start.
+
+        Parameters:
+            filename (str): Destination path.
+            method (str): "fork" or "thread".
+
+        Returns:
+            None
+        """
+        self.filename = filename
+        self.method = method
+        self.pid = None
+        self.error = None
+        self.started = time.monotonic()
+        self.finished = None
+        self.capture_seconds = None
+        self._done = threading.Event()
+
+    @property
+    def status(self):
+        """"running", "done" or "failed"."""
+        if not self._done.is_set():
+            return "running"
+        return "failed" if self.error is not None else "done"
+
+    @property
+    def elapsed(self):
+        """Seconds from the start of the save to its end (or to now)."""
+        return (self.finished if self.finished is not None else time.monotonic()) - self.started
+
+    def done(self):
+        """True once the write has finished, successfully or not."""
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Purpose:
+            Block until the write finishes.
+
+        Parameters:
+            timeout (float or None): Longest wait in seconds (None = forever).
+
+        Returns:
+            bool: True if the write finished, False on timeout.
+        """
+        return self._done.wait(timeout)
+
+    def result(self, timeout=None):
+        """
+        Purpose:
+            Wait for the write and re-raise its error, if any.
+
+        Parameters:
+            timeout (float or None): Longest wait in seconds (None = forever).
+
+        Returns:
+            str: The snapshot filename.
+
+        Raises:
+            TimeoutError: If the write is still running after timeout.
+            Exception: The error that made the write fail.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Snapshot of {self.filename} is still being written.")
+        if self.error is not None:
+            raise self.error
+        return self.filename
+
+    def _finish(self, error=None):
+        self.error = error
+        self.finished = time.monotonic()
+        self._done.set()
+
+    def __repr__(self):
+        return f"SnapshotHandle({self.filename!r}, method={self.method!r}, status={self.status!r})"
+
+
+def start_thread_writer(handle, write):
+    """
+    Purpose:
+        Run write() on a daemon thread and record its outcome on handle.
+
+    Parameters:
+        handle (SnapshotHandle)
+        write (callable): Writes the already captured snapshot.
+
+    Returns:
+        None
+    """
+    def run():
+        try:
+            write()
+        except Exception as exc:
+            handle._finish(exc)
+        else:
+            handle._finish()
+
+    threading.Thread(target=run, name=f"save-{handle.filename}", daemon=True).start()
+
+
+def start_child_writer(handle, write):
+    """
+    Purpose:
+        Fork a child process that runs write() on its copy-on-write view of
+        the parent's memory and exits; a daemon thread in the parent reaps
+        it and records the outcome on handle. The parent is held up only
+        for the fork itself.
+
+    Parameters:
+        handle (SnapshotHandle)
+        write (callable): Builds and writes the snapshot (runs in the child).
+
+    Returns:
+        None
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: never return into the caller's code
+        code = 0
+        try:
+            os.close(read_fd)
+            write()
+        except BaseException as exc:
+            code = 1
+            os.write(write_fd, f"{type(exc).__name__}: {exc}".encode("utf-8", "replace")[:4096])
+        finally:
+            os._exit(code)
+
+    os.close(write_fd)
+    handle.pid = pid
+
+    def reap():
+        with os.fdopen(read_fd, "rb") as pipe:
+            message = pipe.read().decode("utf-8", "replace")
+        _, status = os.waitpid(pid, 0)
+        code = os.waitstatus_to_exitcode(status)
+        if code == 0:
+            handle._finish()
+        else:
+            handle._finish(RuntimeError(message or f"Snapshot writer exited with status {code}."))
+
+    threading.Thread(target=reap, name=f"save-{handle.filename}", daemon=True).start()
@@ -0,0 +1,349 @@
+"""
+Binary Snapshot Module
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+
+from .job import Job, STATUSES
+
+
+MAGIC = b"TSCHBIN1"
+VERSION = 3
+
+# magic, version, record size, flags, queue count, history count, journal
+# seq, then (version 3) scheduled count and the file offset of the extras
+HEADER = struct.Struct("<8sHHIQQQQQ")
+# Versions 1 and 2 stop after the journal seq
+HEADER_V1 = struct.Struct("<8sHHIQQQ")
+HEADER_SIZE = 64
+
+# job_id, submit, execution, end, priority, deadline, run_at (times in
+# epoch microseconds), interval (seconds, NaN for None), offset of the
+# job's extras in the extras section (NONE if it has none), status code
+RECORD = struct.Struct("<qqqqqqqdqB7x")
+# Older records: version 2 has no extras offset, version 1 no run_at and
+# interval either (both still readable)
+RECORD_V2 = struct.Struct("<qqqqqqqdB7x")
+RECORD_V1 = struct.Struct("<qqqqqqB7x")
+_RECORDS = {1: RECORD_V1, 2: RECORD_V2, 3: RECORD}
+
+# Extras: variable-length fields (handler, args, kwargs, error) as a
+# length-prefixed compact JSON object, after the last record
+EXTRA_LENGTH = struct.Struct("<I")
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+NONE = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+_STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+
+def _to_us(dt):
+    """datetime -> int64 microseconds since 1970-01-01 (NONE for None)."""
+    if dt is None:
+        return NONE
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _from_us(us):
+    """int64 microseconds since 1970-01-01 -> datetime (None for NONE)."""
+    if us == NONE:
+        return None
+    return _EPOCH + timedelta(microseconds=us)
+
+
+def _extras(job):
+    """Encoded variable-length fields of a job, or None if it has none."""
+    if job.handler is None and not job.args and not job.kwargs and job.error is None:
+        return None
+    payload = _dumps({"handler": job.handler, "args": list(job.args),
+                      "kwargs": job.kwargs, "error": job.error}).encode("utf-8")
+    return EXTRA_LENGTH.pack(len(payload)) + payload
+
+
+def _pack(job, extra=NONE):
+    return RECORD.pack(
+        job.job_id,
+        _to_us(job.submit_timestamp),
+        _to_us(job.execution_timestamp),
+        _to_us(job.end_timestamp),
+        NONE if job.priority is None else job.priority,
+        _to_us(job.deadline),
+        _to_us(job.run_at),
+        math.nan if job.interval is None else job.interval,
+        extra,
+        _STATUS_CODES[job.status],
+    )
+
+
+def _unpack(buf, offset, job_class=Job, record=RECORD, extras_start=0):
+    extra = NONE
+    if record is RECORD_V1:
+        job_id, submit, execution, end, priority, deadline, status = record.unpack_from(buf, offset)
+        run_at, interval = NONE, math.nan
+    elif record is RECORD_V2:
+        job_id, submit, execution, end, priority, deadline, run_at, interval, status = \
+            record.unpack_from(buf, offset)
+    else:
+        job_id, submit, execution, end, priority, deadline, run_at, interval, extra, status = \
+            record.unpack_from(buf, offset)
+    fields = {}
+    if extra != NONE:
+        start = extras_start + extra
+        (length,) = EXTRA_LENGTH.unpack_from(buf, start)
+        start += EXTRA_LENGTH.size
+        fields = json.loads(buf[start:start + length])
+    job = job_class(job_id, _from_us(submit), None if priority == NONE else priority, _from_us(deadline),
+                    handler=fields.get("handler"), args=fields.get("args") or (),
+                    kwargs=fields.get("kwargs"))
+    job.error = fields.get("error")
+    job.status = STATUSES[status]
+    job.execution_timestamp = _from_us(execution)
+    job.end_timestamp = _from_us(end)
+    if run_at != NONE:
+        job.run_at = _from_us(run_at)
+    if not math.isnan(interval):
+        job.interval = interval
+    return job
+
+
+def write_binary_snapshot(filename, journal_seq, queue, history, scheduled=()):
+    """
+    Purpose:
+        Write queue, history and delayed jobs as fixed-width binary
+        records. Handler, args, kwargs and error messages, which vary in
+        length, go to an extras section after the records and each record
+        holds the offset of its job's entry, so records stay fixed-width
+        and jobs without these fields cost nothing extra. The file is
+        written to a temporary name and renamed into place.
+
+    Parameters:
+        filename (str): Destination path.
+        journal_seq (int): Last journal event contained in the snapshot.
+        queue (list[Job]): Queued jobs in dequeue order.
+        history (list[Job]): Executed jobs in history order.
+        scheduled (list[Job]): Delayed and recurring jobs in the timer wheel.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If job arguments cannot be encoded as JSON (nothing
+            is written).
+    """
+    scheduled = list(scheduled)
+    extras = []
+    extras_size = 0
+
+    def pack(job):
+        nonlocal extras_size
+        blob = _extras(job)
+        if blob is None:
+            return _pack(job)
+        extras.append(blob)
+        extras_size += len(blob)
+        return _pack(job, extras_size - len(blob))
+
+    extras_start = HEADER_SIZE + (len(queue) + len(history) + len(scheduled)) * RECORD.size
+    tmp = filename + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            header = HEADER.pack(MAGIC, VERSION, RECORD.size, 0, len(queue), len(history), journal_seq,
+                                 len(scheduled), extras_start)
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            for jobs in (queue, history, scheduled):
+                for start in range(0, len(jobs), 8192):
+                    f.write(b"".join(pack(job) for job in jobs[start:start + 8192]))
+            f.write(b"".join(extras))
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, filename)
+
+
+def is_binary_snapshot(filename):
+    """
+    Purpose:
+        Check a file's magic header.
+
+    Parameters:
+        filename (str)
+
+    Returns:
+        bool: True if the file is a binary snapshot.
+    """
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class MappedSnapshot:
+    """
+    Read-only view of a binary snapshot through mmap. Records are decoded
+    only when accessed, so history queries such as get_last_n(n) or a
+    lookup by offset touch just the records they return.
+    """
+
+    def __init__(self, filename, job_class=Job):
+        """
+        Purpose:
+            Map a binary snapshot file.
+
+        Parameters:
+            filename (str)
+            job_class (type): Job or CompactJob, used to build decoded jobs.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the file is not a binary snapshot.
+        """
+        self.job_class = job_class
+        self._file = open(filename, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{filename} is not a binary snapshot.")
+        magic, version, record_size, _, queue_count, history_count, journal_seq = \
+            HEADER_V1.unpack_from(self._map, 0)
+        record = _RECORDS.get(version)
+        if magic != MAGIC or record is None or record_size != record.size:
+            self.close()
+            raise ValueError(f"{filename} is not a binary snapshot.")
+        scheduled_count = extras_start = 0
+        if record is RECORD:
+            scheduled_count, extras_start = HEADER.unpack_from(self._map, 0)[-2:]
+        self.version = version
+        self._record = record
+        self.queue_count = queue_count
+        self.history_count = history_count
+        self.scheduled_count = scheduled_count
+        self.journal_seq = journal_seq
+        self._history_start = HEADER_SIZE + queue_count * record.size
+        self._scheduled_start = self._history_start + history_count * record.size
+        self._extras_start = extras_start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+    def _job(self, offset):
+        return _unpack(self._map, offset, self.job_class, self._record, self._extras_start)
+
+    def queue_job(self, offset):
+        """
+        Purpose:
+            Decode the queued job at a position (negative counts from the end).
+
+        Parameters:
+            offset (int)
+
+        Returns:
+            Job
+
+        Raises:
+            IndexError: If offset is out of range.
+        """
+        if offset < 0:
+            offset += self.queue_count
+        if not 0 <= offset < self.queue_count:
+            raise IndexError("queue offset out of range")
+        return self._job(HEADER_SIZE + offset * self._record.size)
+
+    def history_job(self, offset):
+        """
+        Purpose:
+            Decode the history entry at a position (negative counts from the end).
+
+        Parameters:
+            offset (int)
+
+        Returns:
+            Job
+
+        Raises:
+            IndexError: If offset is out of range.
+        """
+        if offset < 0:
+            offset += self.history_count
+        if not 0 <= offset < self.history_count:
+            raise IndexError("history offset out of range")
+        return self._job(self._history_start + offset * self._record.size)
+
+    def get_last_n(self, n):
+        """
+        Purpose:
+            Return the last n history entries, decoding only those records.
+
+        Parameters:
+            n (int)
+
+        Returns:
+            list[Job]: Up to n jobs, oldest first.
+        """
+        if n <= 0:
+            return []
+        start = max(0, self.history_count - n)
+        return [self.history_job(i) for i in range(start, self.history_count)]
+
+    def iter_queue(self):
+        """Yield queued jobs in order."""
+        for i in range(self.queue_count):
+            yield self._job(HEADER_SIZE + i * self._record.size)
+
+    def iter_history(self):
+        """Yield history entries in order."""
+        for i in range(self.history_count):
+            yield self._job(self._history_start + i * self._record.size)
+
+    def iter_scheduled(self):
+        """Yield delayed and recurring jobs (in no particular order)."""
+        for i in range(self.scheduled_count):
+            yield self._job(self._scheduled_start + i * self._record.size)
+
+
+def read_binary_snapshot(filename, job_class=Job):
+    """
+    Purpose:
+        Open a binary snapshot for loading (see snapshot_io.read_snapshot).
+
+    Parameters:
+        filename (str)
+        job_class (type): Class used to build the decoded jobs.
+
+    Returns:
+        tuple: (header dict, iterator of (section name, Job)).
+    """
+    snap = MappedSnapshot(filename, job_class)
+    header = {
+        "journal_seq": snap.journal_seq,
+        "counts": {"queue": snap.queue_count, "scheduled": snap.scheduled_count,
+                   "history": snap.history_count},
+    }
+
+    def records():
+        with snap:
+            for job in snap.iter_queue():
+                yield "queue", job
+            for job in snap.iter_scheduled():
+                yield "scheduled", job
+            for job in snap.iter_history():
+                yield "history", job
+
+    return header, records()
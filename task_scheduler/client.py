@@ -0,0 +1,381 @@
+"""
+SchedulerClient Class Module
+"""
+
+import asyncio
+import itertools
+
+from .job import Job
+from .server import encode_frame, read_frame
+
+
+class _Connection:
+    """
+    One pipelined connection: requests are written as soon as they are
+    made, and a reader task matches responses to waiting futures by id.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.ids = itertools.count(1)
+        self.task = asyncio.get_running_loop().create_task(self._read_responses())
+
+    @property
+    def closed(self):
+        """True once the reader has stopped; no response can arrive any more."""
+        return self.task.done()
+
+    async def call(self, op, args):
+        if self.closed:
+            raise ConnectionError("Connection to the scheduler server was closed.")
+        request_id = next(self.ids)
+        # Encode first, so arguments JSON cannot encode leave nothing pending
+        frame = encode_frame({"id": request_id, "op": op, "args": args})
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            self.writer.write(frame)
+            await self.writer.drain()
+        except ConnectionError:
+            self.pending.pop(request_id, None)
+            raise
+        return await future
+
+    async def _read_responses(self):
+        error = ConnectionError("Connection to the scheduler server was closed.")
+        try:
+            while True:
+                response = await read_frame(self.reader)
+                if response is None:
+                    break
+                if not isinstance(response, dict):
+                    continue
+                future = self.pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError, TypeError) as exc:
+            error = exc
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pending.clear()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self.task
+
+
+class SchedulerClient:
+    """
+    asyncio client for SchedulerServer.
+
+    Keeps a pool of connections and spreads requests over them round-robin.
+    Each connection is pipelined, so many concurrent calls (for example
+    through asyncio.gather) share it without waiting for each other's
+    responses. Jobs come back as Job copies; func and result are not sent.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, path=None, pool_size=4):
+        """
+        Purpose:
+            Configure a client (connections open on first use or connect()).
+
+        Parameters:
+            host (str): Server host.
+            port (int): Server TCP port.
+            path (str or None): Connect to this Unix socket instead of TCP.
+            pool_size (int): Number of connections to keep open.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If pool_size is less than 1.
+        """
+        if pool_size < 1:
+            raise ValueError("A client needs at least one connection.")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pool_size = pool_size
+        self._pool = []
+        self._next = 0
+        self._lock = None
+
+    async def connect(self):
+        """
+        Purpose:
+            Open the connection pool (no-op if already open).
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._pool:
+                return
+            for _ in range(self.pool_size):
+                self._pool.append(await self._open())
+
+    async def _open(self):
+        """Open one pooled connection."""
+        if self.path is not None:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        return _Connection(reader, writer)
+
+    async def close(self):
+        """
+        Purpose:
+            Close every pooled connection.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        pool, self._pool = self._pool, []
+        for conn in pool:
+            await conn.close()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def request(self, op, **args):
+        """
+        Purpose:
+            Send one request and wait for its result.
+
+        Parameters:
+            op (str): Server operation name.
+            args: Operation arguments (JSON-serializable).
+
+        Returns:
+            object: The decoded result.
+
+        Raises:
+            ValueError: If the server rejected the request with a ValueError.
+            RuntimeError: For any other server-side error.
+            ConnectionError: If the connection closed first. A pooled
+                connection found closed is reopened before the next request.
+        """
+        if not self._pool:
+            await self.connect()
+        index = self._next
+        self._next = (self._next + 1) % len(self._pool)
+        conn = self._pool[index]
+        if conn.closed:
+            # The server dropped this member: replace it before using it
+            # (once, if concurrent requests found it closed together)
+            async with self._lock:
+                if self._pool[index] is conn:
+                    self._pool[index] = await self._open()
+                conn = self._pool[index]
+        response = await conn.call(op, args)
+        if response["ok"]:
+            return response["result"]
+        if response["error"] == "ValueError":
+            raise ValueError(response["message"])
+        raise RuntimeError(f"{response['error']}: {response['message']}")
+
+    async def submit_task(self, job_id, priority=None, deadline=None, run_at=None, delay=None,
+                          interval=None, handler=None, args=(), kwargs=None):
+        """
+        Purpose:
+            Submit one job (see Scheduler.submit_task). Jobs run a named
+            handler registered on the server, since callables are not sent.
+
+        Parameters:
+            job_id (int)
+            priority (int or None)
+            deadline (datetime or None)
+            run_at (datetime or None): Run no earlier than this time.
+            delay (float or None): Run no earlier than this many seconds
+                from now (instead of run_at).
+            interval (float or None): Repeat every interval seconds.
+            handler (str or None): Registered handler name.
+            args (tuple): Positional arguments for the handler.
+            kwargs (dict or None): Keyword arguments for the handler.
+
+        Returns:
+            Job: A copy of the newly created job.
+
+        Raises:
+            ValueError: If the job is duplicated or the options are invalid.
+        """
+        result = await self.request(
+            "submit_task", job_id=job_id, priority=priority,
+            deadline=deadline.isoformat() if deadline else None,
+            run_at=run_at.isoformat() if run_at else None, delay=delay,
+            interval=interval, handler=handler, args=list(args), kwargs=kwargs)
+        return Job.from_dict(result)
+
+    async def submit_many(self, job_ids, priority=None, deadline=None):
+        """
+        Purpose:
+            Submit a batch of jobs in one request (see Scheduler.submit_many).
+
+        Parameters:
+            job_ids (iterable[int])
+            priority (int or None): Priority for every job in the batch.
+            deadline (datetime or None): Deadline for every job in the batch.
+
+        Returns:
+            int: Number of jobs submitted.
+
+        Raises:
+            ValueError: If any ID is a duplicate (nothing is submitted).
+        """
+        return await self.request("submit_many", job_ids=list(job_ids), priority=priority,
+                                  deadline=deadline.isoformat() if deadline else None)
+
+    async def find_job(self, job_id):
+        """
+        Purpose:
+            Locate a job (see Scheduler.find_job).
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            tuple or None: (location, copy of the Job), or None.
+        """
+        return _located(await self.request("find_job", job_id=job_id))
+
+    async def find_jobs(self, job_ids):
+        """
+        Purpose:
+            Locate many jobs in one request.
+
+        Parameters:
+            job_ids (iterable[int])
+
+        Returns:
+            list: One find_job() style result per ID, in the same order.
+        """
+        return [_located(found) for found in await self.request("find_jobs", job_ids=list(job_ids))]
+
+    async def cancel(self, job_id):
+        """
+        Purpose:
+            Cancel a queued or delayed job (see Scheduler.cancel).
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: A copy of the cancelled job.
+
+        Raises:
+            ValueError: If the job cannot be cancelled.
+        """
+        return Job.from_dict(await self.request("cancel", job_id=job_id))
+
+    async def move_to_front(self, job_id):
+        """
+        Purpose:
+            Move a queued job to the head of the queue (see Scheduler.move_to_front).
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: A copy of the moved job.
+
+        Raises:
+            ValueError: If the job is not queued.
+        """
+        return Job.from_dict(await self.request("move_to_front", job_id=job_id))
+
+    async def run_next_task(self):
+        """
+        Purpose:
+            Run the next queued job on the server.
+
+        Parameters:
+            None
+
+        Returns:
+            Job or None: A copy of the executed job, or None if the queue is empty.
+        """
+        result = await self.request("run_next_task")
+        return None if result is None else Job.from_dict(result)
+
+    async def run_batch(self, k):
+        """
+        Purpose:
+            Run up to k queued jobs on the server in one request.
+
+        Parameters:
+            k (int)
+
+        Returns:
+            list[Job]: Copies of the executed jobs, in execution order.
+        """
+        return [Job.from_dict(d) for d in await self.request("run_batch", k=k)]
+
+    async def run_all(self):
+        """
+        Purpose:
+            Run every queued job on the server.
+
+        Parameters:
+            None
+
+        Returns:
+            list[Job]: Copies of the executed jobs, in execution order.
+        """
+        return [Job.from_dict(d) for d in await self.request("run_all")]
+
+    async def history_page(self, after=None, limit=50, reverse=False):
+        """
+        Purpose:
+            Fetch one page of the server's history (see HistoryList.page).
+
+        Parameters:
+            after (int or None): Cursor from the previous page.
+            limit (int): Maximum jobs per page.
+            reverse (bool): Page newest first.
+
+        Returns:
+            tuple[list[Job], int or None]: Job copies and the next cursor.
+
+        Raises:
+            ValueError: If limit or after is invalid.
+        """
+        page = await self.request("history_page", after=after, limit=limit, reverse=reverse)
+        return [Job.from_dict(d) for d in page["jobs"]], page["cursor"]
+
+    async def stats(self):
+        """
+        Purpose:
+            Fetch the server scheduler's stats() (see Scheduler.stats).
+
+        Parameters:
+            None
+
+        Returns:
+            dict
+        """
+        return await self.request("stats")
+
+
+def _located(found):
+    return None if found is None else (found[0], Job.from_dict(found[1]))
@@ -0,0 +1,133 @@
+"""
+CompactJob Class Module
+"""
+
+from datetime import datetime, timedelta
+
+from .job import Job, STATUSES
+
+
+_EPOCH = datetime(1970, 1, 1)
+_STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+
+def _to_seconds(dt):
+    """Naive datetime -> float seconds since 1970-01-01 (exact to the microsecond)."""
+    return None if dt is None else (dt - _EPOCH).total_seconds()
+
+
+def _to_datetime(seconds):
+    """Float seconds since 1970-01-01 -> naive datetime."""
+    return None if seconds is None else _EPOCH + timedelta(seconds=seconds)
+
+
+def _time_field(slot):
+    """Property that stores a datetime as float seconds in `slot`."""
+    def get(self):
+        return _to_datetime(getattr(self, slot))
+
+    def set(self, value):
+        setattr(self, slot, _to_seconds(value))
+
+    return property(get, set)
+
+
+def _extra_field(name, empty=None):
+    """
+    Property for a rarely used attribute. It lives in the shared `_extra`
+    dict, which is only created once one of these attributes is set.
+    """
+    def get(self):
+        extra = self._extra
+        if extra is None or name not in extra:
+            return empty() if callable(empty) else empty
+        return extra[name]
+
+    def set(self, value):
+        if self._extra is None:
+            if value is None or (type(value) in (tuple, dict) and not value):
+                return
+            self._extra = {}
+        self._extra[name] = value
+
+    return property(get, set)
+
+
+class CompactJob:
+    """
+    Memory-compact drop-in for Job, used by Scheduler(compact=True).
+
+    Uses __slots__ (no per-instance __dict__), keeps timestamps as float
+    seconds instead of datetime objects, stores the status as a small
+    integer code, and keeps rarely used fields (priority, deadline,
+    callables, results, ...) in one dict that is only created when needed.
+    All public Job attributes still read and write datetimes and strings.
+    """
+
+    __slots__ = ("job_id", "_submit", "_execution", "_end", "_status", "_extra")
+
+    def __init__(self, job_id, submit_timestamp=None, priority=None, deadline=None,
+                 func=None, handler=None, args=(), kwargs=None):
+        """
+        Purpose:
+            Create a compact job; arguments match Job().
+
+        Parameters:
+            See Job.
+
+        Returns:
+            None
+        """
+        self.job_id = job_id
+        self._submit = _to_seconds(submit_timestamp if submit_timestamp is not None else datetime.now())
+        self._execution = None
+        self._end = None
+        self._status = 0
+        self._extra = None
+        if priority is not None:
+            self.priority = priority
+        if deadline is not None:
+            self.deadline = deadline
+        if func is not None:
+            self.func = func
+        if handler is not None:
+            self.handler = handler
+        if args:
+            self.args = tuple(args)
+        if kwargs:
+            self.kwargs = kwargs
+
+    submit_timestamp = _time_field("_submit")
+    execution_timestamp = _time_field("_execution")
+    end_timestamp = _time_field("_end")
+
+    @property
+    def status(self):
+        return STATUSES[self._status]
+
+    @status.setter
+    def status(self, value):
+        self._status = _STATUS_CODES[value]
+
+    priority = _extra_field("priority")
+    deadline = _extra_field("deadline")
+    run_at = _extra_field("run_at")
+    interval = _extra_field("interval")
+    func = _extra_field("func")
+    handler = _extra_field("handler")
+    args = _extra_field("args", ())
+    kwargs = _extra_field("kwargs", dict)
+    result = _extra_field("result")
+    error = _extra_field("error")
+
+    def __copy__(self):
+        # The extra-field dict must not be shared between copies
+        clone = CompactJob.__new__(CompactJob)
+        for slot in CompactJob.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        if self._extra is not None:
+            clone._extra = dict(self._extra)
+        return clone
+
+    to_dict = Job.to_dict
+    from_dict = classmethod(Job.from_dict.__func__)
@@ -0,0 +1,315 @@
+"""
+ConcurrentScheduler Class Module
+"""
+
+import threading
+import time
+
+from .hash_table import HashTable
+from .scheduler import Scheduler
+
+
+class LockedHashTable(HashTable):
+    """
+    HashTable whose public operations each hold a short internal lock,
+    so an incremental rehash never runs concurrently with a lookup.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def insert(self, item):
+        with self._lock:
+            return super().insert(item)
+
+    def search(self, job_id):
+        with self._lock:
+            return super().search(job_id)
+
+    def entry(self, job_id):
+        with self._lock:
+            return super().entry(job_id)
+
+    def remove(self, job_id):
+        with self._lock:
+            return super().remove(job_id)
+
+    def replace(self, item):
+        with self._lock:
+            return super().replace(item)
+
+
+class ConcurrentScheduler(Scheduler):
+    """
+    Scheduler that is safe to use from many submitter and runner threads.
+
+    Locking is split so that threads rarely wait on each other:
+      - striped locks keyed by job_id make the duplicate check and the
+        insert of one ID atomic, while different IDs use different stripes;
+      - the queue has its own lock (with a condition for blocking runners);
+      - history and the timer wheel each have their own lock;
+      - the hash table holds an internal lock only for single O(1) calls.
+    Locks are always taken in the order stripe -> queue -> history ->
+    timers -> hash (skipping any that are not needed), so they cannot
+    deadlock.
+    """
+
+    def __init__(self, hash_size=53, lock_stripes=64, **options):
+        """
+        Purpose:
+            Set up a thread-safe scheduler.
+
+        Parameters:
+            hash_size (int): Initial bucket count for hash table.
+            lock_stripes (int): Number of job-ID lock stripes.
+            options: Other Scheduler() keyword arguments.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If a storage backend other than "memory" is given
+                (the SQLite backend is single-threaded).
+        """
+        if options.get("storage", "memory") != "memory":
+            raise ValueError("ConcurrentScheduler only supports in-memory storage.")
+        self._stripes = [threading.Lock() for _ in range(max(1, lock_stripes))]
+        self._queue_lock = threading.Lock()
+        self._not_empty = threading.Condition(self._queue_lock)
+        self._not_full = threading.Condition(self._queue_lock)
+        self._history_lock = threading.Lock()
+        self._timer_lock = threading.RLock()
+        super().__init__(hash_size, **options)
+
+    def _new_hash_table(self):
+        return LockedHashTable(self.hash_size, self.max_load_factor, self.min_load_factor)
+
+    def _stripe(self, job_id):
+        return self._stripes[job_id % len(self._stripes)]
+
+    def submit_task(self, job_id, *args, **kwargs):
+        """
+        Purpose:
+            Thread-safe Scheduler.submit_task. Two threads submitting the
+            same ID cannot both pass the duplicate check.
+
+        Parameters:
+            Same as Scheduler.submit_task.
+
+        Returns:
+            Job: The newly created job.
+
+        Raises:
+            ValueError: If the job is duplicated.
+        """
+        with self._stripe(job_id):
+            return super().submit_task(job_id, *args, **kwargs)
+
+    def submit_many(self, job_ids, *args, **kwargs):
+        """
+        Purpose:
+            Thread-safe Scheduler.submit_many. Holds the stripes of every ID
+            in the batch (taken in index order) while validating.
+
+        Parameters:
+            Same as Scheduler.submit_many.
+
+        Returns:
+            list[Job]: The newly created jobs.
+
+        Raises:
+            ValueError: If any ID is duplicated.
+        """
+        job_ids = list(job_ids)
+        n = len(self._stripes)
+        stripes = [self._stripes[i] for i in sorted({job_id % n for job_id in job_ids})]
+        for lock in stripes:
+            lock.acquire()
+        try:
+            return super().submit_many(job_ids, *args, **kwargs)
+        finally:
+            for lock in reversed(stripes):
+                lock.release()
+
+    def cancel(self, job_id):
+        """
+        Purpose:
+            Thread-safe Scheduler.cancel.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: The cancelled job.
+
+        Raises:
+            ValueError: If the job is unknown, running or already finished.
+        """
+        with self._stripe(job_id), self._not_full, self._history_lock, self._timer_lock:
+            job = super().cancel(job_id)
+            self._not_full.notify()
+            return job
+
+    def move_to_front(self, job_id):
+        """
+        Purpose:
+            Thread-safe Scheduler.move_to_front.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: The moved job.
+
+        Raises:
+            ValueError: If the job is unknown or not queued.
+        """
+        with self._stripe(job_id), self._queue_lock:
+            return super().move_to_front(job_id)
+
+    def _admit(self, jobs):
+        with self._not_empty:
+            super()._admit(jobs)
+            if len(jobs) == 1:
+                self._not_empty.notify()
+            else:
+                self._not_empty.notify_all()
+
+    def _wait_for_room(self, n, timeout):
+        # Called from _admit with the queue lock held; runners notify _not_full
+        return self._not_full.wait_for(lambda: self.queue.size + n <= self.queue_capacity, timeout)
+
+    def _record_shed(self, jobs):
+        # Called from _admit with the queue lock held
+        with self._history_lock:
+            super()._record_shed(jobs)
+
+    def _made_room(self, jobs):
+        """Wake submitters blocked on a full queue after jobs were taken."""
+        if self.queue_capacity is not None and jobs:
+            with self._not_full:
+                self._not_full.notify_all()
+
+    def _schedule(self, job):
+        with self._timer_lock:
+            super()._schedule(job)
+
+    def _promote_due(self):
+        # Called with the queue lock held
+        if not self.timers.size:
+            return
+        with self._timer_lock:
+            super()._promote_due()
+
+    def _record_executed(self, jobs, now):
+        with self._history_lock:
+            super()._record_executed(jobs, now)
+
+    def _take(self, k, block, timeout):
+        """
+        Internal helper that removes up to k jobs from the queue, optionally
+        waiting (up to timeout seconds) for one to arrive. Taken jobs are
+        marked "running" before the queue lock is released, so cancel and
+        move_to_front (which check the status under that lock) refuse them.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            self._promote_due()
+            while block and self.queue.is_empty():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                # Wake up periodically while delayed jobs are pending
+                if self.timers.size:
+                    remaining = self.timers.tick if remaining is None else min(remaining, self.timers.tick)
+                self._not_empty.wait(remaining)
+                self._promote_due()
+            jobs = self.queue.dequeue_many(k)
+            for job in jobs:
+                job.status = "running"
+            if self.queue_capacity is not None and jobs:
+                self._not_full.notify_all()
+            return jobs
+
+    def run_next_task(self, block=False, timeout=None):
+        """
+        Purpose:
+            Execute the next job in the queue.
+
+        Parameters:
+            block (bool): Wait for a job when the queue is empty.
+            timeout (float or None): Longest wait in seconds (None = forever).
+
+        Returns:
+            Job or None: The executed job, or None if none became available.
+        """
+        jobs = self._take(1, block, timeout)
+        if not jobs:
+            return None
+        if self.events.on_dequeue:
+            self.events.emit("on_dequeue", jobs)
+        self._execute(jobs)
+        self._maybe_compact()
+        return jobs[0]
+
+    def run_batch(self, k, block=False, timeout=None):
+        """
+        Purpose:
+            Execute up to k jobs (see Scheduler.run_batch).
+
+        Parameters:
+            k (int): Maximum number of jobs to execute.
+            block (bool): Wait for at least one job when the queue is empty.
+            timeout (float or None): Longest wait in seconds (None = forever).
+
+        Returns:
+            list[Job]: The executed jobs in completion order.
+        """
+        jobs = self._take(k, block, timeout)
+        if not jobs:
+            return jobs
+        if self.events.on_dequeue:
+            self.events.emit("on_dequeue", jobs)
+        jobs = self._execute(jobs)
+        self._maybe_compact()
+        return jobs
+
+    def run_all(self):
+        """
+        Purpose:
+            Execute every job that is queued (or due) right now.
+
+        Parameters:
+            None
+
+        Returns:
+            list[Job]: All executed jobs.
+        """
+        with self._not_empty:
+            self._promote_due()
+            size = self.queue.size
+        return self.run_batch(size)
+
+    def _begin_compaction(self):
+        with self._not_empty, self._history_lock, self._timer_lock:
+            return super()._begin_compaction()
+
+    def save_to_file(self, filename, format="json"):
+        if self.journal is not None and filename == self.journal_path:
+            # compact() takes the locks itself
+            super().save_to_file(filename, format)
+            return
+        with self._not_empty, self._history_lock, self._timer_lock:
+            super().save_to_file(filename, format)
+
+    def _start_save(self, handle, format):
+        # A forked child sees the state as it was while these were held
+        with self._not_empty, self._history_lock, self._timer_lock:
+            super()._start_save(handle, format)
+
+    def load_from_file(self, filename):
+        with self._not_empty, self._history_lock, self._timer_lock:
+            super().load_from_file(filename)
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
@@ -0,0 +1,389 @@
+"""
+Executed-ID Dedup Stores Module
+
+A dedup store remembers which job IDs have already run, so the scheduler
+can reject resubmissions. Every store supports `add(job_id)`,
+`update(job_ids)`, `job_id in store`, `len(store)` and `clear()`, the
+same operations the scheduler uses on a plain set.
+"""
+
+import math
+import time
+from bisect import bisect_right
+
+
+class IntervalSet:
+    """
+    Exact set of integers stored as sorted, disjoint [start, end) ranges.
+
+    Runs of consecutive IDs collapse into a single range, so mostly
+    monotonic IDs cost a few ranges instead of one set entry each. Adding
+    the next ID of the last range is O(1); other adds and lookups are
+    O(log r) for r ranges.
+    """
+
+    def __init__(self, job_ids=()):
+        """
+        Purpose:
+            Create an interval set, optionally filled with job_ids.
+
+        Parameters:
+            job_ids (iterable[int])
+
+        Returns:
+            None
+        """
+        self.ranges = []
+        self.count = 0
+        self.update(job_ids)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, job_id):
+        ranges = self.ranges
+        i = bisect_right(ranges, (job_id, math.inf)) - 1
+        return i >= 0 and job_id < ranges[i][1]
+
+    def add(self, job_id):
+        """
+        Purpose:
+            Add one ID, merging it into neighbouring ranges.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            None
+        """
+        ranges = self.ranges
+        if ranges:
+            start, end = ranges[-1]
+            if job_id == end:
+                # Common case: the next ID of a monotonic sequence
+                ranges[-1] = (start, end + 1)
+                self.count += 1
+                return
+            if job_id > end:
+                ranges.append((job_id, job_id + 1))
+                self.count += 1
+                return
+
+        i = bisect_right(ranges, (job_id, math.inf)) - 1
+        if i >= 0 and job_id < ranges[i][1]:
+            return
+        joins_left = i >= 0 and ranges[i][1] == job_id
+        joins_right = i + 1 < len(ranges) and ranges[i + 1][0] == job_id + 1
+        if joins_left and joins_right:
+            # Grow the left range over the right one before dropping it,
+            # so a concurrent reader never misses an ID
+            ranges[i] = (ranges[i][0], ranges[i + 1][1])
+            del ranges[i + 1]
+        elif joins_left:
+            ranges[i] = (ranges[i][0], job_id + 1)
+        elif joins_right:
+            ranges[i + 1] = (job_id, ranges[i + 1][1])
+        else:
+            ranges.insert(i + 1, (job_id, job_id + 1))
+        self.count += 1
+
+    def update(self, job_ids):
+        """
+        Purpose:
+            Add several IDs.
+
+        Parameters:
+            job_ids (iterable[int])
+
+        Returns:
+            None
+        """
+        add = self.add
+        for job_id in job_ids:
+            add(job_id)
+
+    def clear(self):
+        """Forget every ID."""
+        self.ranges = []
+        self.count = 0
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for integer IDs. Membership tests can return
+    false positives (at about `error_rate` once `capacity` IDs are added)
+    but never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate):
+        """
+        Purpose:
+            Size the bit array and hash count for a capacity and error rate.
+
+        Parameters:
+            capacity (int): Number of IDs the error rate is sized for.
+            error_rate (float): Target false-positive rate, in (0, 1).
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range.
+        """
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, job_id):
+        # splitmix64 finalizer, then double hashing for the k positions
+        h = (job_id * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        h ^= h >> 31
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def add(self, job_id):
+        array = self.array
+        for pos in self._positions(job_id):
+            array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, job_id):
+        array = self.array
+        for pos in self._positions(job_id):
+            if not array[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class BloomDedup:
+    """
+    Executed-ID store backed by Bloom filters.
+
+    Memory is about 1.44 * log2(1 / error_rate) bits per ID (under two
+    bytes at 1%). When the current filter fills up, a new filter with
+    twice the capacity and half the error rate is added, so the overall
+    false-positive rate stays below 2 * error_rate as IDs keep coming.
+
+    A false positive rejects a new ID as a duplicate. Pass an exact
+    `fallback` store (any container, e.g. an IntervalSet or a disk-backed
+    lookup) to confirm positives: the filters then only answer the common
+    "never seen" case, and the fallback is asked only on a filter hit.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.01, fallback=None):
+        """
+        Purpose:
+            Create an empty Bloom-filter store.
+
+        Parameters:
+            capacity (int): IDs the first filter is sized for.
+            error_rate (float): False-positive rate of the first filter.
+            fallback (container or None): Exact store that also receives
+                every ID and confirms filter hits; None trusts the filters.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.fallback = fallback
+        self.filters = [BloomFilter(capacity, error_rate)]
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, job_id):
+        for bloom in self.filters:
+            if job_id in bloom:
+                return self.fallback is None or job_id in self.fallback
+        return False
+
+    def add(self, job_id):
+        """
+        Purpose:
+            Record an executed ID.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            None
+        """
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(current.capacity * 2, current.error_rate / 2)
+            self.filters.append(current)
+        current.add(job_id)
+        self.count += 1
+        if self.fallback is not None:
+            self.fallback.add(job_id)
+
+    def update(self, job_ids):
+        """Record several executed IDs."""
+        for job_id in job_ids:
+            self.add(job_id)
+
+    def clear(self):
+        """Forget every ID (and clear the fallback)."""
+        self.filters = [BloomFilter(self.capacity, self.error_rate)]
+        self.count = 0
+        if self.fallback is not None:
+            self.fallback.clear()
+
+
+class TTLDedup:
+    """
+    Executed-ID store that forgets IDs older than `ttl` seconds, so an ID
+    can be reused once the window has passed. Memory is bounded by the
+    number of IDs executed within one window. IDs are kept in insertion
+    order, so expiring them is O(1) per ID.
+    """
+
+    def __init__(self, ttl, clock=time.monotonic):
+        """
+        Purpose:
+            Create an empty time-windowed store.
+
+        Parameters:
+            ttl (float): Seconds an executed ID is remembered.
+            clock (callable): Returns the current time in seconds.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If ttl is not positive.
+        """
+        if ttl <= 0:
+            raise ValueError("TTL must be positive.")
+        self.ttl = ttl
+        self.clock = clock
+        self.seen = {}
+
+    def __len__(self):
+        self._expire()
+        return len(self.seen)
+
+    def __contains__(self, job_id):
+        added = self.seen.get(job_id)
+        return added is not None and self.clock() - added < self.ttl
+
+    def add(self, job_id):
+        """
+        Purpose:
+            Record an executed ID now (restarting its window if present).
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            None
+        """
+        seen = self.seen
+        seen.pop(job_id, None)
+        seen[job_id] = self.clock()
+        self._expire()
+
+    def update(self, job_ids):
+        """Record several executed IDs now."""
+        now = self.clock()
+        seen = self.seen
+        for job_id in job_ids:
+            seen.pop(job_id, None)
+            seen[job_id] = now
+        self._expire()
+
+    def restore(self, executed):
+        """
+        Purpose:
+            Record IDs loaded from history at the time they ran rather
+            than now, so a reload does not restart their windows. Wall
+            clock end times are moved onto this store's clock, and IDs
+            whose window has already passed are not kept.
+
+        Parameters:
+            executed (iterable): (job_id, end datetime or None) pairs;
+                None counts as now.
+
+        Returns:
+            None
+        """
+        now = self.clock()
+        wall = time.time()
+        cutoff = now - self.ttl
+        stamped = []
+        for job_id, ended in executed:
+            added = now if ended is None else now - max(0.0, wall - ended.timestamp())
+            if added > cutoff:
+                stamped.append((added, job_id))
+        # _expire relies on insertion order matching time order
+        stamped.sort()
+        seen = self.seen
+        for added, job_id in stamped:
+            seen.pop(job_id, None)
+            seen[job_id] = added
+        self._expire()
+
+    def clear(self):
+        """Forget every ID."""
+        self.seen = {}
+
+    def _expire(self):
+        """Drop IDs whose window has passed (they sit at the front)."""
+        seen = self.seen
+        cutoff = self.clock() - self.ttl
+        while seen:
+            job_id = next(iter(seen))
+            if seen[job_id] > cutoff:
+                break
+            del seen[job_id]
+
+
+DEDUP_KINDS = ("exact", "intervals", "bloom", "ttl")
+
+
+def make_dedup(kind="exact", **options):
+    """
+    Purpose:
+        Build an executed-ID store from a name or pass one through.
+
+    Parameters:
+        kind (str or object): "exact" (a plain set), "intervals",
+            "bloom", "ttl", or an object with add / update / in / len /
+            clear, which is returned as-is.
+        options: Constructor arguments for the store (capacity and
+            error_rate for "bloom", ttl for "ttl").
+
+    Returns:
+        object: The store.
+
+    Raises:
+        ValueError: If the kind is unknown or "ttl" has no ttl option.
+    """
+    if not isinstance(kind, str):
+        return kind
+    if kind == "exact":
+        return set()
+    if kind == "intervals":
+        return IntervalSet()
+    if kind == "bloom":
+        return BloomDedup(**options)
+    if kind == "ttl":
+        if "ttl" not in options:
+            raise ValueError('The "ttl" dedup store needs a ttl option.')
+        return TTLDedup(**options)
+    raise ValueError(f"Unknown dedup store: {kind!r}")
@@ -0,0 +1,132 @@
+"""
+EventHooks Class Module
+"""
+
+import logging
+
+
+EVENTS = ("on_submit", "on_dequeue", "on_execute", "on_save", "on_load", "on_queue_full")
+
+logger = logging.getLogger("task_scheduler")
+
+
+class EventHooks:
+    """
+    Listener registry for scheduler events.
+
+    Each event is an attribute holding a tuple of listeners. Call sites
+    test that tuple before building any event data, so an event nobody
+    listens to costs one attribute lookup. Registering replaces the tuple
+    instead of mutating it, so emitting from another thread is safe.
+
+    Events and listener arguments:
+        on_submit(jobs)            jobs admitted to the queue
+        on_dequeue(jobs)           jobs taken from the queue to run
+        on_execute(jobs)           jobs recorded in history
+        on_save(filename, format)  a snapshot was written
+        on_load(filename)          a snapshot was restored
+        on_queue_full(jobs, depth) jobs found the queue at capacity
+    """
+
+    def __init__(self):
+        """
+        Purpose:
+            Create a registry with no listeners.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        for event in EVENTS:
+            setattr(self, event, ())
+
+    def add(self, event, listener):
+        """
+        Purpose:
+            Register a listener for an event.
+
+        Parameters:
+            event (str): One of EVENTS.
+            listener (callable): Called with the event's arguments.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the event is unknown.
+        """
+        setattr(self, event, self._listeners(event) + (listener,))
+
+    def remove(self, event, listener):
+        """
+        Purpose:
+            Unregister a listener.
+
+        Parameters:
+            event (str): One of EVENTS.
+            listener (callable): A previously added listener.
+
+        Returns:
+            bool: True if the listener was registered.
+
+        Raises:
+            ValueError: If the event is unknown.
+        """
+        listeners = self._listeners(event)
+        if listener not in listeners:
+            return False
+        i = listeners.index(listener)
+        setattr(self, event, listeners[:i] + listeners[i + 1:])
+        return True
+
+    def emit(self, event, *args):
+        """
+        Purpose:
+            Call every listener of an event, in registration order.
+
+        Parameters:
+            event (str): One of EVENTS.
+            args: Arguments passed to each listener.
+
+        Returns:
+            None
+        """
+        for listener in getattr(self, event):
+            listener(*args)
+
+    def log_to(self, log=None, level=logging.INFO):
+        """
+        Purpose:
+            Register listeners that report every event through `logging`.
+
+        Parameters:
+            log (logging.Logger or None): Defaults to the "task_scheduler"
+                logger.
+            level (int): Logging level of the messages.
+
+        Returns:
+            None
+        """
+        log = logger if log is None else log
+
+        def job_event(name):
+            def listener(jobs):
+                if log.isEnabledFor(level):
+                    log.log(level, "%s %d job(s): %s", name, len(jobs),
+                            ", ".join(str(job.job_id) for job in jobs[:10]))
+            return listener
+
+        self.add("on_submit", job_event("Submitted"))
+        self.add("on_dequeue", job_event("Dequeued"))
+        self.add("on_execute", job_event("Executed"))
+        self.add("on_save", lambda filename, format: log.log(level, "Saved to %s (%s)", filename, format))
+        self.add("on_load", lambda filename: log.log(level, "Loaded from %s", filename))
+        self.add("on_queue_full", lambda jobs, depth: log.log(
+            level, "Queue full (%d jobs) for %d new job(s)", depth, len(jobs)))
+
+    def _listeners(self, event):
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event: {event!r}")
+        return getattr(self, event)
@@ -0,0 +1,74 @@
+"""
+Executor Helpers Module
+"""
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+def make_executor(kind, max_workers=None):
+    """
+    Purpose:
+        Build the pool used by Scheduler to run job callables.
+
+    Parameters:
+        kind (str or Executor or None): "thread", "process", an existing
+            concurrent.futures.Executor, or None to run jobs inline.
+        max_workers (int or None): Pool size for "thread" / "process".
+
+    Returns:
+        Executor or None: The executor to use (None means inline).
+
+    Raises:
+        ValueError: If kind is not a known executor type.
+    """
+    if kind is None or isinstance(kind, Executor):
+        return kind
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor: {kind!r}")
+
+
+def missing_handler(name, *args, **kwargs):
+    """
+    Purpose:
+        Stand-in callable for a job whose handler is not registered (for
+        example one loaded from a snapshot), so the job is recorded as
+        failed instead of breaking the batch it was dequeued with.
+
+    Parameters:
+        name (str): The handler the job names.
+        args, kwargs: The job's arguments (ignored).
+
+    Raises:
+        ValueError: Always.
+    """
+    raise ValueError(f"Unknown handler: {name!r}")
+
+
+def timed_call(func, args, kwargs):
+    """
+    Purpose:
+        Run a job callable and time it. Lives at module level so it can be
+        sent to a ProcessPoolExecutor; errors are returned as text because
+        exception objects are not always picklable.
+
+    Parameters:
+        func (callable): The job's function.
+        args (list): Positional arguments.
+        kwargs (dict): Keyword arguments.
+
+    Returns:
+        tuple: (start datetime, end datetime, result, error text or None).
+    """
+    start = datetime.now()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as exc:
+        return start, datetime.now(), None, repr(exc)
+    return start, datetime.now(), result, None
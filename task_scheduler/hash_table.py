@@ -7,15 +7,28 @@ class HashTable:
     """
     Hash table that uses separate chaining to store queued jobs.
     Provides fast duplicate checking.
+
+    The table grows and shrinks on its own to keep the load factor
+    (stored items / buckets) between min_load_factor and max_load_factor.
+    Resizing is incremental: a new bucket array is allocated and every
+    following operation moves a few buckets across, so a single insert
+    never pays for rehashing the whole table.
     """
 
-    def __init__(self, size=53):
+    def __init__(self, size=53, max_load_factor=2.0, min_load_factor=0.25, rehash_step=4):
         """
         Purpose:
-            Create a hash table with a fixed number of buckets.
+            Create a hash table with an initial number of buckets.
 
         Parameters:
-            size (int): Number of buckets (default 53).
+            size (int): Initial number of buckets (default 53). The table
+                never shrinks below this size.
+            max_load_factor (float or None): Grow when items / buckets goes
+                above this value. None keeps the table at a fixed size.
+            min_load_factor (float or None): Shrink when items / buckets goes
+                below this value. None disables shrinking.
+            rehash_step (int): Buckets migrated per operation while a
+                resize is in progress.
 
         Returns:
             None
@@ -24,6 +37,23 @@ class HashTable:
             size = 3
         self.size = size
         self.buckets = [[] for _ in range(size)]
+        self.count = 0
+        self.min_size = size
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.rehash_step = max(1, rehash_step)
+
+        # Old bucket array while an incremental rehash is running
+        self._old_buckets = None
+        self._old_size = 0
+        self._rehash_index = 0
+
+        # Longest chain seen since the last resize (and in the old array)
+        self._longest = 0
+        self._old_longest = 0
+
+    def __len__(self):
+        return self.count
 
     def hash(self, job_id):
         """
@@ -50,6 +80,19 @@ class HashTable:
         # Otherwise assume it's a Job-like object
         return entry
 
+    def _chains_for(self, job_id):
+        """
+        Internal helper returning the bucket lists that may hold job_id:
+        the current bucket, plus the old bucket if it has not been
+        migrated yet.
+        """
+        bucket = self.buckets[job_id % self.size]
+        if self._old_buckets is not None:
+            old_idx = job_id % self._old_size
+            if old_idx >= self._rehash_index:
+                return (self._old_buckets[old_idx], bucket)
+        return (bucket,)
+
     def insert(self, item):
         """
         Purpose:
@@ -64,20 +107,72 @@ class HashTable:
         Raises:
             ValueError: If job ID already exists in the same bucket.
         """
+        self._rehash_some()
+
         # Determine job id from the provided item
         job_obj = self._extract_job(item)
         job_id = job_obj.job_id
 
-        idx = self.hash(job_id)
-        bucket = self.buckets[idx]
-
-        for e in bucket:
-            existing = self._extract_job(e)
-            if existing.job_id == job_id:
-                raise ValueError("Duplicate job ID!")
+        for bucket in self._chains_for(job_id):
+            for e in bucket:
+                existing = self._extract_job(e)
+                if existing.job_id == job_id:
+                    raise ValueError("Duplicate job ID!")
 
         # Store the original item (so Nodes stay as Nodes, Jobs stay as Jobs)
+        bucket = self.buckets[self.hash(job_id)]
         bucket.append(item)
+        if len(bucket) > self._longest:
+            self._longest = len(bucket)
+        self.count += 1
+        self._maybe_resize()
+
+    def insert_many_unchecked(self, items):
+        """
+        Purpose:
+            Insert jobs or nodes without scanning for duplicates. Only for
+            bulk loads from trusted data (e.g. a snapshot file).
+
+        Parameters:
+            items (iterable[Job or Node])
+
+        Returns:
+            None
+        """
+        self.finish_rehash()
+        buckets = self.buckets
+        size = self.size
+        extract = self._extract_job
+        added = 0
+        for item in items:
+            buckets[extract(item).job_id % size].append(item)
+            added += 1
+        self.count += added
+        self._longest = max(map(len, buckets))
+        self._maybe_resize()
+
+    def reserve(self, count):
+        """
+        Purpose:
+            Presize an empty table for about `count` items, so a bulk load
+            does not go through a chain of resizes. The new size also
+            becomes the floor the table shrinks to; otherwise the first
+            few inserts of the load, seeing a nearly empty table, would
+            start shrinking it again.
+
+        Parameters:
+            count (int): Expected number of items.
+
+        Returns:
+            None
+        """
+        if self.count or self._old_buckets is not None or self.max_load_factor is None:
+            return
+        size = int(count / self.max_load_factor * 1.25) | 1
+        if size > self.size:
+            self.size = size
+            self.min_size = size
+            self.buckets = [[] for _ in range(size)]
 
     def search(self, job_id):
         """
@@ -90,11 +185,31 @@ class HashTable:
         Returns:
             Job or None: The matching job from the bucket.
         """
-        idx = self.hash(job_id)
-        for e in self.buckets[idx]:
-            existing = self._extract_job(e)
-            if existing.job_id == job_id:
-                return existing
+        self._rehash_some()
+        for bucket in self._chains_for(job_id):
+            for e in bucket:
+                existing = self._extract_job(e)
+                if existing.job_id == job_id:
+                    return existing
+        return None
+
+    def entry(self, job_id):
+        """
+        Purpose:
+            Look up the stored entry for a job ID: the queue or history
+            Node when one was inserted, otherwise the Job itself.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Node, Job or None: The stored entry, or None if not found.
+        """
+        self._rehash_some()
+        for bucket in self._chains_for(job_id):
+            for e in bucket:
+                if self._extract_job(e).job_id == job_id:
+                    return e
         return None
 
     def remove(self, job_id):
@@ -108,13 +223,188 @@ class HashTable:
         Returns:
             Job or None: The removed job, or None if not found.
         """
-        idx = self.hash(job_id)
-        bucket = self.buckets[idx]
-
-        for i in range(len(bucket)):
-            existing = self._extract_job(bucket[i])
-            if existing.job_id == job_id:
-                removed = bucket.pop(i)
-                return self._extract_job(removed)
+        self._rehash_some()
+        for bucket in self._chains_for(job_id):
+            for i in range(len(bucket)):
+                existing = self._extract_job(bucket[i])
+                if existing.job_id == job_id:
+                    removed = bucket.pop(i)
+                    self.count -= 1
+                    self._maybe_resize()
+                    return self._extract_job(removed)
 
         return None
+
+    def replace(self, item):
+        """
+        Purpose:
+            Swap the stored entry for item's job ID with item, in place.
+            Used when a job moves from a queue node to a history node.
+
+        Parameters:
+            item (Job or Node)
+
+        Returns:
+            bool: True if an entry was replaced, False if none existed.
+        """
+        self._rehash_some()
+        job_id = self._extract_job(item).job_id
+        for bucket in self._chains_for(job_id):
+            for i in range(len(bucket)):
+                if self._extract_job(bucket[i]).job_id == job_id:
+                    bucket[i] = item
+                    return True
+        return False
+
+    def load_factor(self):
+        """
+        Purpose:
+            Report the current number of items per bucket.
+
+        Parameters:
+            None
+
+        Returns:
+            float: count / size.
+        """
+        return self.count / self.size
+
+    def longest_chain(self):
+        """
+        Purpose:
+            Report the longest bucket chain in O(1). This is a high-water
+            mark: removals do not lower it, but every resize starts it over.
+            chain_stats() gives the exact value with a full scan.
+
+        Parameters:
+            None
+
+        Returns:
+            int: Longest chain since the last resize.
+        """
+        return max(self._longest, self._old_longest)
+
+    def is_rehashing(self):
+        """
+        Purpose:
+            Check whether an incremental resize is still in progress.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True while old buckets are still being migrated.
+        """
+        return self._old_buckets is not None
+
+    def chain_stats(self):
+        """
+        Purpose:
+            Summarize bucket chain lengths so callers can confirm that
+            lookups stay O(1) as the table grows.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: size, count, load_factor, max_chain, mean_chain (average
+            length of non-empty chains), empty_buckets, rehashing, and
+            histogram (chain length -> number of buckets).
+        """
+        histogram = {}
+        chains = list(self.buckets)
+        if self._old_buckets is not None:
+            chains.extend(self._old_buckets[self._rehash_index:])
+
+        max_chain = 0
+        non_empty = 0
+        for bucket in chains:
+            length = len(bucket)
+            histogram[length] = histogram.get(length, 0) + 1
+            if length:
+                non_empty += 1
+            if length > max_chain:
+                max_chain = length
+
+        return {
+            "size": self.size,
+            "count": self.count,
+            "load_factor": self.load_factor(),
+            "max_chain": max_chain,
+            "mean_chain": (self.count / non_empty) if non_empty else 0.0,
+            "empty_buckets": histogram.get(0, 0),
+            "rehashing": self.is_rehashing(),
+            "histogram": histogram,
+        }
+
+    def finish_rehash(self):
+        """
+        Purpose:
+            Complete any in-progress resize immediately.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        while self._old_buckets is not None:
+            self._rehash_some(self._old_size)
+
+    def _maybe_resize(self):
+        """
+        Internal helper that starts a resize when the load factor leaves
+        the configured range. Does nothing while a resize is running.
+        """
+        if self._old_buckets is not None:
+            return
+
+        new_size = None
+        if self.max_load_factor is not None and self.count > self.max_load_factor * self.size:
+            new_size = self.size * 2 + 1
+        elif (self.min_load_factor is not None and self.size > self.min_size
+              and self.count < self.min_load_factor * self.size):
+            new_size = max(self.min_size, (self.size // 2) | 1)
+
+        if new_size is None or new_size == self.size:
+            return
+
+        self._old_buckets = self.buckets
+        self._old_size = self.size
+        self._rehash_index = 0
+        self.buckets = [[] for _ in range(new_size)]
+        self.size = new_size
+        self._old_longest = self._longest
+        self._longest = 0
+
+    def _rehash_some(self, steps=None):
+        """
+        Internal helper that moves up to `steps` old buckets (default
+        rehash_step) into the current bucket array.
+        """
+        if self._old_buckets is None:
+            return
+
+        if steps is None:
+            steps = self.rehash_step
+        old = self._old_buckets
+        buckets = self.buckets
+        longest = self._longest
+        end = min(self._old_size, self._rehash_index + steps)
+        for i in range(self._rehash_index, end):
+            for e in old[i]:
+                bucket = buckets[self._extract_job(e).job_id % self.size]
+                bucket.append(e)
+                if len(bucket) > longest:
+                    longest = len(bucket)
+            old[i] = []
+        self._rehash_index = end
+        self._longest = longest
+
+        if end >= self._old_size:
+            self._old_buckets = None
+            self._old_size = 0
+            self._rehash_index = 0
+            self._old_longest = 0
+            # The load may have drifted while migrating
+            self._maybe_resize()
@@ -0,0 +1,252 @@
+"""
+HistoryColumns Class Module
+"""
+
+import math
+from array import array
+
+from .compact_job import CompactJob, _to_datetime, _to_seconds
+from .job import STATUSES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; queries fall back to pure Python
+    np = None
+
+
+_NAN = float("nan")
+_STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+
+class HistoryColumns:
+    """
+    Column-oriented copy of the execution history for analytics.
+
+    Each column is an `array.array`: job_id (int64), submit, ready,
+    execution and end times (float seconds since 1970-01-01 in the same
+    local wall-clock time as the Job timestamps, NaN when missing) and a
+    status code indexing STATUSES. `ready` is when the job became runnable:
+    its run_at for delayed and recurring jobs (the occurrence that ran),
+    else its submit time. When NumPy is installed, queries view these buffers as NumPy
+    arrays without copying and run vectorized; otherwise they run as plain
+    loops over the flat arrays, which still avoids touching Job objects.
+    """
+
+    def __init__(self):
+        """
+        Purpose:
+            Create empty columns.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self.job_id = array("q")
+        self.submit = array("d")
+        self.ready = array("d")
+        self.execution = array("d")
+        self.end = array("d")
+        self.status = array("b")
+
+    def __len__(self):
+        return len(self.job_id)
+
+    def append(self, job):
+        """
+        Purpose:
+            Add one history job to the columns.
+
+        Parameters:
+            job (Job or CompactJob)
+
+        Returns:
+            None
+        """
+        if type(job) is CompactJob:
+            # Times are already stored as seconds
+            submit, execution, end = job._submit, job._execution, job._end
+            status = job._status
+        else:
+            submit = _to_seconds(job.submit_timestamp)
+            execution = _to_seconds(job.execution_timestamp)
+            end = _to_seconds(job.end_timestamp)
+            status = _STATUS_CODES[job.status]
+        ready = submit
+        if job.run_at is not None:
+            run_at = _to_seconds(job.run_at)
+            ready = run_at if submit is None else max(submit, run_at)
+        self.job_id.append(job.job_id)
+        self.submit.append(_NAN if submit is None else submit)
+        self.ready.append(_NAN if ready is None else ready)
+        self.execution.append(_NAN if execution is None else execution)
+        self.end.append(_NAN if end is None else end)
+        self.status.append(status)
+
+    def as_arrays(self):
+        """
+        Purpose:
+            Export the columns. The result is a copy, so it stays valid while
+            the history keeps growing.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: "job_id", "submit", "ready", "execution", "end" and
+            "status" mapped to NumPy arrays when NumPy is installed, else to
+            array.array.
+        """
+        names = ("job_id", "submit", "ready", "execution", "end", "status")
+        if np is None:
+            return {name: array(getattr(self, name).typecode, getattr(self, name)) for name in names}
+        return {name: self._view(name).copy() for name in names}
+
+    def _view(self, name):
+        """Zero-copy NumPy view of one column (do not keep it past the query)."""
+        col = getattr(self, name)
+        if not col:
+            return np.empty(0, dtype=_NUMPY_TYPES[col.typecode])
+        return np.frombuffer(col, dtype=_NUMPY_TYPES[col.typecode])
+
+    def _window(self, since, until):
+        """Indices / mask of jobs that finished inside [since, until)."""
+        lo = -math.inf if since is None else _to_seconds(since)
+        hi = math.inf if until is None else _to_seconds(until)
+        if np is not None:
+            end = self._view("end")
+            return (end >= lo) & (end < hi)
+        return [i for i, t in enumerate(self.end) if lo <= t < hi]
+
+    def wait_times(self, since=None, until=None):
+        """
+        Purpose:
+            Queue wait (execution time minus ready time, so a delayed job's
+            delay is not counted) of every job that finished inside the
+            window and has an execution time.
+
+        Parameters:
+            since (datetime or None): Start of the window (inclusive).
+            until (datetime or None): End of the window (exclusive).
+
+        Returns:
+            numpy.ndarray or list[float]: Wait times in seconds.
+        """
+        window = self._window(since, until)
+        if np is not None:
+            waits = self._view("execution")[window] - self._view("ready")[window]
+            return waits[~np.isnan(waits)]
+        execution, ready = self.execution, self.ready
+        waits = (execution[i] - ready[i] for i in window)
+        return [w for w in waits if w == w]
+
+    def wait_percentiles(self, percentiles=(50, 95, 99), since=None, until=None):
+        """
+        Purpose:
+            Percentiles of queue wait time, e.g. "p99 wait in the last hour".
+
+        Parameters:
+            percentiles (iterable[float]): Percentiles in [0, 100].
+            since (datetime or None): Start of the window (inclusive).
+            until (datetime or None): End of the window (exclusive).
+
+        Returns:
+            dict: Percentile -> wait time in seconds (None if no jobs match).
+                Values are linearly interpolated between ranks.
+
+        Raises:
+            ValueError: If a percentile is outside [0, 100].
+        """
+        percentiles = list(percentiles)
+        for p in percentiles:
+            if not 0 <= p <= 100:
+                raise ValueError(f"Percentile {p} is outside [0, 100].")
+        waits = self.wait_times(since, until)
+        if len(waits) == 0:
+            return {p: None for p in percentiles}
+        if np is not None:
+            return {p: float(v) for p, v in zip(percentiles, np.percentile(waits, percentiles))}
+        waits = sorted(waits)
+        return {p: _interpolate(waits, p) for p in percentiles}
+
+    def throughput(self, bucket=60.0, since=None, until=None):
+        """
+        Purpose:
+            Count finished jobs per fixed-width time bucket.
+
+        Parameters:
+            bucket (float): Bucket width in seconds.
+            since (datetime or None): Start of the window (inclusive). Buckets
+                are aligned to it; otherwise to multiples of `bucket`.
+            until (datetime or None): End of the window (exclusive).
+
+        Returns:
+            list[tuple]: (bucket start datetime, count) from the first to the
+            last non-empty bucket, including empty buckets in between.
+
+        Raises:
+            ValueError: If bucket is not positive.
+        """
+        if bucket <= 0:
+            raise ValueError("Bucket width must be positive.")
+        window = self._window(since, until)
+        if np is not None:
+            ends = self._view("end")[window]
+            if not len(ends):
+                return []
+            origin = _to_seconds(since) if since is not None else math.floor(ends.min() / bucket) * bucket
+            counts = np.bincount(((ends - origin) // bucket).astype(np.int64))
+            first = int(np.flatnonzero(counts)[0])
+            return [(_to_datetime(origin + i * bucket), int(c))
+                    for i, c in enumerate(counts[first:].tolist(), first)]
+
+        ends = [self.end[i] for i in window]
+        if not ends:
+            return []
+        origin = _to_seconds(since) if since is not None else math.floor(min(ends) / bucket) * bucket
+        counts = {}
+        for t in ends:
+            i = int((t - origin) // bucket)
+            counts[i] = counts.get(i, 0) + 1
+        return [(_to_datetime(origin + i * bucket), counts.get(i, 0))
+                for i in range(min(counts), max(counts) + 1)]
+
+    def status_counts(self, since=None, until=None):
+        """
+        Purpose:
+            Count history jobs per status.
+
+        Parameters:
+            since (datetime or None): Start of the window (inclusive).
+            until (datetime or None): End of the window (exclusive).
+
+        Returns:
+            dict: Status name -> count, for statuses that occur.
+        """
+        if since is None and until is None:
+            window = None
+        else:
+            window = self._window(since, until)
+        if np is not None:
+            codes = self._view("status")
+            if window is not None:
+                codes = codes[window]
+            counts = np.bincount(codes.astype(np.int64), minlength=len(STATUSES))
+            return {STATUSES[i]: int(c) for i, c in enumerate(counts.tolist()) if c}
+        codes = self.status if window is None else (self.status[i] for i in window)
+        counts = [0] * len(STATUSES)
+        for code in codes:
+            counts[code] += 1
+        return {STATUSES[i]: c for i, c in enumerate(counts) if c}
+
+
+_NUMPY_TYPES = {"q": "int64", "d": "float64", "b": "int8"}
+
+
+def _interpolate(values, p):
+    """Percentile of sorted values with linear interpolation (NumPy's default)."""
+    rank = (len(values) - 1) * p / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (rank - lo)
@@ -2,13 +2,16 @@
 HistoryList Class Module
 """
 
+from .history_columns import HistoryColumns
 from .node import Node
 
 
 class HistoryList:
     """
     Stores all executed jobs in the order they were completed.
-    Uses a singly linked list similar to the queue.
+    Uses a singly linked list similar to the queue, plus an array of the
+    nodes by position so the tail and any page can be reached without
+    walking from the head.
     """
 
     def __init__(self):
@@ -24,6 +27,10 @@ class HistoryList:
         """
         self.head = None
         self.tail = None
+        self.size = 0
+        self._nodes = []
+        self._columns = None
+        self._columns_tail = None
 
     def add_to_history(self, job):
         """
@@ -43,25 +50,170 @@ class HistoryList:
         else:
             self.tail.next = node
             self.tail = node
+        self._nodes.append(node)
+        self.size += 1
         return node
 
-    def display_history(self):
+    def extend(self, jobs):
         """
         Purpose:
-            Convert the history linked list into a list of Job objects.
+            Append several executed jobs with a single splice.
+
+        Parameters:
+            jobs (list[Job]): Jobs in the order they finished.
+
+        Returns:
+            list[Node]: The created nodes, in the same order.
+        """
+        nodes = [Node(job) for job in jobs]
+        if not nodes:
+            return nodes
+        for prev, nxt in zip(nodes, nodes[1:]):
+            prev.next = nxt
+
+        if self.head is None:
+            self.head = nodes[0]
+        else:
+            self.tail.next = nodes[0]
+        self.tail = nodes[-1]
+        self._nodes.extend(nodes)
+        self.size += len(nodes)
+        return nodes
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Purpose:
+            Yield jobs in executed order, one at a time, without copying
+            the history. Jobs appended during iteration are included.
 
         Parameters:
             None
 
         Returns:
-            list[Job]: Jobs in executed order.
+            iterator[Job]
         """
-        arr = []
         cur = self.head
         while cur:
-            arr.append(cur.value)
+            yield cur.value
             cur = cur.next
-        return arr
+
+    def __reversed__(self):
+        """
+        Purpose:
+            Yield jobs newest first, one at a time.
+
+        Parameters:
+            None
+
+        Returns:
+            iterator[Job]
+        """
+        nodes = self._nodes
+        for i in range(len(nodes) - 1, -1, -1):
+            yield nodes[i].value
+
+    def page(self, after=None, limit=50, reverse=False):
+        """
+        Purpose:
+            Return one page of history for cursor-based pagination. A
+            cursor is a job's 1-based position in the history, so it stays
+            valid while new jobs are appended. Costs O(limit).
+
+        Parameters:
+            after (int or None): Cursor returned by the previous page;
+                None starts at the oldest job (or the newest if reverse).
+            limit (int): Maximum jobs per page.
+            reverse (bool): Page newest first, towards older jobs.
+
+        Returns:
+            tuple[list[Job], int or None]: The page and the cursor for the
+                next one. Forward, the cursor is the position of the last
+                job returned (unchanged on an empty page, so it can be
+                polled for new jobs). Reverse, it is the position of the
+                oldest job returned, or None once the start is reached.
+
+        Raises:
+            ValueError: If limit is not positive or after is negative.
+        """
+        if limit <= 0:
+            raise ValueError("Page limit must be positive.")
+        if after is not None and after < 0:
+            raise ValueError("Page cursor cannot be negative.")
+        nodes = self._nodes
+        if reverse:
+            end = len(nodes) if after is None else min(after - 1, len(nodes))
+            start = max(0, end - limit)
+            jobs = [nodes[i].value for i in range(end - 1, start - 1, -1)]
+            return jobs, (start + 1 if start else None)
+        start = after or 0
+        jobs = [node.value for node in nodes[start:start + limit]]
+        return jobs, start + len(jobs)
+
+    def columns(self):
+        """
+        Purpose:
+            Return columnar arrays of the history for vectorized queries
+            (see HistoryColumns). They are built on first use and then kept
+            alongside the list: later calls only append the jobs added since
+            the previous call, so the hot path pays nothing for them.
+
+        Parameters:
+            None
+
+        Returns:
+            HistoryColumns: Columns covering every job in the history.
+        """
+        if self._columns is None:
+            self._columns = HistoryColumns()
+            cur = self.head
+        elif self._columns_tail is None:
+            cur = self.head
+        else:
+            cur = self._columns_tail.next
+
+        append = self._columns.append
+        last = self._columns_tail
+        while cur is not None:
+            append(cur.value)
+            last = cur
+            cur = cur.next
+        self._columns_tail = last
+        return self._columns
+
+    def display_history(self):
+        """
+        Purpose:
+            Convert the history linked list into a list of Job objects.
+
+        Parameters:
+            None
+
+        Returns:
+            list[Job]: Jobs in executed order.
+        """
+        return [node.value for node in self._nodes]
+
+    def in_range(self, since=None, until=None):
+        """
+        Purpose:
+            Return the jobs that ended in [since, until), in end-time order.
+
+        Parameters:
+            since (datetime or None): Inclusive lower bound (None: no bound).
+            until (datetime or None): Exclusive upper bound (None: no bound).
+
+        Returns:
+            list[Job]: Matching jobs (a linear scan of the list).
+        """
+        jobs = [job for job in self
+                if job.end_timestamp is not None
+                and (since is None or job.end_timestamp >= since)
+                and (until is None or job.end_timestamp < until)]
+        jobs.sort(key=lambda job: job.end_timestamp)
+        return jobs
 
     def get_last_n(self, n):
         """
@@ -72,17 +224,9 @@ class HistoryList:
             n (int): Number of most recent jobs to retrieve.
 
         Returns:
-            list[Job]: List of up to n jobs. Can be empty.
+            list[Job]: List of up to n jobs, oldest first. Can be empty.
+                Costs O(n), not O(history size).
         """
         if n <= 0:
             return []
-
-        all_jobs = self.display_history()
-        total = len(all_jobs)
-
-        if total == 0:
-            print("History is empty.")
-            return []
-
-        start_index = max(0, total - n)
-        return all_jobs[start_index:]
+        return [node.value for node in self._nodes[-n:]]
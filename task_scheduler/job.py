@@ -5,27 +5,62 @@ Job Class Module
 from datetime import datetime
 
 
+# Every status a job can have. The position in this tuple is the status
+# code used by compact storage formats.
+STATUSES = ("queued", "scheduled", "running", "executed", "failed", "cancelled", "shed")
+
+
 class Job:
     """
     Represents a single job in the system.
-    Stores its ID, submission time, status, and execution timestamp.
+    Stores its ID, submission time, status, and execution timestamp,
+    plus an optional priority and deadline used by non-FIFO policies,
+    and an optional run_at / interval for delayed and recurring jobs.
+
+    A job may carry work to run: either a callable (func) or the name of a
+    handler registered on the Scheduler, plus args / kwargs. After it runs,
+    execution_timestamp is the start time, end_timestamp the finish time,
+    and result / error hold the outcome.
     """
 
-    def __init__(self, job_id):
+    def __init__(self, job_id, submit_timestamp=None, priority=None, deadline=None,
+                 func=None, handler=None, args=(), kwargs=None):
         """
         Purpose:
             Create a new job with a unique ID and record its submission time.
 
         Parameters:
             job_id (int): The ID of the job submitted by the user.
+            submit_timestamp (datetime or None): Submission time to record.
+                Defaults to now; batch callers pass one shared timestamp.
+            priority (int or None): Higher values run first under the
+                "priority" policy. None counts as 0.
+            deadline (datetime or None): Latest desired execution time,
+                used by the "deadline" (EDF) policy.
+            func (callable or None): Function to run when the job executes.
+            handler (str or None): Name of a Scheduler-registered handler,
+                used instead of func so the job can be saved to a file.
+            args (tuple): Positional arguments for the callable.
+            kwargs (dict or None): Keyword arguments for the callable.
 
         Returns:
             None
         """
         self.job_id = job_id
-        self.submit_timestamp = datetime.now()
+        self.submit_timestamp = submit_timestamp if submit_timestamp is not None else datetime.now()
         self.status = "queued"
         self.execution_timestamp = None
+        self.priority = priority
+        self.deadline = deadline
+        self.run_at = None
+        self.interval = None
+        self.func = func
+        self.handler = handler
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.end_timestamp = None
+        self.result = None
+        self.error = None
 
     def to_dict(self):
         """
@@ -36,32 +71,53 @@ class Job:
             None
 
         Returns:
-            dict: Contains job ID, submission time, status, and execution time.
+            dict: Contains job ID, submission time, status, execution time,
+            priority, deadline, run_at, interval (seconds), handler, args,
+            kwargs, end time, and error. func and result are not saved.
         """
         return {
             "job_id": self.job_id,
             "submit_timestamp": self.submit_timestamp.isoformat(),
             "status": self.status,
             "execution_timestamp": self.execution_timestamp.isoformat()
-                if self.execution_timestamp else None
+                if self.execution_timestamp else None,
+            "priority": self.priority,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
+            "run_at": self.run_at.isoformat() if self.run_at else None,
+            "interval": self.interval,
+            "handler": self.handler,
+            "args": list(self.args),
+            "kwargs": self.kwargs,
+            "end_timestamp": self.end_timestamp.isoformat() if self.end_timestamp else None,
+            "error": self.error
         }
 
-    @staticmethod
-    def from_dict(d):
+    @classmethod
+    def from_dict(cls, d):
         """
         Purpose:
             Restore a Job object from a dictionary created using to_dict().
 
         Parameters:
-            d (dict): Dictionary containing job information.
+            d (dict): Dictionary containing job information. Files written
+                before the optional fields existed are accepted as well.
 
         Returns:
-            Job: A fully restored Job object.
+            Job: A fully restored Job object (of the class it is called on).
         """
-        j = Job(int(d["job_id"]))
-        j.submit_timestamp = datetime.fromisoformat(d["submit_timestamp"])
+        get = d.get
+        parse = datetime.fromisoformat
+        deadline = get("deadline")
+        j = cls(int(d["job_id"]), parse(d["submit_timestamp"]), get("priority"),
+                parse(deadline) if deadline else None,
+                handler=get("handler"), args=get("args") or (), kwargs=get("kwargs"))
         j.status = d["status"]
         if d["execution_timestamp"]:
-            j.execution_timestamp = datetime.fromisoformat(d["execution_timestamp"])
+            j.execution_timestamp = parse(d["execution_timestamp"])
+        if get("run_at"):
+            j.run_at = parse(d["run_at"])
+        j.interval = get("interval")
+        if get("end_timestamp"):
+            j.end_timestamp = parse(d["end_timestamp"])
+        j.error = get("error")
         return j
-
@@ -0,0 +1,223 @@
+"""
+Journal Class Module
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+
+class Journal:
+    """
+    Append-only write-ahead log of scheduler events.
+
+    Each event is one JSON line {"seq": n, "op": ..., "job": {...}}.
+    Lines are flushed and fsync'ed in groups (group commit): once
+    `group_commit` events are pending, once the oldest pending event is
+    `max_delay` seconds old (a background thread flushes a group that a
+    quiet period leaves unfilled), or whenever commit() is called.
+    Sequence numbers let a snapshot record which events it already
+    contains, so replaying the journal on top of it is safe.
+    """
+
+    def __init__(self, path, group_commit=64, seq=0, max_delay=0.05):
+        """
+        Purpose:
+            Open (or create) a journal file for appending.
+
+        Parameters:
+            path (str): Journal file path.
+            group_commit (int): Events per fsync. 1 syncs every event.
+            seq (int): Sequence number of the last event already written.
+            max_delay (float or None): Longest time in seconds an event
+                may wait for its group to fill before it is synced anyway.
+                None syncs only full groups and explicit commits.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.group_commit = max(1, group_commit)
+        self.max_delay = max_delay
+        self.seq = seq
+        self.pending = 0
+        self.appended = 0
+        self._lock = threading.Lock()
+        self._pending_since = None
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._file = open(path, "a", encoding="utf-8")
+        self._flusher = None
+        if max_delay is not None and self.group_commit > 1:
+            self._flusher = threading.Thread(target=self._flush_late, name=f"journal-{path}", daemon=True)
+            self._flusher.start()
+
+    def append(self, op, record):
+        """
+        Purpose:
+            Write one event, committing when the group is full.
+
+        Parameters:
+            op (str): Event name ("submit", "execute", "schedule", ...).
+            record (dict): Job data from Job.to_dict().
+
+        Returns:
+            int: The event's sequence number.
+        """
+        with self._lock:
+            self.seq += 1
+            self._file.write(json.dumps({"seq": self.seq, "op": op, "job": record},
+                                        separators=(",", ":")))
+            self._file.write("\n")
+            self.pending += 1
+            self.appended += 1
+            if self.pending >= self.group_commit:
+                self._commit()
+            elif self.pending == 1 and self._flusher is not None:
+                self._pending_since = time.monotonic()
+                self._wake.notify()
+            return self.seq
+
+    def commit(self):
+        """
+        Purpose:
+            Flush and fsync all pending events.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if self.pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.pending = 0
+
+    def _flush_late(self):
+        """Background loop: commit a partial group once it is max_delay old."""
+        with self._lock:
+            while not self._closed:
+                if not self.pending:
+                    self._wake.wait()
+                    continue
+                remaining = self._pending_since + self.max_delay - time.monotonic()
+                if remaining > 0:
+                    self._wake.wait(remaining)
+                    continue
+                self._commit()
+
+    def rotate(self, rotated_path):
+        """
+        Purpose:
+            Move the current journal aside and start a new, empty one.
+            Used by compaction: the rotated file is deleted once a snapshot
+            containing its events has been written. If it is still there
+            (an earlier snapshot write failed), its events are in no
+            snapshot yet, so the current journal is appended to it rather
+            than replacing it.
+
+        Parameters:
+            rotated_path (str): Where to move the current journal.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._commit()
+            self._file.close()
+            if os.path.exists(rotated_path):
+                _append_file(self.path, rotated_path)
+                os.remove(self.path)
+            else:
+                os.replace(self.path, rotated_path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self.appended = 0
+
+    def close(self):
+        """
+        Purpose:
+            Commit pending events and close the file.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            if not self._file.closed:
+                self._commit()
+                self._file.close()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+
+    @staticmethod
+    def read(path):
+        """
+        Purpose:
+            Read the events in a journal file. A torn last line (from a
+            crash in the middle of a write) ends the replay.
+
+        Parameters:
+            path (str): Journal file path.
+
+        Returns:
+            list[dict]: Events in the order they were written.
+        """
+        events = []
+        if not os.path.exists(path):
+            return events
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    break
+        return events
+
+
+def _append_file(src_path, dst_path):
+    """
+    Purpose:
+        Append one journal file to another and sync it. A torn last line
+        of the destination (which replay would stop at) is cut off first,
+        so the appended events stay readable.
+
+    Parameters:
+        src_path (str): Journal whose events are appended.
+        dst_path (str): Journal that receives them.
+
+    Returns:
+        None
+    """
+    with open(dst_path, "r+b") as dst:
+        end = dst.seek(0, os.SEEK_END)
+        keep = end
+        # Walk back in chunks to the last complete line
+        while keep:
+            start = max(0, keep - 65536)
+            dst.seek(start)
+            chunk = dst.read(keep - start)
+            if keep == end and chunk.endswith(b"\n"):
+                break
+            cut = chunk.rfind(b"\n")
+            if cut >= 0:
+                keep = start + cut + 1
+                break
+            keep = start
+        if keep != end:
+            dst.truncate(keep)
+        dst.seek(keep)
+        with open(src_path, "rb") as src:
+            shutil.copyfileobj(src, dst)
+        dst.flush()
+        os.fsync(dst.fileno())
@@ -9,6 +9,9 @@ class LinkedQueue:
     """
     A simple linked list implementation of a FIFO queue.
     Used to store waiting/queued jobs.
+
+    A node whose value is None is a tombstone left by discard(); dequeue,
+    peek and to_list skip it, so removing a job from the middle is O(1).
     """
 
     def __init__(self):
@@ -47,6 +50,31 @@ class LinkedQueue:
         self.size += 1
         return new_node
 
+    def enqueue_many(self, values):
+        """
+        Purpose:
+            Add several jobs to the end of the queue with a single splice.
+
+        Parameters:
+            values (list[Job]): Jobs to insert, in order.
+
+        Returns:
+            list[Node]: The created nodes, in the same order.
+        """
+        nodes = [Node(v) for v in values]
+        if not nodes:
+            return nodes
+        for prev, nxt in zip(nodes, nodes[1:]):
+            prev.next = nxt
+
+        if self.head is None:
+            self.head = nodes[0]
+        else:
+            self.tail.next = nodes[0]
+        self.tail = nodes[-1]
+        self.size += len(nodes)
+        return nodes
+
     def dequeue(self):
         """
         Purpose:
@@ -58,21 +86,43 @@ class LinkedQueue:
         Returns:
             Job or None: The oldest queued job, or None if empty.
         """
+        self._skip_tombstones()
         if self.head is None:
-            print("Queue is empty!")
             return None
 
         value = self.head.value
         self.head = self.head.next
 
         if self.head is None:
-            print("Queue is now empty after dequeue.")
             self.tail = None
 
-        print("Dequeued job:", value.job_id)
         self.size -= 1
         return value
 
+    def dequeue_many(self, k):
+        """
+        Purpose:
+            Remove and return up to k jobs from the front of the queue.
+
+        Parameters:
+            k (int): Maximum number of jobs to remove.
+
+        Returns:
+            list[Job]: The removed jobs in FIFO order (may be empty).
+        """
+        out = []
+        cur = self.head
+        while cur is not None and len(out) < k:
+            if cur.value is not None:
+                out.append(cur.value)
+            cur = cur.next
+
+        self.head = cur
+        if cur is None:
+            self.tail = None
+        self.size -= len(out)
+        return out
+
     def peek(self):
         """
         Purpose:
@@ -84,10 +134,9 @@ class LinkedQueue:
         Returns:
             Job or None: The first job, or None if queue empty.
         """
+        self._skip_tombstones()
         if self.head is None:
-            print("Queue is empty! Nothing to peek.")
             return None
-        print("Peeked job:", self.head.value.job_id)
         return self.head.value
 
     def is_empty(self):
@@ -103,20 +152,76 @@ class LinkedQueue:
         """
         return self.size == 0
 
-    def to_list(self):
+    def __iter__(self):
         """
         Purpose:
-            Convert all queue nodes into a list of Job objects.
+            Yield queued jobs front to back without copying the queue.
+            Do not enqueue or dequeue while iterating.
 
         Parameters:
             None
 
         Returns:
-            list[Job]: List of all jobs currently in the queue.
+            iterator[Job]
         """
-        out = []
         cur = self.head
         while cur:
-            out.append(cur.value)
+            if cur.value is not None:
+                yield cur.value
             cur = cur.next
-        return out
+
+    def to_list(self):
+        """
+        Purpose:
+            Convert all queue nodes into a list of Job objects.
+
+        Parameters:
+            None
+
+        Returns:
+            list[Job]: List of all jobs currently in the queue.
+        """
+        return list(self)
+
+    def push_front(self, value):
+        """
+        Purpose:
+            Put a job at the front of the queue, so it is dequeued next.
+
+        Parameters:
+            value (Job): The job to insert.
+
+        Returns:
+            Node: The node that was created at the head of the queue.
+        """
+        node = Node(value)
+        node.next = self.head
+        self.head = node
+        if self.tail is None:
+            self.tail = node
+        self.size += 1
+        return node
+
+    def discard(self, node):
+        """
+        Purpose:
+            Remove a queued job in O(1) by turning its node into a
+            tombstone. The node is unlinked when a dequeue passes it.
+
+        Parameters:
+            node (Node): A live node returned by enqueue / push_front.
+
+        Returns:
+            None
+        """
+        node.value = None
+        self.size -= 1
+
+    def _skip_tombstones(self):
+        """Unlink discarded nodes at the head of the queue."""
+        head = self.head
+        while head is not None and head.value is None:
+            head = head.next
+        self.head = head
+        if head is None:
+            self.tail = None
@@ -0,0 +1,361 @@
+"""
+Scheduler Metrics Module
+"""
+
+import math
+import os
+import threading
+
+from .compact_job import CompactJob, _to_seconds
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations.
+
+    Values are recorded as whole microseconds into log-linear buckets:
+    values below 2 * 16 us get one bucket each, and every power of two
+    above that is split into 16 sub-buckets. Recording is O(1), memory is
+    a few hundred counters for any range, and percentiles are accurate to
+    about 1/16 (6%) of the value.
+    """
+
+    SUB_BITS = 4
+    SUB_COUNT = 1 << SUB_BITS
+
+    def __init__(self):
+        """
+        Purpose:
+            Create an empty histogram.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def bucket_index(cls, us):
+        """Bucket index of a value in microseconds."""
+        if us < 2 * cls.SUB_COUNT:
+            return us
+        shift = us.bit_length() - cls.SUB_BITS - 1
+        return cls.SUB_COUNT * shift + (us >> shift)
+
+    @classmethod
+    def bucket_bounds(cls, index):
+        """[low, high) range in microseconds of a bucket."""
+        if index < 2 * cls.SUB_COUNT:
+            return index, index + 1
+        shift = index // cls.SUB_COUNT - 1
+        mantissa = index - cls.SUB_COUNT * shift
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, seconds):
+        """
+        Purpose:
+            Add one duration.
+
+        Parameters:
+            seconds (float): Duration; negative values count as 0.
+
+        Returns:
+            None
+        """
+        self.record_us([int(seconds * 1e6) if seconds > 0 else 0])
+
+    def record_us(self, values):
+        """
+        Purpose:
+            Add several durations given in whole microseconds.
+
+        Parameters:
+            values (list[int]): Durations; negative values (clock steps)
+                land in the lowest bucket.
+
+        Returns:
+            None
+        """
+        if not values:
+            return
+        counts = self.counts
+        limit = 2 * self.SUB_COUNT
+        sub_bits = self.SUB_BITS + 1
+        sub_count = self.SUB_COUNT
+        last = None
+        index = 0
+        for us in values:
+            if us is not last:
+                # Jobs of one batch often share a value; reuse its bucket
+                last = us
+                if us < limit:
+                    index = us if us > 0 else 0
+                else:
+                    shift = us.bit_length() - sub_bits
+                    index = sub_count * shift + (us >> shift)
+                if index >= len(counts):
+                    counts.extend([0] * (index + 1 - len(counts)))
+            counts[index] += 1
+        low = max(0, min(values))
+        high = max(values)
+        self.count += len(values)
+        self.total += sum(values)
+        if self.min is None or low < self.min:
+            self.min = low
+        if self.max is None or high > self.max:
+            self.max = high
+
+    def percentile(self, p):
+        """
+        Purpose:
+            Estimate a percentile.
+
+        Parameters:
+            p (float): Percentile in [0, 100].
+
+        Returns:
+            float or None: Seconds (the midpoint of the bucket holding the
+            percentile, clamped to the recorded min / max), or None if empty.
+
+        Raises:
+            ValueError: If p is outside [0, 100].
+        """
+        if not 0 <= p <= 100:
+            raise ValueError(f"Percentile {p} is outside [0, 100].")
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                low, high = self.bucket_bounds(index)
+                value = min(max((low + high - 1) / 2, self.min), self.max)
+                return value / 1e6
+        return self.max / 1e6
+
+    def cumulative(self):
+        """
+        Purpose:
+            List cumulative counts per bucket upper bound (for Prometheus).
+
+        Parameters:
+            None
+
+        Returns:
+            list[tuple]: (upper bound in seconds, count of values below it)
+            for each non-empty bucket.
+        """
+        out = []
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                out.append((self.bucket_bounds(index)[1] / 1e6, seen))
+        return out
+
+    def summary(self):
+        """
+        Purpose:
+            Summarize the histogram.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: count, mean, min, max, p50, p90, p99 and p999 in seconds
+            (None when empty).
+        """
+        empty = not self.count
+        summary = {
+            "count": self.count,
+            "mean": None if empty else self.total / self.count / 1e6,
+            "min": None if empty else self.min / 1e6,
+            "max": None if empty else self.max / 1e6,
+        }
+        for name, p in (("p50", 50), ("p90", 90), ("p99", 99), ("p999", 99.9)):
+            summary[name] = self.percentile(p)
+        return summary
+
+
+class SchedulerMetrics:
+    """
+    Counters and latency histograms kept by a Scheduler as it works.
+
+    Updates take a short lock so the numbers stay exact when several
+    threads submit and run jobs (ConcurrentScheduler). Each batch of jobs
+    takes the lock once.
+    """
+
+    def __init__(self):
+        """
+        Purpose:
+            Create zeroed metrics.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self.submitted = 0
+        self.executed = 0
+        self.failed = 0
+        self.duplicates_rejected = 0
+        self.cancelled = 0
+        self.queue_full = 0
+        self.shed = 0
+        self.throttled = 0
+        self.wait = LatencyHistogram()
+        self.execution = LatencyHistogram()
+        self.blocked = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record_submitted(self, n):
+        """Count n accepted submissions."""
+        with self._lock:
+            self.submitted += n
+
+    def record_rejected(self, n=1):
+        """Count n submissions rejected as duplicates."""
+        with self._lock:
+            self.duplicates_rejected += n
+
+    def record_cancelled(self, n=1):
+        """Count n cancelled jobs."""
+        with self._lock:
+            self.cancelled += n
+
+    def record_queue_full(self):
+        """Count one submission that found the queue at capacity."""
+        with self._lock:
+            self.queue_full += 1
+
+    def record_shed(self, n):
+        """Count n queued jobs shed to make room."""
+        with self._lock:
+            self.shed += n
+
+    def record_blocked(self, seconds, throttled=False):
+        """Record time a submitter spent waiting for room or (throttled) for the rate limiter."""
+        with self._lock:
+            if throttled:
+                self.throttled += 1
+            self.blocked.record(seconds)
+
+    def record_executed(self, jobs):
+        """
+        Count finished jobs and record their queue wait (execution time
+        minus the time the job became runnable: its run_at for delayed and
+        recurring jobs, which is the current occurrence, else its submit
+        time) and execution latency (end minus execution time).
+        """
+        waits = []
+        runs = []
+        failed = 0
+        compact = CompactJob
+        pair = None
+        for job in jobs:
+            if job.error:
+                failed += 1
+            if type(job) is compact:
+                # Seconds are stored directly; skip building datetimes
+                started, ready, ended = job._execution, job._submit, job._end
+                if started is None:
+                    continue
+                run_at = job.run_at
+                if run_at is not None:
+                    ready = max(ready, _to_seconds(run_at))
+                waits.append(int((started - ready) * 1e6))
+                if ended is not None:
+                    runs.append(int((ended - started) * 1e6))
+                continue
+            started = job.execution_timestamp
+            if started is None:
+                continue
+            ready, ended = job.submit_timestamp, job.end_timestamp
+            if job.run_at is not None and job.run_at > ready:
+                ready = job.run_at
+            if pair is None or pair[0] is not started or pair[1] is not ready or pair[2] is not ended:
+                # Jobs run in one batch share these objects: convert once
+                pair = (started, ready, ended, _us(started - ready),
+                        None if ended is None else _us(ended - started))
+            waits.append(pair[3])
+            if pair[4] is not None:
+                runs.append(pair[4])
+
+        with self._lock:
+            self.failed += failed
+            self.executed += len(jobs) - failed
+            self.wait.record_us(waits)
+            self.execution.record_us(runs)
+
+
+def _us(delta):
+    """timedelta -> whole microseconds."""
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def write_prometheus(filename, stats, prefix="task_scheduler"):
+    """
+    Purpose:
+        Write a Scheduler.stats() result in the Prometheus text exposition
+        format (for the node_exporter textfile collector). The file is
+        replaced atomically.
+
+    Parameters:
+        filename (str): Destination path.
+        stats (dict): Result of Scheduler.stats(include_buckets=True).
+        prefix (str): Metric name prefix.
+
+    Returns:
+        None
+    """
+    lines = []
+
+    def metric(name, kind, help_text, value):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.append(f"{prefix}_{name} {value}")
+
+    metric("jobs_submitted_total", "counter", "Jobs accepted by submit.", stats["submitted"])
+    metric("jobs_executed_total", "counter", "Jobs that ran successfully.", stats["executed"])
+    metric("jobs_failed_total", "counter", "Jobs whose callable raised.", stats["failed"])
+    metric("jobs_cancelled_total", "counter", "Jobs cancelled before running.", stats["cancelled"])
+    metric("jobs_shed_total", "counter", "Queued jobs shed to make room.", stats["shed"])
+    metric("queue_full_total", "counter", "Submissions that found the queue at capacity.",
+           stats["queue_full"])
+    metric("submissions_throttled_total", "counter", "Submissions delayed by the rate limiter.",
+           stats["throttled"])
+    metric("duplicates_rejected_total", "counter", "Submissions rejected as duplicates.",
+           stats["duplicates_rejected"])
+    metric("queue_depth", "gauge", "Jobs waiting in the queue.", stats["queue_depth"])
+    metric("scheduled_jobs", "gauge", "Delayed jobs waiting in the timer wheel.", stats["scheduled"])
+    metric("history_size", "gauge", "Entries in the execution history.", stats["history_size"])
+    metric("hash_load_factor", "gauge", "Hash table items per bucket.", stats["hash"]["load_factor"])
+    metric("hash_longest_chain", "gauge", "Longest hash chain since the last resize.",
+           stats["hash"]["longest_chain"])
+
+    for name, help_text in (("wait", "Time from submit to execution start."),
+                            ("execution", "Time from execution start to end."),
+                            ("blocked", "Time submitters waited for queue room or the rate limiter.")):
+        hist = stats[name]
+        full = f"{prefix}_{name}_seconds"
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} histogram")
+        for bound, count in hist["buckets"]:
+            lines.append(f'{full}_bucket{{le="{bound:.6g}"}} {count}')
+        lines.append(f'{full}_bucket{{le="+Inf"}} {hist["count"]}')
+        lines.append(f"{full}_sum {(hist['mean'] or 0) * hist['count']:.6f}")
+        lines.append(f"{full}_count {hist['count']}")
+
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, filename)
@@ -7,8 +7,11 @@ class Node:
     """
     Node used for all linked list structures (queue and history).
     Stores a value and a pointer to the next node.
+    Uses __slots__ so each node carries no per-instance __dict__.
     """
 
+    __slots__ = ("value", "next")
+
     def __init__(self, value):
         """
         Purpose:
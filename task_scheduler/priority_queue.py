@@ -0,0 +1,244 @@
+"""
+PriorityQueue Class Module
+"""
+
+import heapq
+from itertools import count
+
+from .node import Node
+
+
+def priority_key(job):
+    """Sort key for the "priority" policy: higher priority first."""
+    return -(job.priority or 0)
+
+
+def deadline_key(job):
+    """Sort key for the "deadline" policy: earliest deadline first, no deadline last."""
+    if job.deadline is None:
+        return (1, 0)
+    return (0, job.deadline)
+
+
+class PriorityQueue:
+    """
+    A binary heap queue with the same interface as LinkedQueue.
+    Jobs come out in order of a key function; jobs with equal keys
+    come out in the order they were enqueued (FIFO tie-breaking).
+
+    discard() removes a job in O(1) by turning its node into a tombstone
+    (value None) that is dropped when it reaches the top of the heap; the
+    heap is rebuilt once tombstones outnumber live jobs. push_front()
+    keeps jobs in a small stack that is served before the heap.
+    """
+
+    def __init__(self, key=priority_key):
+        """
+        Purpose:
+            Create an empty heap-backed queue.
+
+        Parameters:
+            key (callable): Maps a job to a sortable value; smaller values
+                are dequeued first.
+
+        Returns:
+            None
+        """
+        self.key = key
+        self.heap = []
+        self.size = 0
+        self._seq = count()
+        self._front = []
+        self._dead = 0
+
+    def enqueue(self, value):
+        """
+        Purpose:
+            Add a job to the heap in O(log n).
+
+        Parameters:
+            value (Job): The job to insert.
+
+        Returns:
+            Node: The node wrapping the job (stored in the hash table).
+        """
+        node = Node(value)
+        heapq.heappush(self.heap, (self.key(value), next(self._seq), node))
+        self.size += 1
+        return node
+
+    def enqueue_many(self, values):
+        """
+        Purpose:
+            Add several jobs, re-heapifying once when the batch is large.
+
+        Parameters:
+            values (list[Job]): Jobs to insert, in submission order.
+
+        Returns:
+            list[Node]: The created nodes, in the same order.
+        """
+        nodes = [Node(v) for v in values]
+        entries = [(self.key(n.value), next(self._seq), n) for n in nodes]
+        if len(entries) > len(self.heap):
+            self.heap.extend(entries)
+            heapq.heapify(self.heap)
+        else:
+            for e in entries:
+                heapq.heappush(self.heap, e)
+        self.size += len(nodes)
+        return nodes
+
+    def dequeue(self):
+        """
+        Purpose:
+            Remove and return the most urgent job.
+
+        Parameters:
+            None
+
+        Returns:
+            Job or None: The job with the smallest key, or None if empty.
+        """
+        out = self.dequeue_many(1)
+        return out[0] if out else None
+
+    def dequeue_many(self, k):
+        """
+        Purpose:
+            Remove and return up to k jobs in priority order.
+
+        Parameters:
+            k (int): Maximum number of jobs to remove.
+
+        Returns:
+            list[Job]: The removed jobs (may be empty).
+        """
+        out = []
+        front = self._front
+        while front and len(out) < k:
+            value = front.pop().value
+            if value is None:
+                self._dead -= 1
+            else:
+                out.append(value)
+        heap = self.heap
+        pop = heapq.heappop
+        while heap and len(out) < k:
+            value = pop(heap)[2].value
+            if value is None:
+                self._dead -= 1
+            else:
+                out.append(value)
+        self.size -= len(out)
+        return out
+
+    def peek(self):
+        """
+        Purpose:
+            Return the most urgent job without removing it.
+
+        Parameters:
+            None
+
+        Returns:
+            Job or None: The next job, or None if queue empty.
+        """
+        front = self._front
+        while front and front[-1].value is None:
+            front.pop()
+            self._dead -= 1
+        if front:
+            return front[-1].value
+        heap = self.heap
+        while heap and heap[0][2].value is None:
+            heapq.heappop(heap)
+            self._dead -= 1
+        if not heap:
+            return None
+        return heap[0][2].value
+
+    def is_empty(self):
+        """
+        Purpose:
+            Check whether the queue is empty.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if queue is empty, otherwise False.
+        """
+        return self.size == 0
+
+    def __iter__(self):
+        """
+        Purpose:
+            Yield queued jobs in the order they would be dequeued. The heap
+            is sorted once when iteration starts (O(n log n)); jobs are
+            then yielded one at a time.
+
+        Parameters:
+            None
+
+        Returns:
+            iterator[Job]
+        """
+        for node in reversed(self._front):
+            if node.value is not None:
+                yield node.value
+        for entry in sorted(self.heap):
+            if entry[2].value is not None:
+                yield entry[2].value
+
+    def to_list(self):
+        """
+        Purpose:
+            List all queued jobs in the order they would be dequeued.
+
+        Parameters:
+            None
+
+        Returns:
+            list[Job]: Jobs sorted by (key, submission order).
+        """
+        return list(self)
+
+    def push_front(self, value):
+        """
+        Purpose:
+            Put a job ahead of every queued job, whatever its key. Jobs
+            pushed later come out first.
+
+        Parameters:
+            value (Job): The job to insert.
+
+        Returns:
+            Node: The node wrapping the job (stored in the hash table).
+        """
+        node = Node(value)
+        self._front.append(node)
+        self.size += 1
+        return node
+
+    def discard(self, node):
+        """
+        Purpose:
+            Remove a queued job in O(1) by turning its node into a tombstone.
+
+        Parameters:
+            node (Node): A live node returned by enqueue / push_front.
+
+        Returns:
+            None
+        """
+        node.value = None
+        self.size -= 1
+        self._dead += 1
+        if self._dead > 64 and self._dead > len(self.heap) // 2:
+            # Mostly tombstones (or the dead nodes are in the front stack):
+            # rebuild the heap from live entries
+            self.heap = [entry for entry in self.heap if entry[2].value is not None]
+            heapq.heapify(self.heap)
+            self._front = [n for n in self._front if n.value is not None]
+            self._dead = 0
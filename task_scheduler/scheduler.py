@@ -2,63 +2,497 @@
 Scheduler Class Module
 """
 
-from datetime import datetime
-import json
+from concurrent.futures import wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+import contextlib
+import copy
+import functools
+import os
+import threading
+import time
 
 from .job import Job
-from .linked_queue import LinkedQueue
+from .compact_job import CompactJob
+from .timer_wheel import TimerWheel
 from .history_list import HistoryList
-from .hash_table import HashTable
+from .executors import make_executor, missing_handler, timed_call
+from .journal import Journal
+from .events import EventHooks
+from .metrics import SchedulerMetrics, write_prometheus
+from .storage import make_storage
+from .admission import OVERFLOW_POLICIES, QueueFullError, ShedOrder, TokenBucket, job_footprint
+from .snapshot_io import write_json_snapshot, read_snapshot
+from .binary_snapshot import write_binary_snapshot
+from .background_save import SAVE_METHODS, SnapshotHandle, start_child_writer, start_thread_writer
 
 
 class Scheduler:
     """
     Main system that manages job submission, execution,
     queueing, history tracking, and file saving/loading.
+
+    Delayed and recurring jobs wait in a TimerWheel and are moved into
+    the queue when run_next_task / run_batch / run_all find them due.
+
+    Jobs that carry a callable are run inline by default, or on a thread
+    or process pool when an executor is configured. History records jobs
+    in the order they finish.
+
+    Nothing is printed on the hot paths; register listeners on `events`
+    (see EventHooks), or call events.log_to() to report through logging.
     """
 
-    def __init__(self, hash_size=53):
+    # Queue policies: "fifo" keeps the original LinkedQueue behaviour,
+    # "priority" runs higher-priority jobs first and "deadline" runs the
+    # earliest deadline first. Ties keep submission order.
+    POLICIES = ("fifo", "priority", "deadline")
+
+    def __init__(self, hash_size=53, max_load_factor=2.0, min_load_factor=0.25, policy="fifo",
+                 executor=None, max_workers=None, compact=False, metrics=True, dedup="exact",
+                 dedup_options=None, storage="memory", storage_options=None, max_queue=None,
+                 max_queue_bytes=None, overflow="reject", block_timeout=None, rate_limit=None,
+                 rate_burst=None):
         """
         Purpose:
             Set up the scheduler with a queue, hash table, and history list.
 
         Parameters:
-            hash_size (int): Bucket count for hash table.
+            hash_size (int): Initial bucket count for hash table.
+            max_load_factor (float or None): Load factor above which the
+                hash table grows. None keeps it at hash_size buckets.
+            min_load_factor (float or None): Load factor below which the
+                hash table shrinks back towards hash_size.
+            policy (str): Queue ordering, one of POLICIES.
+            executor (str, Executor or None): "thread", "process", an
+                existing concurrent.futures.Executor, or None to run job
+                callables inline.
+            max_workers (int or None): Pool size, and the maximum number of
+                jobs in flight at once when draining through the executor.
+            compact (bool): Store jobs as CompactJob objects, which use a
+                fraction of the memory of Job at some attribute-access cost.
+            metrics (bool): Keep counters and latency histograms for stats().
+            dedup (str or object): Store for executed IDs: "exact" (a set,
+                with executed jobs kept in the hash index), or a bounded
+                store - "intervals", "bloom", "ttl", or any object with
+                add / update / in / len / clear (see dedup.py). With a
+                bounded store, executed jobs leave the hash index, so
+                find_job() no longer finds them.
+            dedup_options (dict or None): Arguments for the named store,
+                e.g. {"ttl": 3600} or {"capacity": 10**6, "error_rate": 0.001}.
+            storage (str or object): Where queue, history and executed IDs
+                live: "memory" (the default linked lists and hash table),
+                "sqlite" (tables of a SQLite database, see storage.py), or
+                a backend object.
+            storage_options (dict or None): Arguments for the named backend,
+                e.g. {"path": "jobs.db"}. A SQLite database that already
+                holds jobs is resumed.
+            max_queue (int or None): Most jobs the ready queue may hold.
+            max_queue_bytes (int or None): Memory budget for the ready
+                queue, turned into a depth with an estimate of the bytes
+                per queued job (see admission.job_footprint).
+            overflow (str): What a submission does when the queue is at
+                capacity, one of OVERFLOW_POLICIES: "reject" raises
+                QueueFullError; "block" waits up to block_timeout seconds
+                for runner threads to make room (ConcurrentScheduler; a
+                plain Scheduler has no other threads and raises at once);
+                "shed" drops the lowest-value queued jobs (see
+                admission.ShedOrder) into history with status "shed", or
+                raises if the new jobs are worth less than all of them.
+            block_timeout (float or None): Longest wait of "block" and of
+                the rate limiter; None waits as long as needed.
+            rate_limit (float or None): Token-bucket limit on submissions,
+                in jobs per second (see admission.TokenBucket).
+            rate_burst (float or None): Jobs accepted at once before the
+                rate limit applies (default: one second's worth).
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the policy, executor, dedup store, storage
+                backend or overflow policy is unknown.
         """
-        self.queue = LinkedQueue()
-        self.hash = HashTable(hash_size)
-        self.history = HistoryList()
-        self.executed_ids = set()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy!r}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self.policy = policy
+        self.job_class = CompactJob if compact else Job
+        self.hash_size = hash_size
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.storage = make_storage(storage, **(storage_options or {}))
+        self.executed_ids = self.storage.new_dedup(dedup, dedup_options or {})
+        # Only the exact store keeps executed jobs findable in the hash
+        self.index_history = dedup == "exact" or isinstance(self.executed_ids, set)
+        self.queue = self._new_queue()
+        self.hash = self._new_hash_table()
+        self.history = self._new_history()
+        self.timers = TimerWheel()
+        for job in self.storage.load_scheduled(self.job_class):
+            self.timers.schedule(job.run_at.timestamp(), job)
+        self.handlers = {}
+        self.events = EventHooks()
+        self.metrics = SchedulerMetrics() if metrics else None
+        self.executor = make_executor(executor, max_workers)
+
+        self.queue_capacity = max_queue
+        if max_queue_bytes is not None:
+            by_bytes = max(1, max_queue_bytes // job_footprint(self.job_class))
+            self.queue_capacity = by_bytes if max_queue is None else min(max_queue, by_bytes)
+        self.overflow = overflow
+        self.shed_order = ShedOrder(policy, self._is_queued) if overflow == "shed" else None
+        if self.shed_order is not None and not self.queue.is_empty():
+            self.shed_order.rebuild(self.queue)
+        self.block_timeout = block_timeout
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst) if rate_limit else None
+        self.max_workers = max_workers or getattr(self.executor, "_max_workers", None) or 1
+
+        self.journal = None
+        self.journal_path = None
+        self.compact_every = None
+        self.compaction_error = None
+        self._compactor = None
+        self._compaction_lock = threading.Lock()
+        self._saver = None
+        self._save_lock = threading.Lock()
+        self._loaded_seq = 0
 
-    def submit_task(self, job_id):
+    def register_handler(self, name, func):
+        """
+        Purpose:
+            Register a function that jobs can reference by name.
+
+        Parameters:
+            name (str): Handler name stored on jobs (and in saved files).
+            func (callable): The function to run. Must be picklable
+                (a module-level function) for the process executor.
+
+        Returns:
+            None
+        """
+        self.handlers[name] = func
+
+    def shutdown(self, wait=True):
+        """
+        Purpose:
+            Shut down the executor pool, if one is configured, and close
+            the storage backend.
+
+        Parameters:
+            wait (bool): Wait for running jobs to finish.
+
+        Returns:
+            None
+        """
+        self._wait_save()
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+        self.storage.close()
+
+    def _new_queue(self):
+        """Create an empty queue for this scheduler's policy."""
+        return self.storage.new_queue(self.policy, self.job_class)
+
+    def _new_hash_table(self):
+        """Create an empty hash table using this scheduler's settings."""
+        return self.storage.new_index(self.hash_size, self.max_load_factor, self.min_load_factor,
+                                      self.index_history)
+
+    def _new_history(self):
+        """Create an empty history list."""
+        return self.storage.new_history(self.job_class)
+
+    def submit_task(self, job_id, priority=None, deadline=None, run_at=None, interval=None,
+                    func=None, handler=None, args=(), kwargs=None):
         """
         Purpose:
             Add a job to the queue if it is not already queued or executed.
+            Jobs with a future run_at wait in the timer wheel instead.
 
         Parameters:
             job_id (int)
+            priority (int or None): Used by the "priority" policy.
+            deadline (datetime or None): Used by the "deadline" policy.
+            run_at (datetime, timedelta or None): When the job becomes
+                runnable; a timedelta is taken relative to now.
+            interval (float, timedelta or None): Re-run the job at this
+                fixed rate (seconds). Each run is added to history and the
+                job is re-armed for the next slot.
+            func (callable or None): Function to run when the job executes.
+            handler (str or None): Name of a registered handler to run.
+            args (tuple): Positional arguments for func / handler.
+            kwargs (dict or None): Keyword arguments for func / handler.
 
         Returns:
             Job: The newly created job.
 
         Raises:
-            ValueError: If the job is duplicated.
+            ValueError: If the job is duplicated or the handler is unknown.
+            QueueFullError: If the queue is at capacity (see overflow).
         """
+        if handler is not None and handler not in self.handlers:
+            raise ValueError(f"Unknown handler: {handler!r}")
+        if self.rate_limiter is not None:
+            self._throttle(1)
+
         if self.hash.search(job_id) is not None:
+            self._reject()
             raise ValueError("This job already exists in queue.")
 
         if job_id in self.executed_ids:
+            self._reject()
             raise ValueError("Job already executed earlier.")
 
-        job = Job(job_id)
-        node = self.queue.enqueue(job)
-        # Insert the queue node into the hash so the table references the queue item
-        self.hash.insert(node)
+        job = self.job_class(job_id, priority=priority, deadline=deadline,
+                  func=func, handler=handler, args=args, kwargs=kwargs)
+        if isinstance(run_at, timedelta):
+            run_at = job.submit_timestamp + run_at
+        if isinstance(interval, timedelta):
+            interval = interval.total_seconds()
+        if interval is not None and interval <= 0:
+            raise ValueError("Interval must be positive.")
+        job.run_at = run_at
+        job.interval = interval
+
+        if run_at is not None and run_at > job.submit_timestamp:
+            self._schedule(job)
+        else:
+            self._admit([job])
+        if self.metrics is not None:
+            self.metrics.record_submitted(1)
+        if self.events.on_submit:
+            self.events.emit("on_submit", [job])
+        self.storage.commit()
+        self._maybe_compact()
         return job
 
+    def _reject(self):
+        """Count a submission rejected as a duplicate."""
+        if self.metrics is not None:
+            self.metrics.record_rejected()
+
+    def _throttle(self, n):
+        """Wait for n rate-limiter tokens, recording the time spent waiting."""
+        waited = self.rate_limiter.acquire(n, self.block_timeout)
+        if waited and self.metrics is not None:
+            self.metrics.record_blocked(waited, throttled=True)
+
+    def _admit(self, jobs):
+        """
+        Internal helper that appends validated jobs to the queue and indexes
+        their queue nodes in the hash, applying the overflow policy when
+        they do not fit. Subclasses wrap this in locks.
+        """
+        if self.queue_capacity is not None and self.queue.size + len(jobs) > self.queue_capacity:
+            self._queue_full(jobs)
+        insert = self.hash.insert
+        if len(jobs) == 1:
+            # Insert the queue node into the hash so the table references the queue item
+            insert(self.queue.enqueue(jobs[0]))
+        else:
+            for node in self.queue.enqueue_many(jobs):
+                insert(node)
+        if self.shed_order is not None:
+            self.shed_order.push(jobs, self.queue.size)
+        self._log("submit", jobs)
+
+    def _queue_full(self, jobs):
+        """
+        Apply the overflow policy to jobs that do not fit in the queue:
+        return once there is room for them, or raise QueueFullError.
+        """
+        capacity = self.queue_capacity
+        if self.metrics is not None:
+            self.metrics.record_queue_full()
+        if self.events.on_queue_full:
+            self.events.emit("on_queue_full", jobs, self.queue.size)
+        if len(jobs) > capacity:
+            raise QueueFullError(f"A batch of {len(jobs)} jobs exceeds the queue capacity of {capacity}.")
+
+        if self.overflow == "block":
+            start = time.monotonic()
+            room = self._wait_for_room(len(jobs), self.block_timeout)
+            if self.metrics is not None:
+                self.metrics.record_blocked(time.monotonic() - start)
+            if room:
+                return
+        elif self.overflow == "shed":
+            self._shed_for(jobs)
+            return
+        raise QueueFullError(f"Queue is full ({self.queue.size} of {capacity} jobs).")
+
+    def _wait_for_room(self, n, timeout):
+        """
+        Wait until n more jobs fit in the queue; return whether they do.
+        A plain Scheduler runs jobs on the calling thread, so nothing can
+        make room while it waits (ConcurrentScheduler overrides this).
+        """
+        return self.queue.size + n <= self.queue_capacity
+
+    def _shed_for(self, jobs):
+        """
+        Make room for jobs by shedding the lowest-value queued jobs in
+        shed_order (see admission.ShedOrder), O(k log n) for k victims.
+        Raises QueueFullError (shedding nothing) if any of the new jobs is
+        among the lowest-value work.
+        """
+        now = datetime.now()
+        victims = []
+        try:
+            # A victim a work-stealing runner took meanwhile is skipped; the
+            # queue is then one shorter, so the next round asks for fewer
+            while True:
+                need = self.queue.size + len(jobs) - self.queue_capacity
+                if need <= 0:
+                    return
+                lowest = self.shed_order.victims(need, jobs)
+                if lowest is None:
+                    raise QueueFullError(f"Queue is full ({self.queue.size} jobs) and the new jobs are "
+                                         f"worth less than the queued ones.")
+                for job in lowest:
+                    entry = self._queued_entry(job)
+                    if entry is None:
+                        continue
+                    with self._hold(entry):
+                        if self._queued_entry(job) is None:
+                            continue
+                        job = self.hash._extract_job(entry)
+                        self.hash.remove(job.job_id)
+                        self.queue.discard(entry)
+                        job.status = "shed"
+                        job.end_timestamp = now
+                    victims.append(job)
+        finally:
+            if victims:
+                self._record_shed(victims)
+
+    def _queued_entry(self, job):
+        """
+        Hash entry of job if that job, and not a later one that reused its
+        ID, is waiting in the queue; otherwise None. Storage backends may
+        hand out copies, so a copy counts when its submit time matches.
+        """
+        entry = self.hash.entry(job.job_id)
+        if entry is None:
+            return None
+        current = self.hash._extract_job(entry)
+        if current.status != "queued":
+            return None
+        if current is not job and current.submit_timestamp != job.submit_timestamp:
+            return None
+        return entry
+
+    def _is_queued(self, job):
+        """Whether this job is waiting in the queue (for ShedOrder)."""
+        return self._queued_entry(job) is not None
+
+    def _record_shed(self, jobs):
+        """Append shed jobs to history and log them."""
+        self.history.extend(jobs)
+        self._log("shed", jobs)
+        if self.metrics is not None:
+            self.metrics.record_shed(len(jobs))
+
+    def _log(self, op, jobs):
+        """Append events for jobs to the journal, if one is open."""
+        if self.journal is None:
+            return
+        append = self.journal.append
+        for job in jobs:
+            append(op, job.to_dict())
+
+    def _schedule(self, job):
+        """Park a job in the timer wheel until its run_at time."""
+        job.status = "scheduled"
+        if self.hash.replace(job) is False:
+            self.hash.insert(job)
+        self.timers.schedule(job.run_at.timestamp(), job)
+        self._log("schedule", [job])
+
+    def _promote_due(self):
+        """Move timers that have come due into the ready queue."""
+        if not self.timers.size:
+            return
+        promoted = []
+        for job in self.timers.advance():
+            if job.status != "scheduled":
+                continue
+            job.status = "queued"
+            self.hash.replace(self.queue.enqueue(job))
+            promoted.append(job)
+        # Journal the promotion so replay puts the job behind the jobs
+        # that were queued before it came due, as the live queue does
+        self._log("promote", promoted)
+        if self.shed_order is not None and promoted:
+            self.shed_order.push(promoted, self.queue.size)
+
+    def _hold(self, entry):
+        """
+        Context in which a queued entry cannot be taken by a runner, so its
+        status can be checked and the entry discarded as one step. The
+        queue lock already ensures this, except for per-worker deques.
+        """
+        return contextlib.nullcontext()
+
+    def _locate(self, job):
+        """Name the structure that currently holds a job (see find_job)."""
+        if job.status == "queued":
+            return ("queue", job)
+        if job.status in ("scheduled", "running"):
+            return (job.status, job)
+        return ("history", job)
+
+    def submit_many(self, job_ids, priority=None, deadline=None):
+        """
+        Purpose:
+            Add a batch of jobs to the queue atomically. The whole batch is
+            validated first; if any ID is a duplicate nothing is enqueued.
+
+        Parameters:
+            job_ids (iterable[int])
+            priority (int or None): Priority given to every job in the batch.
+            deadline (datetime or None): Deadline given to every job in the batch.
+
+        Returns:
+            list[Job]: The newly created jobs, in submission order.
+
+        Raises:
+            ValueError: If an ID repeats inside the batch, is already queued,
+                or was executed earlier.
+            QueueFullError: If the batch does not fit in the queue (see
+                overflow); nothing is enqueued.
+        """
+        job_ids = list(job_ids)
+        if self.rate_limiter is not None:
+            self._throttle(len(job_ids))
+        seen = set()
+        search = self.hash.search
+        executed = self.executed_ids
+        for job_id in job_ids:
+            if job_id in seen:
+                self._reject()
+                raise ValueError(f"Job {job_id} appears more than once in batch.")
+            if job_id in executed:
+                self._reject()
+                raise ValueError(f"Job {job_id} already executed earlier.")
+            if search(job_id) is not None:
+                self._reject()
+                raise ValueError(f"Job {job_id} already exists in queue.")
+            seen.add(job_id)
+
+        now = datetime.now()
+        job_class = self.job_class
+        jobs = [job_class(job_id, now, priority, deadline) for job_id in job_ids]
+        self._admit(jobs)
+        if self.metrics is not None:
+            self.metrics.record_submitted(len(jobs))
+        if self.events.on_submit:
+            self.events.emit("on_submit", jobs)
+        self.storage.commit()
+        self._maybe_compact()
+        return jobs
+
     def find_job(self, job_id):
         """
         Purpose:
@@ -70,21 +504,113 @@ class Scheduler:
         Returns:
             tuple or None:
                 ("queue", Job) if found in queue
+                ("scheduled", Job) if waiting for its run_at time
+                ("running", Job) if handed to the executor
                 ("history", Job) if found in history
-                None if not found
+                None if not found (executed jobs are not found when a
+                bounded dedup store is configured)
         """
-        # If executed, prefer history lookup
-        if job_id in self.executed_ids:
-            for x in self.history.display_history():
-                if x.job_id == job_id:
-                    return ("history", x)
-
-        # Otherwise check hash table (which stores queue nodes or jobs)
+        # The hash indexes both queue nodes and history nodes, so a single
+        # lookup covers both; the job status tells us which list holds it.
         j = self.hash.search(job_id)
-        if j:
-            return ("queue", j)
+        if j is None:
+            return None
+        return self._locate(j)
 
-        return None
+    def find_jobs(self, job_ids):
+        """
+        Purpose:
+            Locate many jobs in one call using the hash index.
+
+        Parameters:
+            job_ids (iterable[int])
+
+        Returns:
+            list: One find_job() style result per ID, in the same order
+            (None for IDs that are not known).
+        """
+        search = self.hash.search
+        locate = self._locate
+        out = []
+        for job_id in job_ids:
+            j = search(job_id)
+            out.append(None if j is None else locate(j))
+        return out
+
+    def cancel(self, job_id):
+        """
+        Purpose:
+            Cancel a queued or delayed job in O(1). The job leaves the
+            queue (its node becomes a tombstone that dequeue skips) or the
+            timer wheel, is removed from the hash index, and is added to
+            history with status "cancelled". Its ID can be submitted again.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: The cancelled job.
+
+        Raises:
+            ValueError: If the job is unknown, running or already finished.
+        """
+        entry = self.hash.entry(job_id)
+        if entry is None:
+            raise ValueError(f"Job {job_id} not found.")
+        with self._hold(entry):
+            job = self.hash._extract_job(entry)
+            if job.status not in ("queued", "scheduled"):
+                raise ValueError(f"Job {job_id} is {job.status} and cannot be cancelled.")
+
+            self.hash.remove(job_id)
+            if job.status == "queued":
+                self.queue.discard(entry)
+            else:
+                self.timers.cancel(job.run_at.timestamp(), job)
+            job.status = "cancelled"
+        job.end_timestamp = datetime.now()
+        self._record_cancelled(job)
+        self.storage.commit()
+        return job
+
+    def _record_cancelled(self, job):
+        """Append a cancelled job to history and log it."""
+        self.history.add_to_history(job)
+        self._log("cancel", [job])
+        if self.metrics is not None:
+            self.metrics.record_cancelled()
+
+    def move_to_front(self, job_id):
+        """
+        Purpose:
+            Move a queued job to the front of the queue in O(1), so it is
+            the next job to run. Under the "priority" and "deadline"
+            policies the move lasts until the scheduler is reloaded, when
+            jobs are ordered by their keys again.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: The moved job.
+
+        Raises:
+            ValueError: If the job is unknown or not queued.
+        """
+        entry = self.hash.entry(job_id)
+        if entry is None:
+            raise ValueError(f"Job {job_id} not found.")
+        with self._hold(entry):
+            job = self.hash._extract_job(entry)
+            if job.status != "queued":
+                raise ValueError(f"Job {job_id} is {job.status}, not queued.")
+
+            # Index the new node before the old one turns into a tombstone
+            self.hash.replace(self.queue.push_front(job))
+            self.queue.discard(entry)
+        self._log("move_to_front", [job])
+        self.storage.commit()
+        return job
 
     def run_next_task(self):
         """
@@ -97,29 +623,188 @@ class Scheduler:
         Returns:
             Job or None: The executed job, or None if queue empty.
         """
-        if self.queue.is_empty():
-            print("No tasks in queue.")
+        self._promote_due()
+        jobs = self.queue.dequeue_many(1)
+        if not jobs:
+            self.storage.commit()
             return None
 
-        job = self.queue.dequeue()
-        # Remove the queue node (or job) reference from the hash
-        self.hash.remove(job.job_id)
+        job = jobs[0]
+        if self.events.on_dequeue:
+            self.events.emit("on_dequeue", jobs)
+        self._execute(jobs)
+        self.storage.commit()
+        self._maybe_compact()
+        return job
 
-        print("Executing job:", job.job_id)
-        job.status = "executed"
-        job.execution_timestamp = datetime.now()
+    def _callable_for(self, job):
+        """
+        Return the function a job should run, or None if it has no work.
+        A handler that is not registered resolves to one that fails the job.
+        """
+        if job.func is not None:
+            return job.func
+        if job.handler is not None:
+            func = self.handlers.get(job.handler)
+            return func if func is not None else functools.partial(missing_handler, job.handler)
+        return None
 
-        # Add to history and insert the history node into the hash
-        history_node = self.history.add_to_history(job)
-        self.hash.insert(history_node)
-        self.executed_ids.add(job.job_id)
+    def _execute(self, jobs):
+        """
+        Internal helper that runs dequeued jobs and records them in history.
 
-        return job
+        Returns:
+            list[Job]: The jobs in the order they finished.
+        """
+        if self.executor is None or not any(self._callable_for(j) for j in jobs):
+            now = datetime.now()
+            for job in jobs:
+                func = self._callable_for(job)
+                if func is not None:
+                    self._apply_outcome(job, timed_call(func, job.args, job.kwargs))
+            self._record_executed(jobs, now)
+            return jobs
+        return self._dispatch(jobs)
+
+    def _dispatch(self, jobs):
+        """
+        Internal helper that runs jobs on the executor, keeping at most
+        max_workers in flight, and records each round of completions in
+        history as it arrives.
+        """
+        finished = []
+        pending = {}
+        it = iter(jobs)
+        exhausted = False
+        while True:
+            # Top up the pool; jobs without a callable finish immediately
+            ready = []
+            while not exhausted and len(pending) < self.max_workers:
+                job = next(it, None)
+                if job is None:
+                    exhausted = True
+                    break
+                func = self._callable_for(job)
+                if func is None:
+                    ready.append(job)
+                    continue
+                job.status = "running"
+                future = self.executor.submit(timed_call, func, job.args, job.kwargs)
+                pending[future] = job
+
+            if ready:
+                self._record_executed(ready, datetime.now())
+                finished.extend(ready)
+            if not pending:
+                if exhausted:
+                    return finished
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            completed = []
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    # The pool itself failed (e.g. unpicklable callable)
+                    now = datetime.now()
+                    outcome = (now, now, None, repr(exc))
+                self._apply_outcome(job, outcome)
+                completed.append(job)
+            completed.sort(key=lambda j: j.end_timestamp)
+            self._record_executed(completed, datetime.now())
+            finished.extend(completed)
+
+    def _apply_outcome(self, job, outcome):
+        """Copy a timed_call() result tuple onto the job."""
+        job.execution_timestamp, job.end_timestamp, job.result, job.error = outcome
+
+    def _record_executed(self, jobs, now):
+        """
+        Internal helper that marks jobs executed (or failed), appends them
+        to history in one splice and points their hash entries at the
+        history nodes. Jobs that did not run a callable get `now` as both
+        start and end time. Recurring jobs get a history copy and are
+        re-armed in the wheel.
+        """
+        entries = []
+        for job in jobs:
+            job.status = "failed" if job.error else "executed"
+            if job.end_timestamp is None:
+                job.execution_timestamp = now
+                job.end_timestamp = now
+            entries.append(copy.copy(job) if job.interval else job)
+
+        replace = self.hash.replace
+        remove = self.hash.remove
+        index = self.index_history
+        executed = self.executed_ids
+        for node in self.history.extend(entries):
+            job = node.value
+            if job.interval:
+                # Only the live recurring job stays indexed
+                continue
+            # Remember the ID before it can leave the index
+            executed.add(job.job_id)
+            if index:
+                replace(node)
+            else:
+                remove(job.job_id)
+        self._log("execute", entries)
+        if self.metrics is not None:
+            self.metrics.record_executed(entries)
+        if self.events.on_execute:
+            self.events.emit("on_execute", entries)
+
+        for job in jobs:
+            if job.interval:
+                self._rearm(job, now)
+
+    def _rearm(self, job, now):
+        """Schedule the next fixed-rate run of a recurring job after `now`."""
+        step = timedelta(seconds=job.interval)
+        base = job.run_at or job.execution_timestamp
+        missed = int((now - base) / step) + 1 if now >= base else 1
+        job.run_at = base + missed * step
+        job.execution_timestamp = None
+        job.end_timestamp = None
+        job.result = None
+        job.error = None
+        self._schedule(job)
+
+    def run_batch(self, k):
+        """
+        Purpose:
+            Execute up to k jobs from the front of the queue. Jobs without
+            a callable share one execution timestamp and are appended to
+            history in one splice; jobs with a callable are run inline or
+            on the executor and recorded as they finish.
+
+        Parameters:
+            k (int): Maximum number of jobs to execute.
+
+        Returns:
+            list[Job]: The executed jobs in completion order (may be empty).
+        """
+        self._promote_due()
+        jobs = self.queue.dequeue_many(k)
+        if not jobs:
+            self.storage.commit()
+            return jobs
+
+        if self.events.on_dequeue:
+            self.events.emit("on_dequeue", jobs)
+        jobs = self._execute(jobs)
+        self.storage.commit()
+        self._maybe_compact()
+        return jobs
 
     def run_all(self):
         """
         Purpose:
-            Execute all queued tasks in FIFO order.
+            Execute all queued tasks in queue-policy order, dispatching
+            them to the executor when one is configured.
 
         Parameters:
             None
@@ -127,36 +812,166 @@ class Scheduler:
         Returns:
             list[Job]: All executed jobs.
         """
-        executed = []
-        while not self.queue.is_empty():
-            job = self.run_next_task()
-            if job:
-                executed.append(job)
-        return executed
+        self._promote_due()
+        return self.run_batch(self.queue.size)
+
+    def _snapshot_data(self, as_dicts=True):
+        """
+        Build the snapshot sections of queue, scheduled jobs and history.
+        Compaction needs dicts (a frozen copy); a direct save can pass the
+        Job objects and let the writer convert them one at a time.
+        """
+        sections = {
+            "queue": self.queue.to_list(),
+            "scheduled": [job for job in self.timers.items() if job.status == "scheduled"],
+            "history": self.history.display_history()
+        }
+        if as_dicts:
+            sections = {name: [job.to_dict() for job in jobs] for name, jobs in sections.items()}
+        sections["journal_seq"] = self.journal.seq if self.journal is not None else 0
+        return sections
+
+    @staticmethod
+    def _write_snapshot(filename, data):
+        """Write snapshot sections atomically (see snapshot_io)."""
+        write_json_snapshot(filename, data["journal_seq"], data)
 
-    def save_to_file(self, filename):
+    def save_to_file(self, filename, format="json"):
         """
         Purpose:
-            Save queue and history data into a JSON file.
+            Save queue, scheduled jobs, and history data into a file.
+            The file is replaced atomically, so a crash mid-save leaves the
+            previous version intact. Saving to the journal's own snapshot
+            file is a synchronous compaction.
 
         Parameters:
             filename (str)
+            format (str): "json", or "binary" for compact fixed-width
+                records that can be queried through MappedSnapshot.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the format is unknown.
         """
-        data = {
-            "queue": [job.to_dict() for job in self.queue.to_list()],
-            "history": [job.to_dict() for job in self.history.display_history()]
+        if format not in ("json", "binary"):
+            raise ValueError(f"Unknown snapshot format: {format!r}")
+        if self.journal is not None and filename == self.journal_path:
+            self.compact(wait=True)
+        else:
+            self._write_sections(filename, format, self._snapshot_data(as_dicts=False))
+        if self.events.on_save:
+            self.events.emit("on_save", filename, format)
+
+    def _write_sections(self, filename, format, data):
+        """Write captured snapshot sections in the given format."""
+        if format == "binary":
+            write_binary_snapshot(filename, data["journal_seq"], data["queue"], data["history"],
+                                  data["scheduled"])
+        else:
+            self._write_snapshot(filename, data)
+
+    def save_async(self, filename, format="json", method=None):
+        """
+        Purpose:
+            Save a point-in-time snapshot (as save_to_file) without holding
+            up the caller for the serialization. With method="fork" a child
+            process writes its copy-on-write image of the scheduler, so the
+            caller only pays for the fork. With method="thread" queued and
+            delayed jobs are copied as dicts and the history is captured by
+            length (recorded entries never change), then a thread writes
+            the file. Either way the file is replaced atomically by rename.
+            A save still running is waited for first, since both would
+            write the same temporary file.
+
+        Parameters:
+            filename (str)
+            format (str): "json" or "binary".
+            method (str or None): "fork" or "thread" (see SAVE_METHODS).
+                None picks fork where the platform and storage allow it.
+
+        Returns:
+            SnapshotHandle: Reports status ("running", "done" or
+                "failed"), error, and wait()/result() for completion.
+
+        Raises:
+            ValueError: If the format or method is unknown or unavailable,
+                or the file is the journal's own snapshot (use compact()).
+        """
+        if format not in ("json", "binary"):
+            raise ValueError(f"Unknown snapshot format: {format!r}")
+        if method is None:
+            method = self._default_save_method()
+        if method not in SAVE_METHODS:
+            raise ValueError(f"Unknown save method: {method!r}. Expected one of {SAVE_METHODS}.")
+        if method == "fork" and self._default_save_method() != "fork":
+            raise ValueError("Fork-based saves need os.fork() and in-memory storage.")
+        if self.journal is not None and filename == self.journal_path:
+            raise ValueError("Use compact() to snapshot the journal's own file.")
+        with self._save_lock:
+            self._wait_save()
+            handle = SnapshotHandle(filename, method)
+            start = time.perf_counter()
+            self._start_save(handle, format)
+            handle.capture_seconds = time.perf_counter() - start
+            self._saver = handle
+        return handle
+
+    def _default_save_method(self):
+        """Fork where a child process can safely read the in-memory state."""
+        return "fork" if hasattr(os, "fork") and isinstance(self.history, HistoryList) else "thread"
+
+    def _start_save(self, handle, format):
+        """Capture the snapshot and start its writer (subclasses lock the capture)."""
+        if handle.method == "fork":
+            start_child_writer(handle, lambda: self._write_sections(
+                handle.filename, format, self._snapshot_data(as_dicts=False)))
+            return
+
+        history = self.history
+        if isinstance(history, HistoryList):
+            # Appended entries are never modified, and a restore builds a
+            # new list, so the first n entries stay as they are now
+            n = len(history)
+            data = self._snapshot_data_without_history()
+        else:
+            data = self._snapshot_data()
+
+        def write():
+            if isinstance(history, HistoryList):
+                data["history"] = history.page(0, n)[0] if n else []
+            if format == "binary":
+                # The binary writer packs Job objects, not dicts
+                from_dict = self.job_class.from_dict
+                for name in ("queue", "scheduled", "history"):
+                    data[name] = [from_dict(d) if isinstance(d, dict) else d for d in data[name]]
+            self._write_sections(handle.filename, format, data)
+
+        start_thread_writer(handle, write)
+
+    def _snapshot_data_without_history(self):
+        """Snapshot dicts of the queue and scheduled jobs; history is filled in later."""
+        return {
+            "queue": [job.to_dict() for job in self.queue],
+            "scheduled": [job.to_dict() for job in self.timers.items() if job.status == "scheduled"],
+            "history": [],
+            "journal_seq": self.journal.seq if self.journal is not None else 0,
         }
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
-        print("Saved to", filename)
+
+    def _wait_save(self):
+        """Block until a running background save has finished."""
+        if self._saver is not None:
+            self._saver.wait()
+            self._saver = None
 
     def load_from_file(self, filename):
         """
         Purpose:
-            Restore scheduler task_scheduler from a previously saved JSON file.
+            Restore scheduler task_scheduler from a previously saved file,
+            replaying any journal written next to it. The format (JSON or
+            binary) is detected from the file header. Records are parsed one
+            at a time and the hash table is presized from the header counts.
 
         Parameters:
             filename (str)
@@ -164,49 +979,331 @@ class Scheduler:
         Returns:
             None
         """
-        with open(filename) as f:
-            data = json.load(f)
+        journals = [filename + ".journal.1", filename + ".journal"]
+        if os.path.exists(filename) or not any(os.path.exists(p) for p in journals):
+            header, records = read_snapshot(filename, self.job_class)
+        else:
+            header, records = {"journal_seq": 0, "counts": None}, iter(())
+
+        seq = header.get("journal_seq", 0)
+        events = []
+        for path in journals:
+            events.extend(e for e in Journal.read(path) if e["seq"] > seq)
+
+        if events:
+            data = {name: [] for name in ("queue", "scheduled", "history")}
+            for section, d in records:
+                data[section].append(d if isinstance(d, dict) else d.to_dict())
+            data["journal_seq"] = seq
+            data = self._replay(data, events)
+            seq = data["journal_seq"]
+            records = ((name, d) for name in ("queue", "scheduled", "history") for d in data[name])
+            header = {"counts": {name: len(data[name]) for name in ("queue", "scheduled", "history")}}
+
+        self._restore(records, header.get("counts"), seq)
+        if self.events.on_load:
+            self.events.emit("on_load", filename)
+
+    @staticmethod
+    def _replay(data, events):
+        """
+        Internal helper that applies journal events newer than the
+        snapshot's journal_seq to the snapshot's job dictionaries.
+        """
+        queue = {d["job_id"]: d for d in data.get("queue", [])}
+        scheduled = {d["job_id"]: d for d in data.get("scheduled", [])}
+        history = list(data.get("history", []))
+        seq = data.get("journal_seq", 0)
+
+        for event in events:
+            if event["seq"] <= seq:
+                continue
+            seq = event["seq"]
+            d = event["job"]
+            job_id = d["job_id"]
+            op = event["op"]
+            if op == "submit":
+                queue[job_id] = d
+            elif op == "schedule":
+                queue.pop(job_id, None)
+                scheduled[job_id] = d
+            elif op == "promote":
+                scheduled.pop(job_id, None)
+                queue.pop(job_id, None)
+                queue[job_id] = d
+            elif op == "execute":
+                queue.pop(job_id, None)
+                scheduled.pop(job_id, None)
+                history.append(d)
+            elif op in ("cancel", "shed"):
+                queue.pop(job_id, None)
+                scheduled.pop(job_id, None)
+                history.append(d)
+            elif op == "move_to_front" and job_id in queue:
+                moved = queue.pop(job_id)
+                queue = {job_id: moved, **queue}
+
+        return {
+            "journal_seq": seq,
+            "queue": list(queue.values()),
+            "scheduled": list(scheduled.values()),
+            "history": history
+        }
+
+    def _restore(self, records, counts, journal_seq):
+        """
+        Rebuild every structure from (section, job dict or Job) records
+        without journaling them. The snapshot is trusted, so hash inserts skip the
+        duplicate scan, and queue / history are spliced in one go.
+        """
+        journal, self.journal = self.journal, None
 
         # Reset everything
-        self.queue = LinkedQueue()
-        self.hash = HashTable(self.hash.size)
-        self.history = HistoryList()
-        self.executed_ids = set()
-
-        # Load queue
-        for d in data.get("queue", []):
-            job = Job.from_dict(d)
-            node = self.queue.enqueue(job)
-            self.hash.insert(node)
-
-        # Load history
-        for d in data.get("history", []):
-            job = Job.from_dict(d)
-            node = self.history.add_to_history(job)
-            self.hash.insert(node)
-            self.executed_ids.add(job.job_id)
-
-        print("Loaded from", filename)
+        self.storage.clear()
+        self.queue = self._new_queue()
+        self.hash = self._new_hash_table()
+        self.history = self._new_history()
+        self.executed_ids.clear()
+        self.timers = TimerWheel()
+        if counts:
+            indexed = counts if self.index_history else dict(counts, history=0)
+            self.hash.reserve(sum(indexed.values()))
+
+        from_dict = self.job_class.from_dict
+        queued = []
+        executed = []
+        for section, d in records:
+            job = from_dict(d) if isinstance(d, dict) else d
+            if section == "queue":
+                queued.append(job)
+            elif section == "history":
+                executed.append(job)
+            elif section == "scheduled":
+                # Delayed / recurring jobs go back into the timer wheel
+                self._schedule(job)
+
+        self.hash.insert_many_unchecked(self.queue.enqueue_many(queued))
+        if self.shed_order is not None:
+            self.shed_order.rebuild(queued)
+        del queued
+
+        # Runs of recurring jobs and cancelled / shed jobs are not indexed
+        indexed = [node for node in self.history.extend(executed)
+                   if not node.value.interval and node.value.status not in ("cancelled", "shed")]
+        restore = getattr(self.executed_ids, "restore", None)
+        if restore is not None:
+            # Time-windowed stores keep each ID's window from when it ran
+            restore((node.value.job_id, node.value.end_timestamp) for node in indexed)
+        else:
+            self.executed_ids.update(node.value.job_id for node in indexed)
+        if self.index_history:
+            self.hash.insert_many_unchecked(indexed)
+
+        self.storage.commit()
+        self.journal = journal
+        self._loaded_seq = journal_seq
+
+    def open_journal(self, filename, group_commit=64, compact_every=None, max_delay=0.05):
+        """
+        Purpose:
+            Start journaling every submit / execute to filename + ".journal".
+            Existing state at filename (snapshot and journals) is recovered
+            first and compacted into a fresh snapshot.
+
+        Parameters:
+            filename (str): Snapshot file the journal belongs to.
+            group_commit (int): Events per fsync.
+            max_delay (float or None): Longest time in seconds an event waits
+                for its group to fill before it is synced anyway; None waits
+                for a full group or an explicit commit.
+            compact_every (int or None): Start a background compaction after
+                this many events; None compacts only on request.
+
+        Returns:
+            None
+        """
+        self.close_journal()
+        paths = [filename, filename + ".journal", filename + ".journal.1"]
+        recovered = any(os.path.exists(p) for p in paths)
+        if recovered:
+            self.load_from_file(filename)
+        else:
+            self._loaded_seq = 0
+
+        self.journal = Journal(filename + ".journal", group_commit, self._loaded_seq, max_delay)
+        self.journal_path = filename
+        self.compact_every = compact_every
+        if recovered:
+            self.compact(wait=True)
+
+    def close_journal(self):
+        """
+        Purpose:
+            Wait for any compaction, commit pending events and stop journaling.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self.journal is None:
+            return
+        self._wait_compaction()
+        self.journal.close()
+        self.journal = None
+
+    def compact(self, wait=False):
+        """
+        Purpose:
+            Fold the journal into a new snapshot. The current state is
+            captured and the journal is rotated to filename + ".journal.1";
+            the snapshot is then written (in a background thread unless
+            wait=True) and the rotated journal deleted. Errors are kept in
+            compaction_error.
+
+        Parameters:
+            wait (bool): Write the snapshot before returning.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If no journal is open.
+        """
+        if self.journal is None:
+            raise ValueError("No journal is open.")
+        with self._compaction_lock:
+            self._wait_compaction()
+            data, rotated = self._begin_compaction()
+            if wait:
+                self._finish_compaction(data, rotated)
+            else:
+                self._compactor = threading.Thread(
+                    target=self._finish_compaction, args=(data, rotated), daemon=True)
+                self._compactor.start()
+
+    def _begin_compaction(self):
+        """Capture the snapshot data and rotate the journal (subclasses lock this)."""
+        data = self._snapshot_data()
+        rotated = self.journal_path + ".journal.1"
+        self.journal.rotate(rotated)
+        return data, rotated
+
+    def _finish_compaction(self, data, rotated):
+        """Write the captured snapshot and drop the journal it replaces."""
+        try:
+            self._write_snapshot(self.journal_path, data)
+            os.remove(rotated)
+            self.compaction_error = None
+        except Exception as exc:
+            self.compaction_error = exc
+
+    def _wait_compaction(self):
+        """Block until a running background compaction has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _maybe_compact(self):
+        """Start a background compaction once compact_every events have been journaled."""
+        if (self.journal is not None and self.compact_every
+                and self.journal.appended >= self.compact_every
+                and (self._compactor is None or not self._compactor.is_alive())):
+            self.compact()
+
+    def stats(self, include_buckets=False):
+        """
+        Purpose:
+            Report live metrics without walking the queue, history or hash
+            table. Counters and histograms are kept as jobs are submitted
+            and executed (see SchedulerMetrics); sizes are read in O(1).
+
+        Parameters:
+            include_buckets (bool): Add the cumulative histogram buckets
+                (as used by the Prometheus dump) to "wait", "execution"
+                and "blocked".
+
+        Returns:
+            dict: submitted, executed, failed, duplicates_rejected,
+            cancelled, shed, queue_full, throttled, queue_depth,
+            queue_capacity, scheduled, history_size, hash (size, count,
+            load_factor, longest_chain) and the "wait", "execution" and
+            "blocked" (submitter wait) latency summaries in seconds (see
+            LatencyHistogram.summary).
+
+        Raises:
+            ValueError: If the scheduler was created with metrics=False.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            raise ValueError("Metrics are disabled for this scheduler.")
+        with metrics._lock:
+            out = {
+                "submitted": metrics.submitted,
+                "executed": metrics.executed,
+                "failed": metrics.failed,
+                "duplicates_rejected": metrics.duplicates_rejected,
+                "cancelled": metrics.cancelled,
+                "shed": metrics.shed,
+                "queue_full": metrics.queue_full,
+                "throttled": metrics.throttled,
+                "wait": metrics.wait.summary(),
+                "execution": metrics.execution.summary(),
+                "blocked": metrics.blocked.summary(),
+            }
+            if include_buckets:
+                for name in ("wait", "execution", "blocked"):
+                    out[name]["buckets"] = getattr(metrics, name).cumulative()
+        out["queue_depth"] = self.queue.size
+        out["queue_capacity"] = self.queue_capacity
+        out["scheduled"] = self.timers.size
+        out["history_size"] = len(self.history)
+        out["hash"] = {
+            "size": self.hash.size,
+            "count": self.hash.count,
+            "load_factor": self.hash.load_factor(),
+            "longest_chain": self.hash.longest_chain(),
+        }
+        return out
+
+    def dump_metrics(self, filename):
+        """
+        Purpose:
+            Write stats() to a file in the Prometheus text format, e.g. for
+            the node_exporter textfile collector.
+
+        Parameters:
+            filename (str)
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the scheduler was created with metrics=False.
+        """
+        write_prometheus(filename, self.stats(include_buckets=True))
 
     # Debug helpers
     def show_queue(self):
         """Print all queued jobs in readable format."""
         print("Queue:")
-        lst = self.queue.to_list()
-        if not lst:
+        if self.queue.is_empty():
             print("  (empty)")
-        for j in lst:
+        for j in self.queue:
             print(" ", j.job_id, j.status)
 
     def show_history(self):
         """Print executed jobs with timestamps."""
         print("History:")
-        for j in self.history.display_history():
+        for j in self.history:
             print(" ", j.job_id, j.status, j.execution_timestamp)
 
     def show_hash(self):
         """Print the hash table buckets and stored job IDs."""
         print("Hash table:")
+        # Show a settled table rather than two half-migrated ones
+        self.hash.finish_rehash()
         for i, bucket in enumerate(self.hash.buckets):
             ids = [self.hash._extract_job(e).job_id for e in bucket]
             print(i, ":", ids)
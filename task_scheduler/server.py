@@ -0,0 +1,272 @@
+"""
+SchedulerServer Class Module
+
+Wire protocol: every message is a frame of a 4-byte big-endian length
+followed by that many bytes of compact JSON.
+
+    request:  {"id": 7, "op": "submit_many", "args": {"job_ids": [1, 2, 3]}}
+    response: {"id": 7, "ok": true, "result": 3}
+              {"id": 7, "ok": false, "error": "ValueError", "message": "..."}
+
+A connection may send many requests without waiting (pipelining); the
+server answers them in order, each carrying its request's id. Batched
+operations (submit_many, run_batch, find_jobs) move many jobs per frame.
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+from datetime import datetime, timedelta
+
+from .scheduler import Scheduler
+
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def encode_frame(message):
+    """
+    Purpose:
+        Serialize one message as a length-prefixed frame.
+
+    Parameters:
+        message (dict)
+
+    Returns:
+        bytes: Header plus JSON payload.
+
+    Raises:
+        TypeError: If the message holds something JSON cannot encode.
+        ValueError: If the payload is larger than MAX_FRAME.
+    """
+    payload = _dumps(message).encode("utf-8")
+    if len(payload) > MAX_FRAME:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds the {MAX_FRAME} byte limit.")
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader):
+    """
+    Purpose:
+        Read one frame from a stream.
+
+    Parameters:
+        reader (asyncio.StreamReader)
+
+    Returns:
+        dict or None: The decoded message, or None at end of stream.
+
+    Raises:
+        ValueError: If the frame is larger than MAX_FRAME.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit.")
+    return json.loads(await reader.readexactly(length))
+
+
+def _when(value):
+    """ISO-8601 text -> datetime (None stays None)."""
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def _job(job):
+    return None if job is None else job.to_dict()
+
+
+def _located(found):
+    return None if found is None else [found[0], found[1].to_dict()]
+
+
+class SchedulerServer:
+    """
+    asyncio server exposing a Scheduler over TCP or a Unix socket.
+
+    Requests run one at a time on the event loop, so the Scheduler needs
+    no locking. Jobs can name registered handlers but cannot carry
+    callables, which do not cross the wire.
+    """
+
+    def __init__(self, scheduler=None, host="127.0.0.1", port=0, path=None, **scheduler_options):
+        """
+        Purpose:
+            Configure a server (call start() to listen).
+
+        Parameters:
+            scheduler (Scheduler or None): Scheduler to expose. A new one is
+                built from scheduler_options when None.
+            host (str): TCP address to bind.
+            port (int): TCP port (0 picks a free port).
+            path (str or None): Listen on this Unix socket instead of TCP.
+            scheduler_options: Keyword arguments for Scheduler().
+
+        Returns:
+            None
+        """
+        self.scheduler = scheduler if scheduler is not None else Scheduler(**scheduler_options)
+        self.host = host
+        self.port = port
+        self.path = path
+        self.requests = 0
+        self._server = None
+        self._ops = {
+            "submit_task": self._submit_task,
+            "submit_many": self._submit_many,
+            "find_job": lambda a: _located(self.scheduler.find_job(a["job_id"])),
+            "find_jobs": lambda a: [_located(f) for f in self.scheduler.find_jobs(a["job_ids"])],
+            "cancel": lambda a: _job(self.scheduler.cancel(a["job_id"])),
+            "move_to_front": lambda a: _job(self.scheduler.move_to_front(a["job_id"])),
+            "run_next_task": lambda a: _job(self.scheduler.run_next_task()),
+            "run_batch": lambda a: [job.to_dict() for job in self.scheduler.run_batch(a["k"])],
+            "run_all": lambda a: [job.to_dict() for job in self.scheduler.run_all()],
+            "history_page": self._history_page,
+            "stats": lambda a: self.scheduler.stats(),
+            "ping": lambda a: "pong",
+        }
+
+    @property
+    def address(self):
+        """(host, port) the server listens on, or the Unix socket path."""
+        if self.path is not None:
+            return self.path
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """
+        Purpose:
+            Start listening.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+
+    async def serve_forever(self):
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Purpose:
+            Stop accepting connections and close the listening socket.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def handle(self, request):
+        """
+        Purpose:
+            Run one decoded request and encode its response. Anything that
+            goes wrong, including a malformed request or a result JSON
+            cannot encode, becomes an error response, so one bad request
+            never drops the connection and the requests pipelined on it.
+
+        Parameters:
+            request (dict): {"id", "op", "args"}.
+
+        Returns:
+            bytes: The encoded response frame.
+        """
+        self.requests += 1
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object.")
+            op = self._ops.get(request.get("op"))
+            if op is None:
+                raise ValueError(f"Unknown operation: {request.get('op')!r}")
+            return encode_frame({"id": request_id, "ok": True, "result": op(request.get("args") or {})})
+        except Exception as exc:
+            return encode_frame({"id": request_id, "ok": False,
+                                 "error": type(exc).__name__, "message": str(exc)})
+
+    async def _serve(self, reader, writer):
+        """Answer the requests of one connection, in order, until it closes."""
+        try:
+            while True:
+                request = await read_frame(reader)
+                if request is None:
+                    break
+                writer.write(self.handle(request))
+                # Only waits when the client is not reading its responses
+                await writer.drain()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _submit_task(self, a):
+        run_at = _when(a.get("run_at"))
+        if a.get("delay") is not None:
+            run_at = timedelta(seconds=a["delay"])
+        job = self.scheduler.submit_task(
+            a["job_id"], priority=a.get("priority"), deadline=_when(a.get("deadline")),
+            run_at=run_at, interval=a.get("interval"), handler=a.get("handler"),
+            args=tuple(a.get("args") or ()), kwargs=a.get("kwargs"))
+        return job.to_dict()
+
+    def _history_page(self, a):
+        jobs, cursor = self.scheduler.history.page(a.get("after"), a.get("limit", 50),
+                                                   a.get("reverse", False))
+        return {"jobs": [job.to_dict() for job in jobs], "cursor": cursor}
+
+    def _submit_many(self, a):
+        jobs = self.scheduler.submit_many(a["job_ids"], priority=a.get("priority"),
+                                          deadline=_when(a.get("deadline")))
+        return len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a Scheduler over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--policy", default="fifo", choices=Scheduler.POLICIES)
+    args = parser.parse_args()
+
+    async def run():
+        server = SchedulerServer(host=args.host, port=args.port, path=args.unix, policy=args.policy)
+        await server.start()
+        print("Listening on", server.address, flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
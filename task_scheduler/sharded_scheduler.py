@@ -0,0 +1,433 @@
+"""
+ShardedScheduler Class Module
+"""
+
+import heapq
+import multiprocessing
+import os
+
+from .scheduler import Scheduler
+
+
+def shard_path(filename, index):
+    """
+    Purpose:
+        Name the file a shard persists to: "state.json" -> "state.shard0.json".
+
+    Parameters:
+        filename (str): Base path given to ShardedScheduler.
+        index (int): Shard number.
+
+    Returns:
+        str: The shard's own path.
+    """
+    root, ext = os.path.splitext(filename)
+    return f"{root}.shard{index}{ext}"
+
+
+def _validate_new(sched, job_ids):
+    """Raise ValueError (like submit_many) if any ID is known to this shard."""
+    search = sched.hash.search
+    executed = sched.executed_ids
+    for job_id in job_ids:
+        if job_id in executed:
+            raise ValueError(f"Job {job_id} already executed earlier.")
+        if search(job_id) is not None:
+            raise ValueError(f"Job {job_id} already exists in queue.")
+
+
+def _history(sched, n):
+    """Last n history entries (all when n is None), oldest first."""
+    if n is None:
+        return sched.history.display_history()
+    return sched.history.get_last_n(n)
+
+
+# Operations a shard process accepts: name -> function(scheduler, *args, **kwargs)
+_OPERATIONS = {
+    "submit_task": Scheduler.submit_task,
+    "submit_many": lambda sched, *a, **kw: len(sched.submit_many(*a, **kw)),
+    "validate_new": _validate_new,
+    "find_job": Scheduler.find_job,
+    "find_jobs": Scheduler.find_jobs,
+    "cancel": Scheduler.cancel,
+    "run_next_task": Scheduler.run_next_task,
+    "run_batch": lambda sched, k: len(sched.run_batch(k)),
+    "run_all": lambda sched: len(sched.run_all()),
+    "history": _history,
+    "stats": Scheduler.stats,
+    "register_handler": Scheduler.register_handler,
+    "save_to_file": Scheduler.save_to_file,
+    "load_from_file": Scheduler.load_from_file,
+    "open_journal": Scheduler.open_journal,
+    "close_journal": Scheduler.close_journal,
+}
+
+
+def _shard_main(conn, options):
+    """
+    Body of a shard process: own one Scheduler and serve requests from the
+    pipe until told to close. Replies are ("ok", result) or ("error", exc).
+    """
+    sched = Scheduler(**options)
+    try:
+        while True:
+            try:
+                op, args, kwargs = conn.recv()
+            except EOFError:
+                break
+            if op == "close":
+                sched.close_journal()
+                sched.shutdown()
+                conn.send(("ok", None))
+                break
+            try:
+                reply = ("ok", _OPERATIONS[op](sched, *args, **kwargs))
+            except Exception as exc:
+                reply = ("error", exc)
+            try:
+                conn.send(reply)
+            except Exception as exc:
+                # The result or exception could not be pickled
+                conn.send(("error", RuntimeError(f"{op} reply could not be sent: {exc!r}")))
+    finally:
+        conn.close()
+
+
+class ShardedScheduler:
+    """
+    Scheduler partitioned across worker processes by job_id.
+
+    Job i lives in shard i % shards, the same modulo routing HashTable uses
+    for buckets. Each shard is a full Scheduler in its own process, so
+    shards run on separate cores; calls that touch every shard (batches,
+    run_all, save / load) are sent to all shards first and then collected,
+    so the shards work in parallel.
+
+    Job callables and handlers must be picklable (module-level functions).
+    The front-end itself is not thread-safe: use it from one thread.
+    """
+
+    def __init__(self, shards=None, path=None, start_method=None, **scheduler_options):
+        """
+        Purpose:
+            Start the shard processes.
+
+        Parameters:
+            shards (int or None): Number of shards (default: CPU count).
+            path (str or None): If given, every shard journals to its own
+                file (see shard_path) and recovers it on start.
+            start_method (str or None): multiprocessing start method
+                ("fork", "spawn", ...); None uses the platform default.
+            scheduler_options: Keyword arguments for each shard's Scheduler().
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If shards is less than 1.
+        """
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("A sharded scheduler needs at least one shard.")
+        context = multiprocessing.get_context(start_method)
+        self.shards = shards
+        self.path = path
+        self._conns = []
+        self._procs = []
+        for _ in range(shards):
+            parent, child = context.Pipe()
+            proc = context.Process(target=_shard_main, args=(child, scheduler_options), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        if path is not None:
+            self._broadcast("open_journal", [(shard_path(path, i),) for i in range(shards)])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def shard_for(self, job_id):
+        """
+        Purpose:
+            Pick the shard that owns a job ID.
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            int: Shard index (job_id % shards).
+        """
+        return job_id % self.shards
+
+    def _call(self, index, op, *args, **kwargs):
+        """Run one operation on one shard and return its result."""
+        conn = self._conns[index]
+        conn.send((op, args, kwargs))
+        status, value = conn.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def _broadcast(self, op, args_per_shard=None, shards=None):
+        """
+        Send an operation to several shards, then collect every reply.
+        All replies are read before raising, so the pipes stay in step.
+        Returns {shard index: result}.
+        """
+        shards = range(self.shards) if shards is None else shards
+        for i in shards:
+            args = args_per_shard[i] if args_per_shard is not None else ()
+            self._conns[i].send((op, args, {}))
+        results = {}
+        error = None
+        for i in shards:
+            status, value = self._conns[i].recv()
+            if status == "error":
+                error = error or value
+            else:
+                results[i] = value
+        if error is not None:
+            raise error
+        return results
+
+    def submit_task(self, job_id, **options):
+        """
+        Purpose:
+            Submit a job to its shard (see Scheduler.submit_task).
+
+        Parameters:
+            job_id (int)
+            options: Other Scheduler.submit_task arguments.
+
+        Returns:
+            Job: A copy of the newly created job.
+
+        Raises:
+            ValueError: If the job is duplicated.
+        """
+        return self._call(self.shard_for(job_id), "submit_task", job_id, **options)
+
+    def submit_many(self, job_ids, priority=None, deadline=None):
+        """
+        Purpose:
+            Submit a batch atomically across shards: every shard validates
+            its part first, and nothing is enqueued if any ID is a duplicate.
+
+        Parameters:
+            job_ids (iterable[int])
+            priority (int or None): Priority for every job in the batch.
+            deadline (datetime or None): Deadline for every job in the batch.
+
+        Returns:
+            int: Number of jobs submitted.
+
+        Raises:
+            ValueError: If an ID repeats inside the batch or is already known.
+        """
+        parts = [[] for _ in range(self.shards)]
+        seen = set()
+        for job_id in job_ids:
+            if job_id in seen:
+                raise ValueError(f"Job {job_id} appears more than once in batch.")
+            seen.add(job_id)
+            parts[job_id % self.shards].append(job_id)
+
+        busy = [i for i in range(self.shards) if parts[i]]
+        self._broadcast("validate_new", [(part,) for part in parts], busy)
+        done = self._broadcast("submit_many", [(part, priority, deadline) for part in parts], busy)
+        return sum(done.values())
+
+    def find_job(self, job_id):
+        """
+        Purpose:
+            Locate a job on its shard (see Scheduler.find_job).
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            tuple or None: (location, copy of the Job), or None.
+        """
+        return self._call(self.shard_for(job_id), "find_job", job_id)
+
+    def find_jobs(self, job_ids):
+        """
+        Purpose:
+            Locate many jobs with one request per shard.
+
+        Parameters:
+            job_ids (iterable[int])
+
+        Returns:
+            list: One find_job() style result per ID, in the same order.
+        """
+        job_ids = list(job_ids)
+        parts = [[] for _ in range(self.shards)]
+        for job_id in job_ids:
+            parts[job_id % self.shards].append(job_id)
+        busy = [i for i in range(self.shards) if parts[i]]
+        found = self._broadcast("find_jobs", [(part,) for part in parts], busy)
+        answers = {i: iter(found[i]) for i in busy}
+        return [next(answers[job_id % self.shards]) for job_id in job_ids]
+
+    def cancel(self, job_id):
+        """
+        Purpose:
+            Cancel a queued or delayed job (see Scheduler.cancel).
+
+        Parameters:
+            job_id (int)
+
+        Returns:
+            Job: A copy of the cancelled job.
+
+        Raises:
+            ValueError: If the job cannot be cancelled.
+        """
+        return self._call(self.shard_for(job_id), "cancel", job_id)
+
+    def register_handler(self, name, func):
+        """
+        Purpose:
+            Register a handler on every shard. func must be picklable.
+
+        Parameters:
+            name (str)
+            func (callable)
+
+        Returns:
+            None
+        """
+        self._broadcast("register_handler", [(name, func)] * self.shards)
+
+    def run_batch(self, k):
+        """
+        Purpose:
+            Let every shard execute up to k of its jobs, in parallel.
+
+        Parameters:
+            k (int): Maximum jobs per shard.
+
+        Returns:
+            int: Number of jobs executed across shards.
+        """
+        return sum(self._broadcast("run_batch", [(k,)] * self.shards).values())
+
+    def run_all(self):
+        """
+        Purpose:
+            Execute every queued job on every shard, in parallel. Jobs are
+            not sent back; use history() or find_job() to inspect them.
+
+        Parameters:
+            None
+
+        Returns:
+            int: Number of jobs executed across shards.
+        """
+        return sum(self._broadcast("run_all").values())
+
+    def history(self, n=None):
+        """
+        Purpose:
+            Merge the shards' histories into one list ordered by end time
+            (ties by job ID). Each shard's history is already in completion
+            order, so this is a k-way merge.
+
+        Parameters:
+            n (int or None): Only the last n jobs overall (each shard sends
+                at most n); None returns everything.
+
+        Returns:
+            list[Job]: Copies of history jobs, oldest first.
+        """
+        parts = self._broadcast("history", [(n,)] * self.shards)
+
+        def when(job):
+            return (job.end_timestamp or job.execution_timestamp or job.submit_timestamp, job.job_id)
+
+        merged = list(heapq.merge(*parts.values(), key=when))
+        return merged if n is None else merged[-n:] if n > 0 else []
+
+    def stats(self):
+        """
+        Purpose:
+            Collect Scheduler.stats() from every shard and sum the counters.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: Summed submitted, executed, failed, duplicates_rejected,
+            cancelled, shed, queue_full, throttled, queue_depth, scheduled
+            and history_size, plus
+            "shards" with each shard's full stats().
+        """
+        per_shard = self._broadcast("stats")
+        shards = [per_shard[i] for i in range(self.shards)]
+        keys = ("submitted", "executed", "failed", "duplicates_rejected", "cancelled",
+                "shed", "queue_full", "throttled", "queue_depth", "scheduled", "history_size")
+        totals = {key: sum(s[key] for s in shards) for key in keys}
+        totals["shards"] = shards
+        return totals
+
+    def save_to_file(self, filename, format="json"):
+        """
+        Purpose:
+            Save every shard to its own file (see shard_path), in parallel.
+
+        Parameters:
+            filename (str): Base path.
+            format (str): "json" or "binary".
+
+        Returns:
+            None
+        """
+        self._broadcast("save_to_file", [(shard_path(filename, i), format) for i in range(self.shards)])
+
+    def load_from_file(self, filename):
+        """
+        Purpose:
+            Load every shard from its own file (see shard_path), in parallel.
+            The shard count must match the one used to save.
+
+        Parameters:
+            filename (str): Base path.
+
+        Returns:
+            None
+        """
+        self._broadcast("load_from_file", [(shard_path(filename, i),) for i in range(self.shards)])
+
+    def close(self):
+        """
+        Purpose:
+            Close shard journals and stop the shard processes.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if not self._procs:
+            return
+        for conn in self._conns:
+            try:
+                conn.send(("close", (), {}))
+                conn.recv()
+            except (EOFError, OSError):
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns = []
+        self._procs = []
@@ -0,0 +1,145 @@
+"""
+Snapshot File Helpers Module
+"""
+
+import json
+import os
+
+from .binary_snapshot import is_binary_snapshot, read_binary_snapshot
+from .job import Job
+
+
+SNAPSHOT_VERSION = 2
+SECTIONS = ("queue", "scheduled", "history")
+_HEADER_PREFIX = '{"header": '
+
+
+def write_json_snapshot(filename, journal_seq, sections):
+    """
+    Purpose:
+        Write a snapshot as valid JSON laid out one record per line, with a
+        header line carrying the record counts. The file is written to a
+        temporary name, fsync'ed and renamed into place.
+
+        Layout:
+            {"header": {"version": 2, "journal_seq": 0, "counts": {...}},
+            "queue": [
+            {...},
+            {...}
+            ],
+            "scheduled": [
+            ],
+            "history": [
+            {...}
+            ]}
+
+    Parameters:
+        filename (str): Destination path.
+        journal_seq (int): Last journal event contained in the snapshot.
+        sections (dict): Maps each name in SECTIONS to a list of job dicts
+            or Job objects (converted with to_dict() as they are written).
+
+    Returns:
+        None
+    """
+    counts = {name: len(sections.get(name, ())) for name in SECTIONS}
+    header = {"version": SNAPSHOT_VERSION, "journal_seq": journal_seq, "counts": counts}
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(_HEADER_PREFIX + json.dumps(header) + ",\n")
+        for i, name in enumerate(SECTIONS):
+            f.write(f'"{name}": [\n')
+            records = sections.get(name, ())
+            last = len(records) - 1
+            for j, record in enumerate(records):
+                if not isinstance(record, dict):
+                    record = record.to_dict()
+                f.write(dumps(record))
+                f.write(",\n" if j < last else "\n")
+            f.write("]}\n" if i == len(SECTIONS) - 1 else "],\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
+
+
+def read_snapshot(filename, job_class=Job):
+    """
+    Purpose:
+        Open a snapshot in either format, chosen by its magic header.
+
+    Parameters:
+        filename (str)
+        job_class (type): Class used for jobs decoded from binary files.
+
+    Returns:
+        tuple: (header dict, iterator of (section name, record)). Records
+        are job dicts for JSON files and Job objects for binary files.
+    """
+    if is_binary_snapshot(filename):
+        return read_binary_snapshot(filename, job_class)
+    return read_json_snapshot(filename)
+
+
+def read_json_snapshot(filename):
+    """
+    Purpose:
+        Open a snapshot and return its header plus a lazy record iterator.
+        Files in the line-per-record layout are parsed one line at a time;
+        older pretty-printed files are loaded with json.load.
+
+    Parameters:
+        filename (str)
+
+    Returns:
+        tuple: (header dict, iterator of (section name, job dict)). The
+        header has "journal_seq" and "counts" (None if unknown).
+    """
+    f = open(filename, encoding="utf-8")
+    first = f.readline()
+    if not first.startswith(_HEADER_PREFIX):
+        f.seek(0)
+        with f:
+            data = json.load(f)
+        header = {"journal_seq": data.get("journal_seq", 0), "counts": None}
+        records = ((name, d) for name in SECTIONS for d in data.get(name, []))
+        return header, records
+
+    header = json.loads(first[len(_HEADER_PREFIX):].rstrip().rstrip(","))
+    return header, _iter_records(f)
+
+
+def _iter_records(f, chunk=4096):
+    """
+    Yield (section, record) pairs from a line-per-record snapshot. Record
+    lines are decoded `chunk` at a time as one JSON array, which keeps
+    memory bounded while avoiding a json.loads call per record.
+    """
+    loads = json.loads
+    section = None
+    batch = []
+
+    def flush():
+        text = "".join(batch).rstrip().rstrip(",")
+        batch.clear()
+        return loads("[" + text + "]")
+
+    with f:
+        for line in f:
+            if line[0] == "{":
+                batch.append(line)
+                if len(batch) >= chunk:
+                    for record in flush():
+                        yield section, record
+                continue
+            if batch:
+                for record in flush():
+                    yield section, record
+            if line[0] == '"':
+                section = line[1:line.index('"', 1)]
+            else:
+                section = None
+        if batch:
+            for record in flush():
+                yield section, record
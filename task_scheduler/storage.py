@@ -0,0 +1,586 @@
+"""
+Storage Backends Module
+
+A storage backend builds the structures a Scheduler keeps its jobs in:
+the ready queue, the job index (hash), the history and the executed-ID
+store. MemoryStorage builds the in-memory LinkedQueue / PriorityQueue,
+HashTable and HistoryList. SqliteStorage keeps queue, delayed jobs,
+history and executed IDs in indexed tables of one SQLite database in WAL
+mode, so they are bounded by disk rather than RAM and survive restarts.
+"""
+
+import json
+import sqlite3
+
+from .compact_job import _to_seconds
+from .dedup import make_dedup
+from .hash_table import HashTable
+from .history_columns import HistoryColumns
+from .history_list import HistoryList
+from .linked_queue import LinkedQueue
+from .node import Node
+from .priority_queue import PriorityQueue, priority_key, deadline_key
+
+
+class MemoryStorage:
+    """
+    Default backend: every structure lives in memory. commit(), clear()
+    and close() have nothing to do.
+    """
+
+    def new_queue(self, policy, job_class):
+        """Create an empty queue for a policy ("fifo", "priority" or "deadline")."""
+        if policy == "priority":
+            return PriorityQueue(priority_key)
+        if policy == "deadline":
+            return PriorityQueue(deadline_key)
+        return LinkedQueue()
+
+    def new_index(self, hash_size, max_load_factor, min_load_factor, index_history):
+        """Create an empty job index."""
+        return HashTable(hash_size, max_load_factor, min_load_factor)
+
+    def new_history(self, job_class):
+        """Create an empty history."""
+        return HistoryList()
+
+    def new_dedup(self, kind, options):
+        """Create the executed-ID store (see dedup.make_dedup)."""
+        return make_dedup(kind, **options)
+
+    def load_scheduled(self, job_class):
+        """Delayed jobs persisted by an earlier run (none in memory)."""
+        return []
+
+    def commit(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    job_id INTEGER PRIMARY KEY,
+    rank REAL NOT NULL,
+    pos INTEGER NOT NULL,
+    job TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queue_order ON queue (rank, pos);
+CREATE TABLE IF NOT EXISTS scheduled (
+    job_id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    indexed INTEGER NOT NULL,
+    end_ts REAL,
+    job TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_job ON history (job_id) WHERE indexed;
+CREATE INDEX IF NOT EXISTS history_end ON history (end_ts);
+"""
+
+# Queue rank of jobs moved with push_front: ahead of every policy key
+_FRONT = -1e308
+# Rows fetched per query by the lazy iterators
+_PAGE = 500
+_NO_DEADLINE = 1e308
+
+
+class QueueRow(Node):
+    """A queue entry handed back by SqliteQueue; pos identifies its row."""
+
+    __slots__ = ("pos",)
+
+    def __init__(self, value, pos):
+        super().__init__(value)
+        self.pos = pos
+
+
+class SqliteStorage:
+    """
+    Backend that keeps jobs in a SQLite database in WAL mode.
+
+    Tables: queue (ordered by an index on the policy rank and position),
+    scheduled (delayed / recurring jobs), and history (append order, with
+    indexes on job_id for find_job and duplicate checks, and on end time
+    for range queries). Executed IDs are the indexed history rows, so they
+    need no table of their own.
+
+    Writes are grouped: the Scheduler calls commit() once at the end of
+    each operation, so a submit_many or run_batch of k jobs is one
+    transaction. Jobs are copied in and out of the tables, so find_job()
+    returns copies; callables (func) and results are not stored, and
+    callables of queued jobs are kept in memory until the job runs.
+
+    Use one SqliteStorage per Scheduler, from one thread.
+    """
+
+    def __init__(self, path=":memory:", synchronous="NORMAL", cache_mb=64):
+        """
+        Purpose:
+            Open (or create) the database.
+
+        Parameters:
+            path (str): Database file; ":memory:" keeps it in RAM.
+            synchronous (str): SQLite synchronous level. "NORMAL" is safe
+                in WAL mode but may lose the last commits on power loss;
+                "FULL" syncs every commit.
+            cache_mb (int): Page cache size in megabytes.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={synchronous}")
+        self.conn.execute(f"PRAGMA cache_size={-1024 * cache_mb}")
+        self.conn.executescript(_SCHEMA)
+        # Jobs out of the tables: delayed and in-flight jobs, by ID
+        self.live = {}
+        self.scheduled_ids = set()
+        # Callables of queued jobs, which cannot be stored
+        self.funcs = {}
+        self.queue = None
+        self.history = None
+
+    def new_queue(self, policy, job_class):
+        self.queue = SqliteQueue(self, policy, job_class)
+        return self.queue
+
+    def new_index(self, hash_size, max_load_factor, min_load_factor, index_history):
+        return SqliteIndex(self, index_history)
+
+    def new_history(self, job_class):
+        self.history = SqliteHistory(self, job_class)
+        return self.history
+
+    def new_dedup(self, kind, options):
+        if kind == "exact":
+            return SqliteExecuted(self)
+        return make_dedup(kind, **options)
+
+    def load_scheduled(self, job_class):
+        """
+        Purpose:
+            Load delayed jobs saved by an earlier run, so the Scheduler can
+            put them back in its timer wheel.
+
+        Parameters:
+            job_class (type): Job or CompactJob.
+
+        Returns:
+            list[Job]
+        """
+        jobs = [job_class.from_dict(json.loads(text))
+                for (text,) in self.conn.execute("SELECT job FROM scheduled")]
+        for job in jobs:
+            self.live[job.job_id] = job
+            self.scheduled_ids.add(job.job_id)
+        return jobs
+
+    def commit(self):
+        """Commit the writes of the current operation."""
+        self.conn.commit()
+
+    def clear(self):
+        """Delete every stored job (used before restoring a snapshot)."""
+        self.conn.execute("DELETE FROM queue")
+        self.conn.execute("DELETE FROM scheduled")
+        self.conn.execute("DELETE FROM history")
+        self.live.clear()
+        self.scheduled_ids.clear()
+        self.funcs.clear()
+
+    def close(self):
+        """Commit and close the database."""
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+
+def _encode(job):
+    return json.dumps(job.to_dict(), separators=(",", ":"))
+
+
+class SqliteQueue:
+    """
+    Ready queue stored in the queue table, with the LinkedQueue interface.
+    Rows are ordered by (rank, pos): rank is the policy key (0 for FIFO,
+    negated priority, or deadline seconds) and pos a submission counter.
+    """
+
+    def __init__(self, storage, policy, job_class):
+        self.storage = storage
+        self.conn = storage.conn
+        self.job_class = job_class
+        self.rank = {"priority": lambda job: -(job.priority or 0),
+                     "deadline": lambda job: _NO_DEADLINE if job.deadline is None
+                     else _to_seconds(job.deadline)}.get(policy)
+        self.size, low, high = self.conn.execute(
+            "SELECT COUNT(*), MIN(pos), MAX(pos) FROM queue").fetchone()
+        self._front = min(low or 0, 0) - 1
+        self._next = (high or 0) + 1
+
+    def _row(self, job, pos):
+        if job.func is not None:
+            self.storage.funcs[job.job_id] = job.func
+        return (job.job_id, self.rank(job) if self.rank else 0, pos, _encode(job))
+
+    def enqueue(self, value):
+        return self.enqueue_many([value])[0]
+
+    def enqueue_many(self, values):
+        start = self._next
+        self._next += len(values)
+        self.conn.executemany("INSERT INTO queue (job_id, rank, pos, job) VALUES (?, ?, ?, ?)",
+                              [self._row(job, start + i) for i, job in enumerate(values)])
+        self.size += len(values)
+        return [QueueRow(job, start + i) for i, job in enumerate(values)]
+
+    def push_front(self, value):
+        pos = self._front
+        self._front -= 1
+        self.conn.execute("UPDATE queue SET rank = ?, pos = ? WHERE job_id = ?",
+                          (_FRONT, pos, value.job_id))
+        return QueueRow(value, pos)
+
+    def discard(self, node):
+        # A row that was moved since (push_front) has a new pos and stays
+        if node.value is None:
+            return
+        if self.conn.execute("DELETE FROM queue WHERE job_id = ? AND pos = ?",
+                             (node.value.job_id, node.pos)).rowcount:
+            self.size -= 1
+            self.storage.funcs.pop(node.value.job_id, None)
+        node.value = None
+
+    def _decode(self, text):
+        job = self.job_class.from_dict(json.loads(text))
+        func = self.storage.funcs.get(job.job_id)
+        if func is not None:
+            job.func = func
+        return job
+
+    def dequeue_many(self, k):
+        if k <= 0 or not self.size:
+            return []
+        rows = self.conn.execute("SELECT job_id, job FROM queue ORDER BY rank, pos LIMIT ?",
+                                 (k,)).fetchall()
+        self.conn.executemany("DELETE FROM queue WHERE job_id = ?", [(row[0],) for row in rows])
+        self.size -= len(rows)
+        jobs = [self._decode(text) for _, text in rows]
+        live = self.storage.live
+        funcs = self.storage.funcs
+        for job in jobs:
+            # In flight until the Scheduler records it in history
+            live[job.job_id] = job
+            funcs.pop(job.job_id, None)
+        return jobs
+
+    def dequeue(self):
+        jobs = self.dequeue_many(1)
+        return jobs[0] if jobs else None
+
+    def peek(self):
+        row = self.conn.execute("SELECT job FROM queue ORDER BY rank, pos LIMIT 1").fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def is_empty(self):
+        return self.size == 0
+
+    def __iter__(self):
+        # Keyset pages over the queue_order index, so no cursor stays open
+        # between yields
+        rank = pos = -_NO_DEADLINE
+        while True:
+            rows = self.conn.execute("SELECT rank, pos, job FROM queue WHERE (rank, pos) > (?, ?) "
+                                     "ORDER BY rank, pos LIMIT ?", (rank, pos, _PAGE)).fetchall()
+            for rank, pos, text in rows:
+                yield self._decode(text)
+            if len(rows) < _PAGE:
+                return
+
+    def to_list(self):
+        return [self._decode(text) for (text,) in
+                self.conn.execute("SELECT job FROM queue ORDER BY rank, pos")]
+
+    def find(self, job_id):
+        """QueueRow of a queued job, or None."""
+        row = self.conn.execute("SELECT pos, job FROM queue WHERE job_id = ?", (job_id,)).fetchone()
+        return None if row is None else QueueRow(self._decode(row[1]), row[0])
+
+
+class SqliteHistory:
+    """
+    History stored in the history table, with the HistoryList interface
+    plus in_range() for end-time range queries through the history_end
+    index.
+    """
+
+    def __init__(self, storage, job_class):
+        self.storage = storage
+        self.conn = storage.conn
+        self.job_class = job_class
+        self.size = self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        self._columns = None
+        self._columns_seq = 0
+
+    def __len__(self):
+        return self.size
+
+    def add_to_history(self, job):
+        return self.extend([job])[0]
+
+    def extend(self, jobs):
+        self.conn.executemany(
+            "INSERT INTO history (job_id, indexed, end_ts, job) VALUES (?, ?, ?, ?)",
+            [(job.job_id, not job.interval and job.status not in ("cancelled", "shed"),
+              _to_seconds(job.end_timestamp), _encode(job)) for job in jobs])
+        self.size += len(jobs)
+        return [Node(job) for job in jobs]
+
+    def _jobs(self, sql, args=()):
+        from_dict = self.job_class.from_dict
+        return [from_dict(json.loads(text)) for (text,) in self.conn.execute(sql, args)]
+
+    def __iter__(self):
+        after = 0
+        while True:
+            jobs, after = self.page(after, _PAGE)
+            yield from jobs
+            if len(jobs) < _PAGE:
+                return
+
+    def __reversed__(self):
+        after = None
+        while True:
+            jobs, after = self.page(after, _PAGE, reverse=True)
+            yield from jobs
+            if after is None:
+                return
+
+    def page(self, after=None, limit=50, reverse=False):
+        """
+        Purpose:
+            One page of history (see HistoryList.page). Cursors are history
+            row seq numbers, read through the primary key in O(limit).
+
+        Parameters:
+            after (int or None): Cursor from the previous page.
+            limit (int): Maximum jobs per page.
+            reverse (bool): Page newest first.
+
+        Returns:
+            tuple[list[Job], int or None]: The page and the next cursor.
+
+        Raises:
+            ValueError: If limit is not positive or after is negative.
+        """
+        if limit <= 0:
+            raise ValueError("Page limit must be positive.")
+        if after is not None and after < 0:
+            raise ValueError("Page cursor cannot be negative.")
+        from_dict = self.job_class.from_dict
+        if reverse:
+            rows = self.conn.execute("SELECT seq, job FROM history WHERE seq < ? "
+                                     "ORDER BY seq DESC LIMIT ?",
+                                     (_NO_DEADLINE if after is None else after, limit)).fetchall()
+            cursor = rows[-1][0] if len(rows) == limit else None
+            if cursor is not None and not self.conn.execute(
+                    "SELECT 1 FROM history WHERE seq < ? LIMIT 1", (cursor,)).fetchone():
+                cursor = None
+        else:
+            rows = self.conn.execute("SELECT seq, job FROM history WHERE seq > ? ORDER BY seq LIMIT ?",
+                                     (after or 0, limit)).fetchall()
+            cursor = rows[-1][0] if rows else (after or 0)
+        return [from_dict(json.loads(text)) for _, text in rows], cursor
+
+    def display_history(self):
+        return self._jobs("SELECT job FROM history ORDER BY seq")
+
+    def get_last_n(self, n):
+        if n <= 0:
+            return []
+        jobs = self._jobs("SELECT job FROM history ORDER BY seq DESC LIMIT ?", (n,))
+        jobs.reverse()
+        return jobs
+
+    def in_range(self, since=None, until=None):
+        """
+        Purpose:
+            Jobs that ended in [since, until), in end-time order.
+
+        Parameters:
+            since (datetime or None): Inclusive lower bound (None: no bound).
+            until (datetime or None): Exclusive upper bound (None: no bound).
+
+        Returns:
+            list[Job]
+        """
+        lo = -_NO_DEADLINE if since is None else _to_seconds(since)
+        hi = _NO_DEADLINE if until is None else _to_seconds(until)
+        return self._jobs("SELECT job FROM history WHERE end_ts >= ? AND end_ts < ? "
+                          "ORDER BY end_ts, seq", (lo, hi))
+
+    def find(self, job_id):
+        """Node of the latest indexed history entry for an ID, or None."""
+        row = self.conn.execute("SELECT job FROM history WHERE job_id = ? AND indexed "
+                                "ORDER BY seq DESC LIMIT 1", (job_id,)).fetchone()
+        return None if row is None else Node(self.job_class.from_dict(json.loads(row[0])))
+
+    def columns(self):
+        if self._columns is None:
+            self._columns = HistoryColumns()
+        append = self._columns.append
+        from_dict = self.job_class.from_dict
+        for seq, text in self.conn.execute("SELECT seq, job FROM history WHERE seq > ? ORDER BY seq",
+                                           (self._columns_seq,)):
+            append(from_dict(json.loads(text)))
+            self._columns_seq = seq
+        return self._columns
+
+
+class SqliteIndex:
+    """
+    Job index with the HashTable interface. Queued and executed jobs are
+    found through the queue and history tables' primary key / job_id
+    indexes; delayed and in-flight jobs, which are not in either table,
+    are kept in memory (storage.live). Delayed jobs are also written to
+    the scheduled table so they survive a restart.
+    """
+
+    def __init__(self, storage, index_history):
+        self.storage = storage
+        self.conn = storage.conn
+        self.index_history = index_history
+        self.size = 0
+        self.buckets = []
+
+    @property
+    def count(self):
+        return len(self.storage.live)
+
+    def load_factor(self):
+        return 0.0
+
+    def longest_chain(self):
+        return 0
+
+    def reserve(self, n):
+        pass
+
+    def finish_rehash(self):
+        self.buckets = [list(self.storage.live.values())]
+
+    def _extract_job(self, entry):
+        return entry.value if isinstance(entry, Node) else entry
+
+    def entry(self, job_id):
+        job = self.storage.live.get(job_id)
+        if job is not None:
+            return job
+        row = self.storage.queue.find(job_id)
+        if row is None and self.index_history:
+            row = self.storage.history.find(job_id)
+        return row
+
+    def search(self, job_id):
+        entry = self.entry(job_id)
+        return None if entry is None else self._extract_job(entry)
+
+    def _track(self, job):
+        """Keep live / scheduled state in step with a job's new location."""
+        job_id = job.job_id
+        storage = self.storage
+        if job.status == "scheduled":
+            storage.live[job_id] = job
+            storage.scheduled_ids.add(job_id)
+            self.conn.execute("INSERT OR REPLACE INTO scheduled (job_id, job) VALUES (?, ?)",
+                              (job_id, _encode(job)))
+            return
+        storage.live.pop(job_id, None)
+        if job_id in storage.scheduled_ids:
+            storage.scheduled_ids.discard(job_id)
+            self.conn.execute("DELETE FROM scheduled WHERE job_id = ?", (job_id,))
+
+    def insert(self, item):
+        self._track(self._extract_job(item))
+
+    def insert_many_unchecked(self, items):
+        for item in items:
+            self._track(self._extract_job(item))
+
+    def replace(self, item):
+        self._track(self._extract_job(item))
+        return True
+
+    def remove(self, job_id):
+        storage = self.storage
+        job = storage.live.pop(job_id, None)
+        if job_id in storage.scheduled_ids:
+            storage.scheduled_ids.discard(job_id)
+            self.conn.execute("DELETE FROM scheduled WHERE job_id = ?", (job_id,))
+        return job
+
+
+class SqliteExecuted:
+    """
+    Executed-ID store answered by the history table's job_id index, so
+    executed IDs are not stored twice. add() and update() have nothing to
+    do because the Scheduler appends to history first.
+    """
+
+    def __init__(self, storage):
+        self.conn = storage.conn
+
+    def __contains__(self, job_id):
+        return self.conn.execute("SELECT 1 FROM history WHERE job_id = ? AND indexed LIMIT 1",
+                                 (job_id,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(DISTINCT job_id) FROM history WHERE indexed").fetchone()[0]
+
+    def add(self, job_id):
+        pass
+
+    def update(self, job_ids):
+        pass
+
+    def clear(self):
+        pass
+
+
+STORAGE_KINDS = ("memory", "sqlite")
+
+
+def make_storage(kind="memory", **options):
+    """
+    Purpose:
+        Build a storage backend from a name or pass one through.
+
+    Parameters:
+        kind (str or object): "memory", "sqlite", or a backend object,
+            which is returned as-is.
+        options: Constructor arguments ("sqlite": path, synchronous, cache_mb).
+
+    Returns:
+        object: The backend.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if not isinstance(kind, str):
+        return kind
+    if kind == "memory":
+        return MemoryStorage(**options)
+    if kind == "sqlite":
+        return SqliteStorage(**options)
+    raise ValueError(f"Unknown storage backend: {kind!r}")
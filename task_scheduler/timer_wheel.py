@@ -0,0 +1,199 @@
+"""
+TimerWheel Class Module
+"""
+
+import time
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel that holds items until a given time.
+
+    Level 0 has one slot per tick; each higher level has slots that are
+    `slots` times wider. A timer is placed in the lowest level whose range
+    covers its delay, and is moved ("cascaded") down a level when the
+    wheel reaches its slot. Scheduling and expiring a timer are O(1)
+    amortized, and empty stretches of the wheel are skipped rather than
+    walked tick by tick.
+    """
+
+    def __init__(self, tick=0.01, slots=64, levels=4, start=None):
+        """
+        Purpose:
+            Create an empty timer wheel.
+
+        Parameters:
+            tick (float): Resolution of the wheel in seconds.
+            slots (int): Number of slots per level.
+            levels (int): Number of levels. Delays beyond
+                tick * slots ** levels wait in an overflow list.
+            start (float or None): Epoch seconds of tick 0 (default now).
+
+        Returns:
+            None
+        """
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.start = time.time() if start is None else start
+        self.current = 0
+        self.size = 0
+
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._counts = [0] * levels
+        self._overflow = []
+        self._span = slots ** levels
+
+    def __len__(self):
+        return self.size
+
+    def _to_tick(self, when):
+        """Convert epoch seconds to a tick index (rounded up so nothing fires early)."""
+        ticks = (when - self.start) / self.tick
+        whole = int(ticks)
+        return whole if whole == ticks else whole + 1
+
+    def schedule(self, when, item):
+        """
+        Purpose:
+            Hold an item until the given time.
+
+        Parameters:
+            when (float): Epoch seconds at which the item becomes due.
+            item: Any object to return from advance() once due.
+
+        Returns:
+            None
+        """
+        self.size += 1
+        self._place(max(self._to_tick(when), self.current + 1), item)
+
+    def _place(self, expires, item):
+        """Put an (expires, item) timer into the right level and slot."""
+        delta = expires - self.current
+        width = self.slots
+        for level in range(self.levels):
+            if delta < width:
+                slot = (expires // (width // self.slots)) % self.slots
+                self._wheels[level][slot].append((expires, item))
+                self._counts[level] += 1
+                return
+            width *= self.slots
+        self._overflow.append((expires, item))
+
+    def cancel(self, when, item):
+        """
+        Purpose:
+            Remove a pending item before it comes due. Its expiry tick is
+            recomputed from `when` (a time already past was scheduled for
+            the next tick), so only the slot it can be in at each level is
+            searched, plus the overflow list.
+
+        Parameters:
+            when (float): Epoch seconds the item was scheduled for.
+            item: The scheduled object (matched by identity).
+
+        Returns:
+            bool: True if the item was found and removed.
+        """
+        expires = self._to_tick(when)
+        if expires <= self.current:
+            expires = self.current + 1
+        width = 1
+        for level in range(self.levels):
+            bucket = self._wheels[level][(expires // width) % self.slots]
+            if self._remove_from(bucket, item):
+                self._counts[level] -= 1
+                return True
+            width *= self.slots
+        if self._remove_from(self._overflow, item):
+            return True
+        # `when` may have been rounded on its way through a datetime
+        for level, wheel in enumerate(self._wheels):
+            for bucket in wheel:
+                if self._remove_from(bucket, item):
+                    self._counts[level] -= 1
+                    return True
+        return False
+
+    def _remove_from(self, bucket, item):
+        """Drop item's timer from a slot list; True if it was there."""
+        for i, (_, pending) in enumerate(bucket):
+            if pending is item:
+                del bucket[i]
+                self.size -= 1
+                return True
+        return False
+
+    def items(self):
+        """
+        Purpose:
+            List every pending item (for saving state), in no particular order.
+
+        Parameters:
+            None
+
+        Returns:
+            list: Items still waiting in the wheel.
+        """
+        out = [item for level in self._wheels for slot in level for _, item in slot]
+        out.extend(item for _, item in self._overflow)
+        return out
+
+    def advance(self, now=None):
+        """
+        Purpose:
+            Move the wheel forward to the given time and collect due items.
+
+        Parameters:
+            now (float or None): Epoch seconds (default current time).
+
+        Returns:
+            list: Items whose time has come, in expiry order.
+        """
+        target = int(((time.time() if now is None else now) - self.start) / self.tick)
+        due = []
+        slots = self.slots
+
+        while self.current < target:
+            if self.size == 0:
+                self.current = target
+                break
+
+            # Skip ahead over levels that are empty: nothing can fire
+            # before the next slot boundary of the first non-empty level.
+            step = 1
+            for level in range(self.levels):
+                if self._counts[level]:
+                    break
+                step *= slots
+            nxt = (self.current // step + 1) * step
+            if nxt > target:
+                self.current = target
+                break
+            self.current = nxt
+
+            # Cascade upper levels whose slot boundary we just reached
+            if self.current % self._span == 0 and self._overflow:
+                pending, self._overflow = self._overflow, []
+                for expires, item in pending:
+                    self._place(expires, item)
+            width = self._span
+            for level in range(self.levels - 1, 0, -1):
+                width //= slots
+                if self.current % width == 0:
+                    bucket = self._wheels[level][(self.current // width) % slots]
+                    if bucket:
+                        self._wheels[level][(self.current // width) % slots] = []
+                        self._counts[level] -= len(bucket)
+                        for expires, item in bucket:
+                            self._place(expires, item)
+
+            bucket = self._wheels[0][self.current % slots]
+            if bucket:
+                self._wheels[0][self.current % slots] = []
+                self._counts[0] -= len(bucket)
+                self.size -= len(bucket)
+                due.extend(item for _, item in bucket)
+
+        return due
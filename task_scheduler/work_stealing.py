@@ -0,0 +1,332 @@
+"""
+WorkStealingScheduler Class Module
+"""
+
+import contextlib
+import itertools
+import threading
+from collections import deque
+
+from .concurrent_scheduler import ConcurrentScheduler
+from .node import Node
+
+
+class WorkNode(Node):
+    """Queue node that remembers which worker's deque currently holds it."""
+
+    __slots__ = ("owner",)
+
+    def __init__(self, value, owner):
+        super().__init__(value)
+        self.owner = owner
+
+
+class StealingQueue:
+    """
+    Ready queue split into one deque per worker, with the LinkedQueue
+    interface plus take(worker, k).
+
+    Jobs are spread over the deques round-robin, or by an affinity key so
+    related jobs land on the same worker. A worker takes from the front of
+    its own deque (oldest first) under that deque's lock only; when its
+    deque is empty it steals the newer half of the longest deque. Workers
+    therefore contend only when stealing, not on one shared head.
+
+    discard() leaves a tombstone (value None) that takes skip, as in
+    LinkedQueue. Each deque's live count changes only under its own lock,
+    and taken jobs are marked "running" under it, so a caller holding a
+    node (see hold) sees whether it is still queued.
+    """
+
+    def __init__(self, workers, affinity=None):
+        """
+        Purpose:
+            Create empty per-worker deques.
+
+        Parameters:
+            workers (int): Number of deques.
+            affinity (callable or None): job -> hashable key; jobs with
+                equal keys go to the same deque. None spreads round-robin.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError("A work-stealing queue needs at least one worker.")
+        self.workers = workers
+        self.affinity = affinity
+        self.deques = [deque() for _ in range(workers)]
+        # Reentrant so discard / push_front work inside hold()
+        self.locks = [threading.RLock() for _ in range(workers)]
+        self.live = [0] * workers
+        self.steals = 0
+        self._turn = itertools.count()
+        self._next_take = itertools.count()
+
+    @property
+    def size(self):
+        return sum(self.live)
+
+    def home(self, job):
+        """Deque index a new job goes to."""
+        if self.affinity is not None:
+            return hash(self.affinity(job)) % self.workers
+        return next(self._turn) % self.workers
+
+    def enqueue(self, value):
+        return self.enqueue_many([value])[0]
+
+    def enqueue_many(self, values):
+        groups = {}
+        nodes = []
+        for job in values:
+            owner = self.home(job)
+            node = WorkNode(job, owner)
+            nodes.append(node)
+            groups.setdefault(owner, []).append(node)
+        for owner, group in groups.items():
+            with self.locks[owner]:
+                self.deques[owner].extend(group)
+                self.live[owner] += len(group)
+        return nodes
+
+    def push_front(self, value):
+        # Front of the job's home deque (its affinity deque, else by job_id)
+        owner = (hash(self.affinity(value)) if self.affinity is not None else value.job_id) % self.workers
+        node = WorkNode(value, owner)
+        with self.locks[owner]:
+            self.deques[owner].appendleft(node)
+            self.live[owner] += 1
+        return node
+
+    @contextlib.contextmanager
+    def hold(self, node):
+        """
+        Purpose:
+            Hold the lock of the deque that currently owns a node, so no
+            worker can take or steal it meanwhile.
+
+        Parameters:
+            node (WorkNode)
+
+        Returns:
+            context manager
+        """
+        while True:
+            owner = node.owner
+            with self.locks[owner]:
+                if node.owner == owner:
+                    yield
+                    return
+
+    def discard(self, node):
+        while True:
+            owner = node.owner
+            with self.locks[owner]:
+                if node.owner != owner:
+                    # Stolen meanwhile; retry under the new owner's lock
+                    continue
+                if node.value is not None:
+                    node.value = None
+                    self.live[owner] -= 1
+                return
+
+    def _pop(self, worker, k):
+        """Pop up to k live jobs from the front of one deque."""
+        jobs = []
+        with self.locks[worker]:
+            d = self.deques[worker]
+            while d and len(jobs) < k:
+                job = d.popleft().value
+                if job is not None:
+                    job.status = "running"
+                    jobs.append(job)
+            self.live[worker] -= len(jobs)
+        return jobs
+
+    def _steal(self, worker):
+        """Move the newer half of the longest other deque to `worker`'s deque."""
+        victim = max((i for i in range(self.workers) if i != worker),
+                     key=self.live.__getitem__, default=None)
+        if victim is None or not self.live[victim]:
+            return False
+        with self.locks[victim]:
+            d = self.deques[victim]
+            count = (len(d) + 1) // 2
+            stolen = [d.pop() for _ in range(count)]
+            moved = 0
+            for node in stolen:
+                node.owner = worker
+                if node.value is not None:
+                    moved += 1
+            self.live[victim] -= moved
+        stolen.reverse()
+        with self.locks[worker]:
+            self.deques[worker].extend(stolen)
+            self.live[worker] += moved
+        self.steals += 1
+        return True
+
+    def take(self, worker, k=1):
+        """
+        Purpose:
+            Remove up to k jobs for one worker: from its own deque, or by
+            stealing when that deque is empty.
+
+        Parameters:
+            worker (int): Worker (deque) index.
+            k (int): Maximum jobs to take.
+
+        Returns:
+            list[Job]: Empty only when every deque is empty.
+        """
+        while True:
+            jobs = self._pop(worker, k)
+            if jobs or not self._steal(worker):
+                if jobs or not self.size:
+                    return jobs
+
+    def dequeue_many(self, k):
+        # Callers that are not workers take from the deques in turn
+        jobs = []
+        start = next(self._next_take)
+        for i in range(self.workers):
+            if len(jobs) >= k:
+                break
+            jobs.extend(self._pop((start + i) % self.workers, k - len(jobs)))
+        return jobs
+
+    def dequeue(self):
+        jobs = self.dequeue_many(1)
+        return jobs[0] if jobs else None
+
+    def peek(self):
+        for i in range(self.workers):
+            with self.locks[i]:
+                for node in self.deques[i]:
+                    if node.value is not None:
+                        return node.value
+        return None
+
+    def is_empty(self):
+        return self.size == 0
+
+    def __iter__(self):
+        # One deque at a time, copied under its lock
+        for i in range(self.workers):
+            with self.locks[i]:
+                nodes = list(self.deques[i])
+            for node in nodes:
+                if node.value is not None:
+                    yield node.value
+
+    def to_list(self):
+        return list(self)
+
+
+class WorkStealingScheduler(ConcurrentScheduler):
+    """
+    ConcurrentScheduler whose ready queue is split into per-worker deques
+    (see StealingQueue). Worker threads take jobs from their own deque and
+    steal from busy workers when idle. Duplicate checks still go through
+    the shared hash index and executed_ids, and every job is recorded in
+    the one history list.
+
+    run_next_task / run_batch / run_all still work from any thread; use
+    run_worker() or drain() to take the per-worker path.
+    """
+
+    def __init__(self, workers=4, affinity=None, hash_size=53, **options):
+        """
+        Purpose:
+            Set up a work-stealing scheduler.
+
+        Parameters:
+            workers (int): Number of worker deques (and drain() threads).
+            affinity (callable or None): job -> key; jobs with equal keys
+                are queued on the same worker. None spreads round-robin.
+            hash_size (int): Initial bucket count for hash table.
+            options: Other ConcurrentScheduler() keyword arguments.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If workers is less than 1 or a policy other than
+                "fifo" is given.
+        """
+        if options.get("policy", "fifo") != "fifo":
+            raise ValueError("WorkStealingScheduler only supports the fifo policy.")
+        if workers < 1:
+            raise ValueError("A work-stealing scheduler needs at least one worker.")
+        self.workers = workers
+        self.affinity = affinity
+        super().__init__(hash_size, **options)
+
+    def _new_queue(self):
+        return StealingQueue(self.workers, self.affinity)
+
+    def _hold(self, entry):
+        # Workers take from the deques without the queue lock
+        if isinstance(entry, WorkNode):
+            return self.queue.hold(entry)
+        return super()._hold(entry)
+
+    def _default_save_method(self):
+        # Workers do not take the queue lock, so a forked child could
+        # inherit a deque lock held mid-take and block on it forever
+        return "thread"
+
+    def run_worker(self, worker, k=1):
+        """
+        Purpose:
+            Execute up to k jobs as one worker, stealing if its deque is empty.
+
+        Parameters:
+            worker (int): Worker index in [0, workers).
+            k (int): Maximum jobs to execute.
+
+        Returns:
+            list[Job]: The executed jobs (empty when the queue is empty).
+        """
+        self._promote_due()
+        jobs = self.queue.take(worker, k)
+        if not jobs:
+            return jobs
+        self._made_room(jobs)
+        if self.events.on_dequeue:
+            self.events.emit("on_dequeue", jobs)
+        jobs = self._execute(jobs)
+        self._maybe_compact()
+        return jobs
+
+    def drain(self, batch=1):
+        """
+        Purpose:
+            Run every queued job on `workers` threads, one per deque, and
+            return when the queue is empty.
+
+        Parameters:
+            batch (int): Jobs a worker takes at a time.
+
+        Returns:
+            int: Number of jobs executed.
+        """
+        counts = [0] * self.workers
+
+        def work(worker):
+            while True:
+                jobs = self.run_worker(worker, batch)
+                if not jobs:
+                    return
+                counts[worker] += len(jobs)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sum(counts)
@@ -1,6 +1,23 @@
 import unittest
 import logging
-from task_scheduler import Scheduler, HashTable, LinkedQueue, Job
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from task_scheduler import (Scheduler, HashTable, LinkedQueue, Job, TimerWheel, AsyncScheduler,
+                            ConcurrentScheduler, MappedSnapshot, CompactJob, ShardedScheduler,
+                            SchedulerServer, SchedulerClient, WorkStealingScheduler,
+                            QueueFullError, TokenBucket, SnapshotHandle, Journal)
+from task_scheduler.history_list import HistoryList
+from task_scheduler.metrics import LatencyHistogram
+from task_scheduler.dedup import IntervalSet, BloomDedup, TTLDedup
+from task_scheduler.server import encode_frame
 
 # Configure logging for the test module
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
@@ -75,6 +92,19 @@ class TestSearching(BaseLoggedTest):
         self.assertEqual(loc2[1].job_id, 1)
         log_success("Scheduler.find_job found Job(1) in queue before execution and in history after run_next_task()")
 
+    def test_scheduler_find_jobs_bulk(self):
+        """Scheduler.find_jobs resolves queued, executed and unknown IDs in order"""
+        s = Scheduler(hash_size=3)
+        for i in range(1, 6):
+            s.submit_task(i)
+        s.run_next_task()
+        s.run_next_task()
+        results = s.find_jobs([5, 1, 99, 2, 3])
+        self.assertEqual([r[0] if r else None for r in results],
+                         ["queue", "history", None, "history", "queue"])
+        self.assertEqual([r[1].job_id for r in results if r], [5, 1, 2, 3])
+        log_success("find_jobs returned queue/history/None locations in request order")
+
 
 class TestDequeueing(BaseLoggedTest):
     def test_linked_queue_fifo(self):
@@ -107,6 +137,1646 @@ class TestDequeueing(BaseLoggedTest):
         log_success("run_next_task executed Job(5), added to history, and the job remains retrievable from the hash as executed")
 
 
+class TestBatchOperations(BaseLoggedTest):
+    def test_submit_many_enqueues_in_order(self):
+        """submit_many enqueues a batch in order and indexes every job"""
+        s = Scheduler(hash_size=5)
+        s.submit_task(1)
+        jobs = s.submit_many(range(2, 12))
+        self.assertEqual(len(jobs), 10)
+        self.assertEqual([j.job_id for j in s.queue.to_list()], list(range(1, 12)))
+        self.assertEqual(s.queue.size, 11)
+        self.assertTrue(all(s.hash.search(i) is not None for i in range(1, 12)))
+        log_success("submit_many queued jobs 2..11 after job 1, all indexed in the hash")
+
+    def test_submit_many_is_atomic_on_duplicates(self):
+        """submit_many rejects the whole batch on any duplicate"""
+        s = Scheduler(hash_size=5)
+        s.submit_many([1, 2])
+        s.run_next_task()
+        for batch in ([3, 4, 3], [3, 2], [5, 1]):
+            with self.assertRaises(ValueError):
+                s.submit_many(batch)
+        self.assertEqual([j.job_id for j in s.queue.to_list()], [2])
+        self.assertIsNone(s.hash.search(3))
+        log_success("submit_many rejected in-batch, queued and executed duplicates without partial inserts")
+
+    def test_run_batch_and_run_all(self):
+        """run_batch executes k jobs with one timestamp; run_all drains the rest"""
+        s = Scheduler(hash_size=5)
+        s.submit_many(range(10))
+        first = s.run_batch(4)
+        self.assertEqual([j.job_id for j in first], [0, 1, 2, 3])
+        self.assertEqual(len({j.execution_timestamp for j in first}), 1)
+        self.assertEqual(s.queue.size, 6)
+        rest = s.run_all()
+        self.assertEqual([j.job_id for j in rest], list(range(4, 10)))
+        self.assertTrue(s.queue.is_empty())
+        self.assertIsNone(s.queue.tail)
+        self.assertEqual([j.job_id for j in s.history.display_history()], list(range(10)))
+        self.assertEqual(s.find_job(7)[0], "history")
+        self.assertEqual(s.run_batch(3), [])
+        with self.assertRaises(ValueError):
+            s.submit_task(7)
+        log_success("run_batch executed 4 jobs, run_all the remaining 6, history kept FIFO order")
+
+
+class TestQueuePolicies(BaseLoggedTest):
+    def test_priority_policy_orders_by_priority_then_fifo(self):
+        """Priority policy runs higher priorities first and keeps FIFO among equals"""
+        s = Scheduler(hash_size=5, policy="priority")
+        s.submit_task(1)
+        s.submit_task(2, priority=5)
+        s.submit_task(3)
+        s.submit_task(4, priority=5)
+        s.submit_many([5, 6], priority=9)
+        order = [s.run_next_task().job_id for _ in range(6)]
+        self.assertEqual(order, [5, 6, 2, 4, 1, 3])
+        self.assertEqual(s.find_job(4)[0], "history")
+        log_success(f"priority policy executed jobs in order {order}")
+
+    def test_deadline_policy_is_edf(self):
+        """Deadline policy runs the earliest deadline first; no deadline goes last"""
+        now = datetime.now()
+        s = Scheduler(hash_size=5, policy="deadline")
+        s.submit_task(1)
+        s.submit_task(2, deadline=now + timedelta(minutes=10))
+        s.submit_task(3, deadline=now + timedelta(minutes=1))
+        s.submit_task(4, deadline=now + timedelta(minutes=1))
+        self.assertEqual([j.job_id for j in s.queue.to_list()], [3, 4, 2, 1])
+        self.assertEqual([j.job_id for j in s.run_all()], [3, 4, 2, 1])
+        log_success("deadline policy executed jobs as [3, 4, 2, 1]")
+
+    def test_priority_fields_round_trip_through_file(self):
+        """priority/deadline survive save_to_file and load_from_file"""
+        deadline = datetime(2030, 1, 1, 12, 0)
+        s = Scheduler(hash_size=5, policy="priority")
+        s.submit_task(1, priority=1)
+        s.submit_task(2, priority=3, deadline=deadline)
+        s.submit_task(3, priority=3)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            restored = Scheduler(hash_size=5, policy="priority")
+            restored.load_from_file(path)
+        jobs = restored.queue.to_list()
+        self.assertEqual([j.job_id for j in jobs], [2, 3, 1])
+        self.assertEqual(jobs[0].priority, 3)
+        self.assertEqual(jobs[0].deadline, deadline)
+        self.assertIsNone(jobs[1].deadline)
+        log_success("priority and deadline fields round-tripped and reloaded in heap order")
+
+    def test_unknown_policy_raises(self):
+        """Scheduler rejects an unknown queue policy"""
+        with self.assertRaises(ValueError):
+            Scheduler(policy="lifo")
+        log_success("unknown policy raised ValueError")
+
+
+class TestDelayedJobs(BaseLoggedTest):
+    def test_timer_wheel_fires_in_order_across_levels(self):
+        """TimerWheel releases items only once due, across levels and overflow"""
+        wheel = TimerWheel(tick=1, slots=4, levels=2, start=0)
+        delays = [1, 3, 5, 6, 17, 40, 100]
+        for d in reversed(delays):
+            wheel.schedule(d, d)
+        fired = []
+        for now in range(0, 101):
+            for item in wheel.advance(now):
+                self.assertLessEqual(item, now)
+                self.assertEqual(item, now)
+                fired.append(item)
+        self.assertEqual(fired, delays)
+        self.assertEqual(len(wheel), 0)
+        log_success(f"TimerWheel fired {fired} exactly on time with 4 slots x 2 levels")
+
+    def test_timer_wheel_skips_idle_time(self):
+        """TimerWheel can jump far ahead in one advance call"""
+        wheel = TimerWheel(tick=0.001, start=0)
+        wheel.schedule(3600.0, "late")
+        wheel.schedule(0.5, "soon")
+        self.assertEqual(wheel.advance(0.4), [])
+        self.assertEqual(wheel.advance(7200.0), ["soon", "late"])
+        log_success("TimerWheel advanced two hours of 1ms ticks in one call")
+
+    def test_delayed_job_waits_outside_queue(self):
+        """A job with a future run_at stays out of the queue until due"""
+        s = Scheduler(hash_size=5)
+        s.submit_task(1, run_at=timedelta(milliseconds=50))
+        s.submit_task(2)
+        self.assertEqual(s.find_job(1)[0], "scheduled")
+        self.assertEqual([j.job_id for j in s.queue.to_list()], [2])
+        with self.assertRaises(ValueError):
+            s.submit_task(1)
+        self.assertEqual([j.job_id for j in s.run_all()], [2])
+        time.sleep(0.1)
+        self.assertEqual(s.run_next_task().job_id, 1)
+        self.assertEqual(s.find_job(1)[0], "history")
+        log_success("delayed job 1 was promoted and executed only after its run_at")
+
+    def test_recurring_job_rearms_and_persists(self):
+        """A recurring job is re-armed after each run and saved as scheduled"""
+        s = Scheduler(hash_size=5)
+        s.submit_task(7, interval=0.05)
+        self.assertEqual(s.run_next_task().job_id, 7)
+        self.assertEqual(s.find_job(7)[0], "scheduled")
+        time.sleep(0.1)
+        self.assertEqual([j.job_id for j in s.run_all()], [7])
+        self.assertEqual([j.job_id for j in s.history.display_history()], [7, 7])
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            restored = Scheduler(hash_size=5)
+            restored.load_from_file(path)
+        self.assertEqual(restored.find_job(7)[0], "scheduled")
+        self.assertEqual(restored.find_job(7)[1].interval, 0.05)
+        self.assertEqual(len(restored.history.display_history()), 2)
+        log_success("recurring job 7 ran twice, was re-armed and reloaded as scheduled")
+
+
+class TestJobExecution(BaseLoggedTest):
+    def test_inline_execution_records_result_and_failure(self):
+        """Without an executor, job callables run inline and failures are recorded"""
+        s = Scheduler(hash_size=5)
+        s.register_handler("add", lambda a, b: a + b)
+        s.submit_task(1, handler="add", args=(2, 3))
+        s.submit_task(2, func=lambda: 1 / 0)
+        s.submit_task(3)
+        jobs = s.run_all()
+        self.assertEqual([j.status for j in jobs], ["executed", "failed", "executed"])
+        self.assertEqual(jobs[0].result, 5)
+        self.assertIn("ZeroDivisionError", jobs[1].error)
+        self.assertLessEqual(jobs[0].execution_timestamp, jobs[0].end_timestamp)
+        self.assertEqual(s.find_job(2)[0], "history")
+        with self.assertRaises(ValueError):
+            s.submit_task(4, handler="missing")
+        log_success("inline run recorded result 5, a ZeroDivisionError failure, and a plain job")
+
+    def test_loaded_job_with_unregistered_handler_fails_without_losing_batch(self):
+        """A loaded job naming an unregistered handler is recorded as failed"""
+        s = Scheduler(hash_size=5)
+        s.register_handler("h", lambda: "ok")
+        s.submit_task(1)
+        s.submit_task(2, handler="h")
+        s.submit_task(3)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            restored = Scheduler(hash_size=5)
+            restored.load_from_file(path)
+        jobs = restored.run_all()
+        self.assertEqual([(j.job_id, j.status) for j in jobs], [(1, "executed"), (2, "failed"), (3, "executed")])
+        self.assertIn("Unknown handler: 'h'", jobs[1].error)
+        self.assertEqual([restored.find_job(i)[0] for i in (1, 2, 3)], ["history"] * 3)
+        self.assertTrue(restored.queue.is_empty())
+        log_success("unregistered handler failed job 2; jobs 1 and 3 still ran and reached history")
+
+    def test_thread_executor_runs_concurrently_in_completion_order(self):
+        """Thread executor runs jobs in parallel and records history in completion order"""
+        s = Scheduler(hash_size=5, executor="thread", max_workers=4)
+        barrier = threading.Barrier(3, timeout=5)
+        s.submit_task(1, func=time.sleep, args=(0.2,))
+        s.submit_task(2, func=barrier.wait)
+        s.submit_task(3, func=barrier.wait)
+        s.submit_task(4, func=barrier.wait)
+        try:
+            jobs = s.run_all()
+        finally:
+            s.shutdown()
+        # Jobs 2-4 can only pass the barrier if they ran at the same time
+        self.assertTrue(all(j.status == "executed" for j in jobs))
+        self.assertEqual(jobs[-1].job_id, 1)
+        self.assertEqual([j.job_id for j in s.history.display_history()][-1], 1)
+        ends = [j.end_timestamp for j in s.history.display_history()]
+        self.assertEqual(ends, sorted(ends))
+        log_success("thread executor ran jobs 2-4 concurrently; slow job 1 finished last in history")
+
+    def test_process_executor_runs_handler(self):
+        """Process executor runs picklable handlers in worker processes"""
+        s = Scheduler(hash_size=5, executor="process", max_workers=2)
+        s.register_handler("factorial", math.factorial)
+        for i in range(1, 6):
+            s.submit_task(i, handler="factorial", args=(i + 10,))
+        try:
+            jobs = s.run_all()
+        finally:
+            s.shutdown()
+        self.assertEqual(sorted(j.result for j in jobs), [math.factorial(i + 10) for i in range(1, 6)])
+        self.assertTrue(all(j.status == "executed" for j in jobs))
+        log_success("process executor computed 5 factorials in worker processes")
+
+
+class TestAsyncScheduler(BaseLoggedTest):
+    def test_async_handles_resolve_with_bounded_concurrency(self):
+        """AsyncScheduler runs coroutine jobs with at most `concurrency` in flight"""
+        state = {"running": 0, "peak": 0}
+
+        async def work(n):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return n * 2
+
+        async def main():
+            async with AsyncScheduler(concurrency=50, hash_size=7) as sched:
+                handles = [await sched.submit_task(i, func=work, args=(i,)) for i in range(500)]
+                results = [await h.result() for h in handles]
+                await sched.join()
+            return sched, results
+
+        sched, results = asyncio.run(main())
+        self.assertEqual(results, [i * 2 for i in range(500)])
+        self.assertLessEqual(state["peak"], 50)
+        self.assertGreater(state["peak"], 1)
+        self.assertEqual(len(sched.scheduler.history.display_history()), 500)
+        self.assertEqual(sched.find_job(499)[0], "history")
+        log_success(f"500 async jobs resolved with peak concurrency {state['peak']} (limit 50)")
+
+    def test_async_errors_and_sync_callables(self):
+        """AsyncScheduler propagates job errors and runs plain functions off the loop"""
+        async def boom():
+            raise KeyError("missing")
+
+        async def main():
+            async with AsyncScheduler(concurrency=4) as sched:
+                bad = await sched.submit_task(1, func=boom)
+                sync = await sched.submit_task(2, func=sum, args=([1, 2, 3],))
+                plain = await sched.submit_task(3)
+                with self.assertRaises(KeyError):
+                    await bad.result()
+                return sched, await sync.result(), await plain.result()
+
+        sched, total, nothing = asyncio.run(main())
+        self.assertEqual(total, 6)
+        self.assertIsNone(nothing)
+        self.assertEqual(sched.find_job(1)[1].status, "failed")
+        log_success("async job error re-raised as KeyError; sync sum() returned 6")
+
+    def test_join_without_worker_raises_and_join_waits_for_worker(self):
+        """join refuses to wait with no worker and sleeps instead of spinning with one"""
+        async def main():
+            sched = AsyncScheduler(concurrency=2, poll_interval=0.3)
+            await sched.submit_task(1)
+            with self.assertRaises(ValueError):
+                await asyncio.wait_for(sched.join(), 1.0)
+            sched.start()
+            await sched.join()
+            await asyncio.sleep(0.05)
+            # Queued behind the async front-end's back: the idle worker only
+            # sees it at its next poll, and join must sleep until then
+            sched.scheduler.submit_task(2)
+            wall, cpu = time.perf_counter(), time.process_time()
+            await asyncio.wait_for(sched.join(), 2.0)
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            await sched.stop()
+            return sched, wall, cpu
+
+        sched, wall, cpu = asyncio.run(main())
+        self.assertEqual(sched.find_job(2)[0], "history")
+        self.assertGreater(wall, 0.1)
+        self.assertLess(cpu, wall / 3)
+        log_success(f"join raised without a worker, then waited {wall:.2f}s using {cpu * 1e3:.1f}ms CPU")
+
+
+class TestConcurrentScheduler(BaseLoggedTest):
+    def test_stress_32_threads(self):
+        """16 submitters and 16 blocking runners never duplicate or lose a job"""
+        s = ConcurrentScheduler(hash_size=7)
+        ids_per_thread = 2000
+        accepted = []
+        rejected = []
+        executed = []
+        record = threading.Lock()
+        submitters_done = threading.Event()
+
+        def submitter(t):
+            # Neighbouring threads overlap on half their IDs to race duplicates
+            start = t * ids_per_thread // 2
+            mine, dupes = [], 0
+            for job_id in range(start, start + ids_per_thread):
+                try:
+                    s.submit_task(job_id)
+                    mine.append(job_id)
+                except ValueError:
+                    dupes += 1
+            with record:
+                accepted.extend(mine)
+                rejected.append(dupes)
+
+        def runner():
+            mine = []
+            while True:
+                job = s.run_next_task(block=True, timeout=0.05)
+                if job is not None:
+                    mine.append(job.job_id)
+                elif submitters_done.is_set() and s.queue.is_empty():
+                    break
+            with record:
+                executed.extend(mine)
+
+        submitters = [threading.Thread(target=submitter, args=(t,)) for t in range(16)]
+        runners = [threading.Thread(target=runner) for _ in range(16)]
+        for t in submitters + runners:
+            t.start()
+        for t in submitters:
+            t.join()
+        submitters_done.set()
+        for t in runners:
+            t.join()
+
+        expected = set(range(17 * ids_per_thread // 2))
+        self.assertEqual(len(accepted), len(set(accepted)))
+        self.assertEqual(set(accepted), expected)
+        self.assertEqual(sorted(executed), sorted(accepted))
+        self.assertEqual(len(s.history.display_history()), len(expected))
+        self.assertEqual(len(s.hash), len(expected))
+        self.assertTrue(all(loc[0] == "history" for loc in s.find_jobs(expected)))
+        self.assertEqual(s.queue.size, 0)
+        log_success(f"32 threads: {len(accepted)} unique jobs executed once, {sum(rejected)} duplicates rejected")
+
+    def test_blocking_run_times_out_and_wakes_on_submit(self):
+        """run_next_task(block=True) times out when idle and wakes for a new job"""
+        s = ConcurrentScheduler()
+        started = time.monotonic()
+        self.assertIsNone(s.run_next_task(block=True, timeout=0.05))
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+        threading.Timer(0.05, s.submit_task, args=(9,)).start()
+        job = s.run_next_task(block=True, timeout=5)
+        self.assertEqual(job.job_id, 9)
+        log_success("blocking run timed out when idle and woke up for job 9")
+
+    def test_taken_job_cannot_be_cancelled_or_moved(self):
+        """A job a runner thread has taken is running: cancel and move_to_front refuse it"""
+        s = ConcurrentScheduler()
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+
+        s.submit_task(1, func=work)
+        s.submit_task(2)
+        runner = threading.Thread(target=s.run_next_task)
+        runner.start()
+        self.assertTrue(started.wait(5))
+        self.assertEqual(s.find_job(1)[0], "running")
+        with self.assertRaises(ValueError):
+            s.cancel(1)
+        with self.assertRaises(ValueError):
+            s.move_to_front(1)
+        self.assertEqual((s.queue.size, s.queue.is_empty()), (1, False))
+        release.set()
+        runner.join()
+
+        self.assertEqual([j.job_id for j in s.run_all()], [2])
+        self.assertEqual([(j.job_id, j.status) for j in s.history],
+                         [(1, "executed"), (2, "executed")])
+        log_success("taken job 1 was neither cancelled nor run twice")
+
+
+class TestJournal(BaseLoggedTest):
+    def test_journal_replays_after_crash(self):
+        """State is recovered from snapshot + journal without a final save"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler(hash_size=5, policy="priority")
+            s.open_journal(path, group_commit=1)
+            s.submit_task(1)
+            s.submit_task(2, priority=5)
+            s.submit_many([3, 4])
+            s.run_next_task()
+            s.submit_task(5, run_at=timedelta(hours=1))
+            # No save_to_file / close_journal: simulate a crash
+            restored = Scheduler(hash_size=5, policy="priority")
+            restored.load_from_file(path)
+            s.close_journal()
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], [1, 3, 4])
+        self.assertEqual([j.job_id for j in restored.history.display_history()], [2])
+        self.assertEqual(restored.find_job(5)[0], "scheduled")
+        with self.assertRaises(ValueError):
+            restored.submit_task(2)
+        log_success("journal replay restored queue [1,3,4], history [2] and scheduled job 5")
+
+    def test_background_compaction_folds_journal(self):
+        """compact_every folds the journal into the snapshot and reopening continues it"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler(hash_size=5)
+            s.open_journal(path, group_commit=8, compact_every=50)
+            for i in range(300):
+                s.submit_task(i)
+                if i % 3 == 0:
+                    s.run_next_task()
+            s.close_journal()
+            self.assertIsNone(s.compaction_error)
+            self.assertTrue(os.path.exists(path))
+            self.assertFalse(os.path.exists(path + ".journal.1"))
+            with open(path + ".journal") as f:
+                self.assertLess(len(f.readlines()), 100)
+
+            reopened = Scheduler(hash_size=5)
+            reopened.open_journal(path)
+            reopened.run_all()
+            reopened.close_journal()
+            final = Scheduler(hash_size=5)
+            final.load_from_file(path)
+        self.assertEqual(sorted(j.job_id for j in final.history.display_history()), list(range(300)))
+        self.assertTrue(final.queue.is_empty())
+        log_success("300 jobs survived background compaction, reopen and a final run_all")
+
+    def test_torn_journal_line_is_ignored(self):
+        """A half-written last journal line does not break recovery"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler()
+            s.open_journal(path, group_commit=1)
+            s.submit_many([1, 2])
+            s.close_journal()
+            with open(path + ".journal", "a") as f:
+                f.write('{"seq": 99, "op": "sub')
+            restored = Scheduler()
+            restored.load_from_file(path)
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], [1, 2])
+        log_success("recovery stopped at the torn line and kept jobs [1, 2]")
+
+    def test_failed_compaction_keeps_rotated_journal_events(self):
+        """A second rotation after a failed snapshot write appends to .journal.1"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler()
+            s.open_journal(path, group_commit=1)
+
+            def no_space(filename, data):
+                raise OSError(28, "No space left on device")
+
+            s._write_snapshot = no_space
+            s.submit_many([1, 2])
+            s.compact(wait=True)
+            self.assertIsInstance(s.compaction_error, OSError)
+            s.submit_task(3)
+            s.compact(wait=True)
+            self.assertFalse(os.path.exists(path))
+            restored = Scheduler()
+            restored.load_from_file(path)
+
+            del s._write_snapshot
+            s.compact(wait=True)
+            self.assertIsNone(s.compaction_error)
+            self.assertFalse(os.path.exists(path + ".journal.1"))
+            s.close_journal()
+            reloaded = Scheduler()
+            reloaded.load_from_file(path)
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], [1, 2, 3])
+        self.assertEqual([j.job_id for j in reloaded.queue.to_list()], [1, 2, 3])
+        log_success("events of a failed compaction survived the next rotation")
+
+    def test_partial_group_is_synced_after_max_delay(self):
+        """Events that never fill a group still reach the file after max_delay"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler()
+            s.open_journal(path, group_commit=64, max_delay=0.02)
+            s.submit_many([1, 2, 3])
+            deadline = time.monotonic() + 2.0
+            while len(Journal.read(path + ".journal")) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # No close_journal before reading: simulate a crash after a quiet period
+            restored = Scheduler()
+            restored.load_from_file(path)
+            s.close_journal()
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], [1, 2, 3])
+        log_success("3 events below the group size were synced by the max_delay flush")
+
+    def test_replay_keeps_order_of_promoted_job_moved_to_front(self):
+        """A promoted timer job moved to the front replays in the live order"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler()
+            s.open_journal(path, group_commit=1)
+            s.submit_many([0, 1])
+            s.submit_task(2, run_at=timedelta(milliseconds=30))
+            time.sleep(0.1)
+            s.run_next_task()
+            s.move_to_front(2)
+            live = [j.job_id for j in s.queue.to_list()]
+            restored = Scheduler()
+            restored.load_from_file(path)
+            s.close_journal()
+        self.assertEqual(live, [2, 1])
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], [2, 1])
+        self.assertEqual(restored.find_job(2)[0], "queue")
+        log_success("replay restored the promoted and moved order [2, 1]")
+
+
+class TestSnapshotLoading(BaseLoggedTest):
+    def test_snapshot_is_valid_json_with_header_counts(self):
+        """save_to_file writes one record per line with counts in the header"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(10))
+        s.run_batch(4)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            with open(path) as f:
+                data = json.load(f)
+            with open(path) as f:
+                lines = f.readlines()
+            restored = Scheduler(hash_size=7)
+            restored.load_from_file(path)
+        self.assertEqual(data["header"]["counts"], {"queue": 6, "scheduled": 0, "history": 4})
+        self.assertEqual(len(data["queue"]), 6)
+        self.assertEqual(len(lines), 1 + 3 * 2 + 10)
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], list(range(4, 10)))
+        self.assertEqual([j.job_id for j in restored.history.display_history()], list(range(4)))
+        self.assertEqual(restored.hash.size, 7)
+        self.assertLessEqual(restored.hash.chain_stats()["max_chain"], 3)
+        self.assertEqual(len(restored.hash), 10)
+        log_success("snapshot parsed as JSON, one record per line, and reloaded 6 queued + 4 executed jobs")
+
+    def test_reload_keeps_presized_hash_table(self):
+        """Delayed and queued jobs loaded first do not shrink the presized table"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(20000))
+        s.run_all()
+        s.submit_many(range(20000, 20005))
+        s.submit_task(99999, run_at=timedelta(hours=1))
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            restored = Scheduler(hash_size=7)
+            restored.load_from_file(path)
+        stats = restored.hash.chain_stats()
+        self.assertEqual((stats["count"], stats["rehashing"]), (20006, False))
+        self.assertEqual(stats["size"], int(20006 / 2.0 * 1.25) | 1)
+        self.assertLessEqual(stats["max_chain"], 4)
+        self.assertEqual(restored.find_job(20004)[0], "queue")
+        log_success(f"reloaded 20006 jobs into {stats['size']} buckets, longest chain {stats['max_chain']}")
+
+    def test_loads_legacy_pretty_printed_file(self):
+        """load_from_file still reads the original indent=2 JSON layout"""
+        legacy = {
+            "queue": [{"job_id": 8, "submit_timestamp": "2025-12-22T18:54:23.512297",
+                       "status": "queued", "execution_timestamp": None}],
+            "history": [{"job_id": 10, "submit_timestamp": "2025-12-22T18:54:23.512297",
+                         "status": "executed", "execution_timestamp": "2025-12-22T18:54:23.516057"}]
+        }
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "legacy.json")
+            with open(path, "w") as f:
+                json.dump(legacy, f, indent=2)
+            s = Scheduler(hash_size=7)
+            s.load_from_file(path)
+        self.assertEqual(s.find_job(8)[0], "queue")
+        self.assertEqual(s.find_job(10)[0], "history")
+        self.assertIn(10, s.executed_ids)
+        log_success("legacy pretty-printed state file loaded with job 8 queued and job 10 executed")
+
+    def test_streaming_reader_handles_many_chunks(self):
+        """Records spanning several decode chunks and empty sections load correctly"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(10000))
+        s.run_batch(5000)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            empty_path = os.path.join(d, "empty.json")
+            Scheduler().save_to_file(empty_path)
+            restored = Scheduler(hash_size=7)
+            restored.load_from_file(path)
+            empty = Scheduler()
+            empty.load_from_file(empty_path)
+        self.assertEqual(restored.queue.size, 5000)
+        self.assertEqual(len(restored.executed_ids), 5000)
+        self.assertEqual(restored.find_job(9999)[0], "queue")
+        self.assertTrue(empty.queue.is_empty())
+        log_success("10000-job snapshot and an empty snapshot both reloaded")
+
+
+class TestBinarySnapshot(BaseLoggedTest):
+    def test_binary_round_trip_and_detection(self):
+        """Binary snapshots reload through load_from_file with exact timestamps"""
+        deadline = datetime(2030, 5, 1, 8, 30, 0, 123456)
+        s = Scheduler(hash_size=7, policy="priority")
+        s.submit_task(1, priority=2, deadline=deadline)
+        s.submit_many(range(2, 200))
+        s.run_batch(50)
+        with tempfile.TemporaryDirectory() as d:
+            bin_path = os.path.join(d, "state.bin")
+            json_path = os.path.join(d, "state.json")
+            s.save_to_file(bin_path, format="binary")
+            s.save_to_file(json_path)
+            self.assertLess(os.path.getsize(bin_path) * 3, os.path.getsize(json_path))
+            restored = Scheduler(hash_size=7, policy="priority")
+            restored.load_from_file(bin_path)
+        original = s.history.display_history()
+        loaded = restored.history.display_history()
+        self.assertEqual([j.job_id for j in loaded], [j.job_id for j in original])
+        self.assertEqual(loaded[0].execution_timestamp, original[0].execution_timestamp)
+        self.assertEqual(loaded[0].priority, 2)
+        self.assertEqual(loaded[0].deadline, deadline)
+        self.assertEqual([j.job_id for j in restored.queue.to_list()],
+                         [j.job_id for j in s.queue.to_list()])
+        self.assertEqual(restored.find_job(150)[0], "queue")
+        log_success("binary snapshot was >3x smaller than JSON and reloaded queue and history exactly")
+
+    def test_mapped_history_queries(self):
+        """MappedSnapshot answers get_last_n and offset lookups from the mapped file"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(1000))
+        s.run_batch(900)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.bin")
+            s.save_to_file(path, format="binary")
+            with MappedSnapshot(path) as snap:
+                self.assertEqual((snap.queue_count, snap.history_count), (100, 900))
+                self.assertEqual([j.job_id for j in snap.get_last_n(3)], [897, 898, 899])
+                self.assertEqual(snap.history_job(10).job_id, 10)
+                self.assertEqual(snap.history_job(-1).status, "executed")
+                self.assertEqual(snap.queue_job(0).job_id, 900)
+                with self.assertRaises(IndexError):
+                    snap.history_job(900)
+        log_success("MappedSnapshot returned the last 3 jobs and offset lookups without a full load")
+
+    def test_binary_stores_extras_and_delayed_jobs(self):
+        """Handlers, arguments, errors and delayed jobs round-trip through a binary snapshot"""
+        s = Scheduler()
+        s.register_handler("add", lambda a, b: a + b)
+        s.submit_task(1, run_at=timedelta(hours=1))
+        s.submit_task(2, handler="add", args=(2, 3), run_at=timedelta(hours=2), interval=30)
+        s.submit_task(3, func=lambda: 1 / 0)
+        s.submit_task(4, handler="add", args=(1,), kwargs={"b": 4})
+        s.run_next_task()
+        s.submit_many(range(10, 1000))
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.bin")
+            s.save_to_file(path, format="binary")
+            restored = Scheduler()
+            restored.register_handler("add", lambda a, b: a + b)
+            restored.load_from_file(path)
+            with MappedSnapshot(path) as snap:
+                self.assertEqual((snap.queue_count, snap.scheduled_count, snap.history_count), (991, 2, 1))
+                self.assertIn("ZeroDivisionError", snap.history_job(0).error)
+            with self.assertRaises(ValueError):
+                s.save_to_file(path, format="xml")
+        failed = restored.find_job(3)[1]
+        self.assertEqual((failed.status, failed.error), ("failed", s.find_job(3)[1].error))
+        self.assertEqual(restored.find_job(1)[0], "scheduled")
+        delayed = restored.find_job(2)[1]
+        self.assertEqual((delayed.handler, list(delayed.args), delayed.interval), ("add", [2, 3], 30))
+        self.assertEqual(delayed.run_at, s.find_job(2)[1].run_at)
+        self.assertEqual(restored.stats()["scheduled"], 2)
+        self.assertEqual(restored.run_next_task().result, 5)
+        log_success("binary snapshot kept handler args, an error message and 2 delayed jobs")
+
+    def test_binary_round_trips_cancelled_recurring_job(self):
+        """A cancelled recurring job reloads the same from binary and JSON snapshots"""
+        s = Scheduler()
+        s.submit_task(1, run_at=timedelta(hours=1), interval=60)
+        s.submit_task(2)
+        s.cancel(1)
+        s.run_all()
+        failed = Scheduler()
+        failed.submit_task(3, func=lambda: 1 / 0)
+        failed.run_all()
+        with tempfile.TemporaryDirectory() as d:
+            states = {}
+            for fmt in ("json", "binary"):
+                path = os.path.join(d, "state." + fmt)
+                s.save_to_file(path, format=fmt)
+                restored = Scheduler()
+                restored.load_from_file(path)
+                states[fmt] = restored
+            failed.save_to_file(os.path.join(d, "failed.bin"), format="binary")
+            reloaded = Scheduler()
+            reloaded.load_from_file(os.path.join(d, "failed.bin"))
+        self.assertIn("ZeroDivisionError", reloaded.history.display_history()[0].error)
+        for fmt, restored in states.items():
+            cancelled = restored.history.display_history()[0]
+            self.assertEqual((cancelled.job_id, cancelled.status, cancelled.interval), (1, "cancelled", 60), fmt)
+            self.assertEqual(cancelled.run_at, s.history.display_history()[0].run_at)
+            self.assertIsNone(restored.find_job(1))
+            self.assertNotIn(1, restored.executed_ids)
+            self.assertEqual(len(restored.hash), 1)
+            restored.submit_task(1)
+            self.assertEqual(restored.find_job(1)[0], "queue")
+        log_success("cancelled recurring job round-tripped through binary and JSON alike")
+
+
+class TestCompactJobs(BaseLoggedTest):
+    def test_compact_job_attributes_round_trip(self):
+        """CompactJob has no __dict__ and reads back what was written"""
+        submitted = datetime(2024, 2, 29, 23, 59, 59, 999999)
+        job = CompactJob(5, submit_timestamp=submitted, priority=3, args=(1, 2))
+        self.assertFalse(hasattr(job, "__dict__"))
+        self.assertEqual(job.submit_timestamp, submitted)
+        self.assertEqual((job.priority, job.args, job.kwargs, job.status), (3, (1, 2), {}, "queued"))
+        job.status = "executed"
+        job.execution_timestamp = submitted + timedelta(microseconds=1)
+        self.assertEqual(job.status, "executed")
+        self.assertEqual(job.execution_timestamp - job.submit_timestamp, timedelta(microseconds=1))
+        self.assertIsNone(CompactJob(6)._extra)
+        self.assertEqual(CompactJob.from_dict(job.to_dict()).to_dict(), job.to_dict())
+        log_success("CompactJob stored timestamps exactly and only allocated extras when needed")
+
+    def test_compact_scheduler_full_flow(self):
+        """Scheduler(compact=True) submits, runs, saves and reloads like the default mode"""
+        s = Scheduler(hash_size=7, policy="priority", compact=True)
+        s.submit_task(1, priority=1)
+        # No args: the binary format refuses jobs whose arguments it cannot store
+        s.submit_task(2, priority=5, func=lambda: 42)
+        s.submit_many(range(3, 50))
+        self.assertEqual(s.run_next_task().job_id, 2)
+        self.assertEqual(s.find_job(2)[1].result, 42)
+        s.run_batch(10)
+        self.assertIsInstance(s.find_job(40)[1], CompactJob)
+        with tempfile.TemporaryDirectory() as d:
+            for name, fmt in (("state.json", "json"), ("state.bin", "binary")):
+                path = os.path.join(d, name)
+                s.save_to_file(path, format=fmt)
+                restored = Scheduler(hash_size=7, policy="priority", compact=True)
+                restored.load_from_file(path)
+                self.assertEqual([j.job_id for j in restored.history.display_history()],
+                                 [j.job_id for j in s.history.display_history()])
+                self.assertEqual(restored.find_job(2)[1].execution_timestamp,
+                                 s.find_job(2)[1].execution_timestamp)
+                self.assertEqual(restored.find_job(40)[0], "queue")
+        log_success("compact scheduler ran jobs and round-tripped JSON and binary snapshots")
+
+
+class TestHistoryAnalytics(BaseLoggedTest):
+    def _history(self, job_class):
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        history = HistoryList()
+        for i in range(100):
+            job = job_class(i, submit_timestamp=base + timedelta(seconds=i))
+            job.status = "failed" if i % 10 == 0 else "executed"
+            job.execution_timestamp = job.submit_timestamp + timedelta(seconds=i % 10)
+            job.end_timestamp = job.execution_timestamp
+            history.add_to_history(job)
+        return base, history
+
+    def test_wait_percentiles_throughput_and_status(self):
+        """Columnar queries match the values computed from Job objects"""
+        for job_class in (Job, CompactJob):
+            base, history = self._history(job_class)
+            cols = history.columns()
+            self.assertEqual(len(cols), 100)
+            self.assertEqual(cols.wait_percentiles((0, 50, 100)), {0: 0.0, 50: 4.5, 100: 9.0})
+            self.assertEqual(cols.status_counts(), {"failed": 10, "executed": 90})
+            buckets = cols.throughput(bucket=30.0, since=base)
+            self.assertEqual([start for start, _ in buckets],
+                             [base + timedelta(seconds=30 * i) for i in range(4)])
+            self.assertEqual(sum(count for _, count in buckets), 100)
+            late = cols.wait_percentiles((50,), since=base + timedelta(seconds=108))
+            self.assertEqual(late, {50: 9.0})
+            with self.assertRaises(ValueError):
+                cols.wait_percentiles((101,))
+        log_success("p0/p50/p100 wait, status counts and 30s throughput buckets were exact")
+
+    def test_columns_follow_appends(self):
+        """columns() only appends jobs added since the previous call"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(20))
+        s.run_batch(5)
+        cols = s.history.columns()
+        self.assertEqual(list(cols.job_id), [0, 1, 2, 3, 4])
+        s.run_all()
+        self.assertIs(s.history.columns(), cols)
+        self.assertEqual(list(cols.job_id), list(range(20)))
+        exported = cols.as_arrays()
+        self.assertEqual(list(exported["job_id"]), list(range(20)))
+        log_success("history columns grew incrementally with the history list")
+
+
+class TestEventHooks(BaseLoggedTest):
+    def test_hot_paths_do_not_print(self):
+        """Submitting, running, peeking, saving and loading write nothing to stdout"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), tempfile.TemporaryDirectory() as d:
+            s = Scheduler(hash_size=7)
+            s.submit_task(1)
+            s.submit_many([2, 3])
+            s.queue.peek()
+            s.run_next_task()
+            s.run_all()
+            s.run_next_task()
+            s.history.get_last_n(0)
+            LinkedQueue().dequeue()
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            Scheduler(hash_size=7).load_from_file(path)
+        self.assertEqual(out.getvalue(), "")
+        log_success("no output was printed on any hot path")
+
+    def test_listeners_receive_events(self):
+        """Listeners get submit, dequeue, execute, save and load events in order"""
+        s = Scheduler(hash_size=7)
+        seen = []
+        for event in ("on_submit", "on_dequeue", "on_execute"):
+            s.events.add(event, lambda jobs, event=event: seen.append((event, [j.job_id for j in jobs])))
+        s.events.add("on_save", lambda filename, fmt: seen.append(("on_save", fmt)))
+        s.submit_task(1)
+        s.submit_many([2, 3])
+        s.run_next_task()
+        s.run_batch(5)
+        with tempfile.TemporaryDirectory() as d:
+            s.save_to_file(os.path.join(d, "state.json"))
+        self.assertEqual(seen, [("on_submit", [1]), ("on_submit", [2, 3]),
+                                ("on_dequeue", [1]), ("on_execute", [1]),
+                                ("on_dequeue", [2, 3]), ("on_execute", [2, 3]),
+                                ("on_save", "json")])
+        with self.assertRaises(ValueError):
+            s.events.add("on_explode", print)
+        log_success("listeners observed every event with the affected jobs")
+
+    def test_log_to_reports_through_logging(self):
+        """events.log_to() reports events through the task_scheduler logger"""
+        s = Scheduler(hash_size=7)
+        s.events.log_to()
+        with self.assertLogs("task_scheduler", level="INFO") as logs:
+            s.submit_many([4, 5])
+            s.run_all()
+        self.assertEqual(len(logs.output), 3)
+        self.assertIn("Executed 2 job(s): 4, 5", logs.output[-1])
+        log_success("submit, dequeue and execute were logged")
+
+
+class TestMetrics(BaseLoggedTest):
+    def test_stats_counters_and_sizes(self):
+        """stats() reports submits, executions, failures, rejections and sizes"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(10))
+        s.submit_task(10, func=lambda: 1 / 0)
+        with self.assertRaises(ValueError):
+            s.submit_task(3)
+        with self.assertRaises(ValueError):
+            s.submit_many([20, 20])
+        s.run_batch(4)
+        s.run_all()
+        with self.assertRaises(ValueError):
+            s.submit_task(0)
+        stats = s.stats()
+        self.assertEqual((stats["submitted"], stats["executed"], stats["failed"]), (11, 10, 1))
+        self.assertEqual(stats["duplicates_rejected"], 3)
+        self.assertEqual((stats["queue_depth"], stats["history_size"]), (0, 11))
+        self.assertEqual(stats["wait"]["count"], 11)
+        self.assertLessEqual(stats["wait"]["p50"], stats["wait"]["p99"])
+        self.assertEqual(stats["hash"]["longest_chain"], s.hash.chain_stats()["max_chain"])
+        with self.assertRaises(ValueError):
+            Scheduler(metrics=False).stats()
+        log_success("counters, sizes and the hash longest chain matched the scheduler state")
+
+    def test_delayed_job_wait_excludes_its_delay(self):
+        """A delayed job's wait is measured from its run_at, not its submit time"""
+        for compact in (False, True):
+            s = Scheduler(hash_size=7, compact=compact)
+            s.submit_task(1, run_at=timedelta(milliseconds=300))
+            time.sleep(0.35)
+            s.run_all()
+            wait = s.stats()["wait"]
+            self.assertEqual(wait["count"], 1)
+            self.assertLess(wait["max"], 0.2)
+            self.assertLess(max(s.history.columns().wait_times()), 0.2)
+        log_success(f"300 ms delayed job reported a wait of {wait['max'] * 1000:.0f} ms")
+
+    def test_recurring_job_wait_does_not_grow(self):
+        """Each run of a recurring job waits from its own occurrence"""
+        s = Scheduler(hash_size=7)
+        s.submit_task(1, run_at=timedelta(milliseconds=50), interval=0.05)
+        runs = 0
+        while runs < 6:
+            time.sleep(0.06)
+            runs += len(s.run_all())
+        wait = s.stats()["wait"]
+        waits = s.history.columns().wait_times()
+        self.assertEqual(wait["count"], runs)
+        self.assertLess(wait["max"], 0.2)
+        self.assertLess(max(waits), 0.2)
+        log_success(f"{runs} runs of a 50 ms recurring job waited at most {wait['max'] * 1000:.0f} ms")
+
+    def test_histogram_percentiles_are_close(self):
+        """LatencyHistogram percentiles stay within the bucket resolution"""
+        hist = LatencyHistogram()
+        for us in range(1, 100001):
+            hist.record(us / 1e6)
+        for p in (50, 90, 99, 99.9):
+            expected = p / 100 * 0.1
+            self.assertAlmostEqual(hist.percentile(p), expected, delta=expected / 16)
+        self.assertEqual(hist.percentile(100), 0.1)
+        self.assertLess(len(hist.counts), 300)
+        log_success("p50..p99.9 of 100k values were within 1/16 using under 300 buckets")
+
+    def test_prometheus_dump(self):
+        """dump_metrics writes Prometheus text with counters and histograms"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(5))
+        s.run_all()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "scheduler.prom")
+            s.dump_metrics(path)
+            with open(path) as f:
+                text = f.read()
+        self.assertIn("# TYPE task_scheduler_jobs_submitted_total counter", text)
+        self.assertIn("task_scheduler_jobs_executed_total 5", text)
+        self.assertIn('task_scheduler_wait_seconds_bucket{le="+Inf"} 5', text)
+        self.assertIn("task_scheduler_execution_seconds_count 5", text)
+        log_success("Prometheus dump contained counters and histogram series")
+
+
+class TestCancellation(BaseLoggedTest):
+    def test_cancel_queued_and_delayed_jobs(self):
+        """cancel() removes queued and delayed jobs and records them in history"""
+        s = Scheduler(hash_size=7)
+        s.submit_many(range(5))
+        s.submit_task(9, run_at=timedelta(milliseconds=10))
+        job = s.cancel(2)
+        s.cancel(9)
+        self.assertEqual(job.status, "cancelled")
+        self.assertIsNone(s.find_job(2))
+        self.assertEqual([j.job_id for j in s.queue.to_list()], [0, 1, 3, 4])
+        self.assertEqual(s.queue.size, 4)
+        self.assertEqual([(j.job_id, j.status) for j in s.history.display_history()],
+                         [(2, "cancelled"), (9, "cancelled")])
+        time.sleep(0.03)
+        executed = s.run_all()
+        self.assertEqual([j.job_id for j in executed], [0, 1, 3, 4])
+        with self.assertRaises(ValueError):
+            s.cancel(0)
+        with self.assertRaises(ValueError):
+            s.cancel(42)
+        s.submit_task(2)
+        self.assertEqual(s.find_job(2)[0], "queue")
+        self.assertEqual(s.stats()["cancelled"], 2)
+        log_success("cancelled jobs were skipped, moved to history and could be resubmitted")
+
+    def test_cancel_removes_delayed_jobs_from_timer_wheel(self):
+        """Cancelled delayed jobs leave the wheel at once, on every wheel level"""
+        for compact in (False, True):
+            s = Scheduler(hash_size=7, compact=compact)
+            for i, delay in enumerate((0.001, 0.5, 30, 3600, 10 ** 8)):
+                s.submit_task(i, run_at=timedelta(seconds=delay))
+            s.submit_task(9, run_at=timedelta(hours=1))
+            self.assertEqual(s.stats()["scheduled"], 6)
+            for i in range(5):
+                s.cancel(i)
+            self.assertEqual(s.stats()["scheduled"], 1)
+            self.assertEqual(s.timers.size, 1)
+            self.assertEqual([j.job_id for j in s.timers.items()], [9])
+        log_success("5 cancelled delayed jobs left the timer wheel; stats report 1 scheduled")
+
+    def test_move_to_front(self):
+        """move_to_front() makes a job run next under FIFO and priority policies"""
+        for policy in ("fifo", "priority"):
+            s = Scheduler(hash_size=7, policy=policy)
+            for i in range(5):
+                s.submit_task(i, priority=i)
+            s.move_to_front(1)
+            s.move_to_front(3)
+            s.cancel(0)
+            self.assertEqual(s.queue.peek().job_id, 3)
+            self.assertEqual(s.find_job(1)[0], "queue")
+            order = [j.job_id for j in s.run_all()]
+            expected = [3, 1, 2, 4] if policy == "fifo" else [3, 1, 4, 2]
+            self.assertEqual(order, expected)
+            with self.assertRaises(ValueError):
+                s.move_to_front(3)
+        log_success("moved jobs ran first and tombstones were skipped")
+
+    def test_priority_queue_purges_tombstones(self):
+        """Cancelling most of a priority queue rebuilds the heap without tombstones"""
+        s = Scheduler(hash_size=7, policy="priority")
+        s.submit_many(range(1000))
+        for i in range(900):
+            s.cancel(i)
+        self.assertLess(len(s.queue.heap), 500)
+        self.assertEqual([j.job_id for j in s.run_all()], list(range(900, 1000)))
+        log_success("heap was rebuilt once tombstones outnumbered live jobs")
+
+    def test_cancel_and_move_survive_journal_replay(self):
+        """Journal replay applies cancel and move_to_front events"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s = Scheduler(hash_size=7)
+            s.open_journal(path, group_commit=1)
+            s.submit_many(range(4))
+            s.cancel(1)
+            s.move_to_front(3)
+            s.close_journal()
+            restored = Scheduler(hash_size=7)
+            restored.load_from_file(path)
+        self.assertEqual([j.job_id for j in restored.queue.to_list()], [3, 0, 2])
+        self.assertEqual([(j.job_id, j.status) for j in restored.history.display_history()],
+                         [(1, "cancelled")])
+        self.assertIsNone(restored.find_job(1))
+        log_success("restored scheduler had the cancel and the move applied")
+
+
+class TestDedupStores(BaseLoggedTest):
+    def test_interval_set_compresses_runs(self):
+        """IntervalSet merges consecutive IDs into ranges and answers membership exactly"""
+        ids = IntervalSet(range(1000))
+        ids.update([2000, 1002, 1001, 1000, 5, 1500])
+        self.assertEqual(ids.ranges, [(0, 1003), (1500, 1501), (2000, 2001)])
+        self.assertEqual(len(ids), 1005)
+        self.assertIn(999, ids)
+        self.assertNotIn(1003, ids)
+        self.assertNotIn(-1, ids)
+        log_success("1005 IDs were stored as 3 ranges")
+
+    def test_bounded_stores_reject_resubmits(self):
+        """submit_task and load_from_file honour bounded dedup stores"""
+        for dedup, options in (("intervals", None), ("bloom", {"capacity": 100, "error_rate": 0.01}),
+                               ("ttl", {"ttl": 3600})):
+            s = Scheduler(hash_size=7, dedup=dedup, dedup_options=options)
+            s.submit_many(range(50))
+            s.run_all()
+            self.assertEqual(len(s.hash), 0)
+            self.assertIsNone(s.find_job(10))
+            with self.assertRaises(ValueError):
+                s.submit_task(10)
+            with self.assertRaises(ValueError):
+                s.submit_many([60, 20])
+            with tempfile.TemporaryDirectory() as d:
+                path = os.path.join(d, "state.json")
+                s.save_to_file(path)
+                restored = Scheduler(hash_size=7, dedup=dedup, dedup_options=options)
+                restored.load_from_file(path)
+            self.assertEqual(len(restored.hash), 0)
+            with self.assertRaises(ValueError):
+                restored.submit_task(49)
+            restored.submit_task(50)
+        with self.assertRaises(ValueError):
+            Scheduler(dedup="ttl")
+        log_success("intervals, bloom and ttl stores rejected executed IDs before and after a reload")
+
+    def test_bloom_fallback_and_ttl_expiry(self):
+        """Bloom hits are confirmed by the fallback; TTL forgets old IDs"""
+        bloom = BloomDedup(capacity=10, error_rate=0.5, fallback=IntervalSet())
+        bloom.update(range(100))
+        self.assertGreater(len(bloom.filters), 1)
+        self.assertTrue(all(i in bloom for i in range(100)))
+        self.assertFalse(any(i in bloom for i in range(100, 1000)))
+
+        now = [0.0]
+        ttl = TTLDedup(10, clock=lambda: now[0])
+        s = Scheduler(hash_size=7, dedup=ttl)
+        s.submit_task(1)
+        s.run_all()
+        with self.assertRaises(ValueError):
+            s.submit_task(1)
+        now[0] = 11.0
+        s.submit_task(1)
+        self.assertEqual(len(ttl), 0)
+        log_success("fallback removed false positives and the TTL window expired")
+
+    def test_ttl_windows_survive_a_reload(self):
+        """A reload keeps each ID's TTL window from when it ran and drops expired IDs"""
+        s = Scheduler(hash_size=7, dedup="ttl", dedup_options={"ttl": 0.3})
+        s.submit_many([1, 2])
+        s.run_all()
+        # Job 2 ran long before the window
+        s.history.display_history()[1].end_timestamp -= timedelta(hours=1)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            s.save_to_file(path)
+            time.sleep(0.1)
+            restored = Scheduler(hash_size=7, dedup="ttl", dedup_options={"ttl": 0.3})
+            restored.load_from_file(path)
+        self.assertEqual(len(restored.executed_ids), 1)
+        with self.assertRaises(ValueError):
+            restored.submit_task(1)
+        restored.submit_task(2)
+        time.sleep(0.3)
+        restored.submit_task(1)
+        log_success("reloaded TTL store kept job 1's original window and dropped job 2")
+
+
+def _square(x):
+    return x * x
+
+
+class TestShardedScheduler(BaseLoggedTest):
+    def test_routing_run_and_merged_history(self):
+        """Jobs are routed by job_id % shards and history merges in time order"""
+        with ShardedScheduler(shards=3) as s:
+            self.assertEqual(s.submit_many(range(30)), 30)
+            s.submit_task(100, func=_square, args=(12,))
+            self.assertEqual(s.find_job(7)[0], "queue")
+            with self.assertRaises(ValueError):
+                s.submit_many([200, 7])
+            self.assertIsNone(s.find_job(200))
+            self.assertEqual(s.run_all(), 31)
+            self.assertEqual(s.find_job(100)[1].result, 144)
+            history = s.history()
+            self.assertEqual(sorted(j.job_id for j in history), list(range(30)) + [100])
+            ends = [j.end_timestamp for j in history]
+            self.assertEqual(ends, sorted(ends))
+            self.assertEqual(len(s.history(5)), 5)
+            self.assertEqual([r and r[0] for r in s.find_jobs([1, 2, 999])], ["history", "history", None])
+            stats = s.stats()
+            self.assertEqual((stats["submitted"], stats["executed"]), (31, 31))
+            self.assertEqual([shard["submitted"] for shard in stats["shards"]], [10, 11, 10])
+        log_success("3 shards ran 31 jobs and returned a time-ordered merged history")
+
+    def test_rejects_fewer_than_one_shard(self):
+        """shards=0 or negative raises instead of falling back to one per CPU"""
+        for shards in (0, -2):
+            with self.assertRaises(ValueError):
+                ShardedScheduler(shards=shards)
+        log_success("shards=0 and shards=-2 were rejected")
+
+    def test_per_shard_persistence(self):
+        """Each shard journals to its own file and recovers it on restart"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "state.json")
+            with ShardedScheduler(shards=2, path=path) as s:
+                s.submit_many(range(10))
+                s.run_batch(2)
+            self.assertTrue(os.path.exists(os.path.join(d, "state.shard1.json.journal")))
+            with ShardedScheduler(shards=2, path=path) as restored:
+                self.assertEqual(restored.find_job(0)[0], "history")
+                self.assertEqual(restored.find_job(9)[0], "queue")
+                with self.assertRaises(ValueError):
+                    restored.submit_task(1)
+                self.assertEqual(restored.run_all(), 6)
+        log_success("two shards recovered their own journals after a restart")
+
+
+class TestSchedulerServer(BaseLoggedTest):
+    def test_pipelined_batches_over_loopback(self):
+        """Pooled, pipelined client requests reach the server's Scheduler in order"""
+        async def main():
+            async with SchedulerServer(hash_size=7) as server:
+                server.scheduler.register_handler("square", _square)
+                host, port = server.address
+                async with SchedulerClient(host, port, pool_size=3) as client:
+                    counts = await asyncio.gather(*(client.submit_many(range(i * 100, i * 100 + 100))
+                                                    for i in range(10)))
+                    job = await client.submit_task(5000, handler="square", args=(9,))
+                    with self.assertRaises(ValueError):
+                        await client.submit_many([5001, 3])
+                    found = await client.find_jobs([3, 5001, 5000])
+                    ran = await client.run_batch(250)
+                    await client.cancel(999)
+                    rest = await client.run_all()
+                    stats = await client.stats()
+                    page = await client.history_page(limit=2, reverse=True)
+                return server, counts, job, found, ran, rest, stats, page
+
+        server, counts, job, found, ran, rest, stats, page = asyncio.run(main())
+        self.assertEqual(counts, [100] * 10)
+        self.assertEqual((job.job_id, job.handler, job.status), (5000, "square", "queued"))
+        self.assertEqual([f and f[0] for f in found], ["queue", None, "queue"])
+        self.assertEqual(len(ran), 250)
+        self.assertEqual(len(rest), 750)
+        self.assertEqual(server.scheduler.find_job(5000)[1].result, 81)
+        self.assertEqual((stats["submitted"], stats["executed"], stats["cancelled"]), (1001, 1000, 1))
+        self.assertEqual(([j.job_id for j in page[0]], page[1]), ([rest[-1].job_id, rest[-2].job_id], 1000))
+        log_success("1001 jobs submitted and run through 3 pipelined connections")
+
+    def test_unix_socket_and_errors(self):
+        """The server also listens on a Unix socket and reports bad requests"""
+        async def main(path):
+            async with SchedulerServer(path=path):
+                async with SchedulerClient(path=path, pool_size=1) as client:
+                    self.assertEqual(await client.request("ping"), "pong")
+                    with self.assertRaises(ValueError):
+                        await client.request("shutdown")
+                    with self.assertRaises(RuntimeError):
+                        await client.request("find_job")
+                    self.assertIsNone(await client.run_next_task())
+                    await client.submit_task(1)
+                    return await client.find_job(1)
+
+        with tempfile.TemporaryDirectory() as d:
+            location, job = asyncio.run(main(os.path.join(d, "sched.sock")))
+        self.assertEqual((location, job.job_id), ("queue", 1))
+        log_success("Unix socket served requests and surfaced server errors")
+
+    def test_bad_requests_and_dropped_connections_are_survived(self):
+        """Unencodable results and non-object frames keep the connection; dead ones are replaced"""
+        async def main():
+            async with SchedulerServer() as server:
+                server.scheduler.submit_task(1, args=({1, 2},))
+                host, port = server.address
+                async with SchedulerClient(host, port, pool_size=1) as client:
+                    conn = client._pool[0]
+                    pipelined = await asyncio.gather(client.find_job(1), client.request("ping"),
+                                                     return_exceptions=True)
+                    conn.writer.write(encode_frame([1, 2]))
+                    self.assertEqual(await asyncio.wait_for(client.request("ping"), 2), "pong")
+                    self.assertIs(client._pool[0], conn)
+
+                    conn.writer.transport.abort()
+                    await asyncio.wait_for(conn.task, 2)
+                    with self.assertRaises(ConnectionError):
+                        await conn.call("ping", {})
+                    pong = await asyncio.wait_for(client.request("ping"), 2)
+                    replaced = client._pool[0] is not conn
+                return pipelined, pong, replaced
+
+        (error, pong), again, replaced = asyncio.run(main())
+        self.assertIsInstance(error, RuntimeError)
+        self.assertIn("TypeError", str(error))
+        self.assertEqual((pong, again), ("pong", "pong"))
+        self.assertTrue(replaced)
+        log_success("unencodable result became an error response; a dropped connection was reopened")
+
+
+class TestSqliteStorage(BaseLoggedTest):
+    def _workload(self, sched):
+        sched.submit_many(range(20), priority=1)
+        sched.submit_task(100, priority=5)
+        sched.submit_task(101, func=lambda: "done")
+        sched.move_to_front(15)
+        sched.cancel(3)
+        sched.submit_task(3)
+        first = [j.job_id for j in sched.run_batch(5)]
+        rest = [j.job_id for j in sched.run_all()]
+        return first, rest
+
+    def test_matches_memory_backend(self):
+        """The SQLite backend runs jobs in the same order as the in-memory one"""
+        for policy in Scheduler.POLICIES:
+            memory = Scheduler(policy=policy)
+            sqlite = Scheduler(policy=policy, storage="sqlite")
+            self.assertEqual(self._workload(sqlite), self._workload(memory))
+            self.assertEqual([(r and r[0]) for r in sqlite.find_jobs([3, 15, 999])],
+                             ["history", "history", None])
+            self.assertEqual(sqlite.find_job(101)[1].status, "executed")
+            with self.assertRaises(ValueError):
+                sqlite.submit_task(7)
+            self.assertEqual(len(sqlite.history), len(memory.history))
+            sqlite.shutdown()
+        log_success("SQLite and memory backends agree for every policy")
+
+    def test_resumes_from_database(self):
+        """Queue, delayed jobs and history survive reopening the database"""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "jobs.db")
+            s = Scheduler(storage="sqlite", storage_options={"path": path})
+            s.submit_many(range(10))
+            s.submit_task(50, run_at=timedelta(hours=1))
+            s.run_batch(4)
+            s.shutdown()
+
+            restored = Scheduler(storage="sqlite", storage_options={"path": path})
+            self.assertEqual(restored.queue.size, 6)
+            self.assertEqual(restored.find_job(50)[0], "scheduled")
+            self.assertEqual(restored.find_job(2)[0], "history")
+            with self.assertRaises(ValueError):
+                restored.submit_task(2)
+            start = datetime.now()
+            self.assertEqual([j.job_id for j in restored.run_all()], [4, 5, 6, 7, 8, 9])
+            self.assertEqual([j.job_id for j in restored.history.in_range(since=start)], [4, 5, 6, 7, 8, 9])
+            self.assertEqual([j.job_id for j in restored.history.get_last_n(2)], [8, 9])
+            restored.shutdown()
+        log_success("reopened SQLite scheduler kept its queue, timers and history")
+
+
+class TestWorkStealing(BaseLoggedTest):
+    def test_drain_steals_from_skewed_worker(self):
+        """Idle workers steal from a worker whose affinity queue holds every job"""
+        # Every job has the same affinity key, so one deque gets them all
+        s = WorkStealingScheduler(workers=4, affinity=lambda job: 0)
+        s.submit_many(range(200))
+        for i in range(200, 210):
+            s.submit_task(i, func=time.sleep, args=(0.002,))
+        self.assertEqual(sorted(s.queue.live), [0, 0, 0, 210])
+        with self.assertRaises(ValueError):
+            s.submit_many([5])
+        self.assertEqual(s.drain(batch=4), 210)
+        self.assertGreater(s.queue.steals, 0)
+        self.assertEqual(s.queue.size, 0)
+        self.assertEqual(len(s.history), 210)
+        self.assertEqual(len({j.job_id for j in s.history.display_history()}), 210)
+        with self.assertRaises(ValueError):
+            s.submit_task(7)
+        log_success(f"4 workers drained 210 jobs with {s.queue.steals} steals")
+
+    def test_round_robin_cancel_and_move_to_front(self):
+        """Round-robin deques keep cancel and move_to_front working"""
+        s = WorkStealingScheduler(workers=3)
+        s.submit_many(range(9))
+        self.assertEqual(s.queue.live, [3, 3, 3])
+        s.cancel(4)
+        s.move_to_front(8)
+        self.assertEqual(s.queue.size, 8)
+        self.assertEqual(s.run_worker(8 % 3)[0].job_id, 8)
+        self.assertIsNone(s.find_job(4))
+        self.assertEqual(sorted(j.job_id for j in s.run_all()), [0, 1, 2, 3, 5, 6, 7])
+        self.assertEqual(s.stats()["cancelled"], 1)
+        log_success("cancel and move_to_front work across per-worker deques")
+
+    def test_taken_job_is_not_requeued_or_cancelled(self):
+        """A job a worker has taken is running: move_to_front and cancel refuse it"""
+        s = WorkStealingScheduler(workers=2, affinity=lambda job: 0)
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+
+        s.submit_task(1, func=work)
+        s.submit_many([2, 3])
+        worker = threading.Thread(target=s.run_worker, args=(0,))
+        worker.start()
+        self.assertTrue(started.wait(5))
+        with self.assertRaises(ValueError):
+            s.move_to_front(1)
+        with self.assertRaises(ValueError):
+            s.cancel(1)
+        self.assertEqual(sorted(s.queue.live), [0, 2])
+        release.set()
+        worker.join()
+
+        self.assertEqual(s.drain(), 2)
+        self.assertEqual(sorted(j.job_id for j in s.history), [1, 2, 3])
+        self.assertEqual(s.queue.size, 0)
+        log_success("taken job 1 ran once and the live counts stayed exact")
+
+
+class TestAdmissionControl(BaseLoggedTest):
+    def test_reject_when_full(self):
+        """A full queue rejects submissions with QueueFullError until jobs run"""
+        full = []
+        s = Scheduler(max_queue=5)
+        s.events.add("on_queue_full", lambda jobs, depth: full.append((len(jobs), depth)))
+        s.submit_many(range(5))
+        with self.assertRaises(QueueFullError):
+            s.submit_task(5)
+        with self.assertRaises(ValueError):
+            s.submit_many([6, 7])
+        with self.assertRaises(QueueFullError):
+            s.submit_many(range(10, 20))
+        s.run_next_task()
+        s.submit_task(5)
+        self.assertIsNone(s.find_job(6))
+        self.assertEqual(full, [(1, 5), (2, 5), (10, 5)])
+        self.assertEqual(s.stats()["queue_full"], 3)
+        log_success("full queue rejected 3 submissions and reported them")
+
+    def test_shed_lowest_priority(self):
+        """Shedding drops the lowest-priority queued job, oldest first among equals"""
+        s = Scheduler(max_queue=3, overflow="shed", policy="priority")
+        s.submit_task(1, priority=1)
+        s.submit_task(2, priority=5)
+        s.submit_task(3, priority=1)
+        s.submit_task(4, priority=3)
+        self.assertEqual([j.job_id for j in s.queue.to_list()], [2, 4, 3])
+        self.assertEqual([(j.job_id, j.status) for j in s.history.display_history()], [(1, "shed")])
+        with self.assertRaises(QueueFullError):
+            s.submit_task(5, priority=0)
+        s.submit_task(6, priority=1)
+        self.assertEqual([j.job_id for j in s.history], [1, 3])
+        self.assertIsNone(s.find_job(3))
+        self.assertEqual(s.stats()["shed"], 2)
+        self.assertEqual([j.job_id for j in s.run_all()], [2, 4, 6])
+        log_success("shed jobs 1 and 3 for equal or higher-priority jobs and refused a lower one")
+
+    def test_shed_fifo_drops_oldest_and_deadline_least_urgent(self):
+        """Under fifo the oldest job is shed; under deadline the least urgent one"""
+        s = Scheduler(max_queue=3, overflow="shed")
+        s.submit_many([1, 2, 3])
+        s.run_next_task()
+        s.submit_many([4, 5])
+        s.submit_task(6)
+        self.assertEqual([j.job_id for j in s.queue], [4, 5, 6])
+        self.assertEqual([(j.job_id, j.status) for j in s.history], [(1, "executed"), (2, "shed"), (3, "shed")])
+
+        now = datetime.now()
+        d = Scheduler(max_queue=3, overflow="shed", policy="deadline")
+        d.submit_task(1, deadline=now + timedelta(hours=1))
+        d.submit_task(2)
+        d.submit_task(3, deadline=now + timedelta(hours=5))
+        d.submit_task(4, deadline=now + timedelta(hours=2))
+        d.submit_task(5, deadline=now + timedelta(hours=3))
+        self.assertEqual([j.job_id for j in d.queue], [1, 4, 5])
+        with self.assertRaises(QueueFullError):
+            d.submit_task(6)
+        self.assertEqual([j.job_id for j in d.history], [2, 3])
+        log_success("fifo shed the oldest jobs, deadline shed the least urgent ones")
+
+    def test_shed_ignores_entries_of_cancelled_job_with_reused_id(self):
+        """A cancelled job's shed entry does not stand in for a resubmitted job with its ID"""
+        for storage in ("memory", "sqlite"):
+            s = Scheduler(max_queue=3, overflow="shed", policy="priority", storage=storage)
+            s.submit_task(1, priority=0)
+            s.submit_task(2, priority=5)
+            s.submit_task(3, priority=5)
+            s.cancel(1)
+            s.submit_task(1, priority=100)
+            s.submit_task(4, priority=10)
+            self.assertEqual(s.queue.size, 3)
+            self.assertEqual([(j.job_id, j.status, j.priority) for j in s.history],
+                             [(1, "cancelled", 0), (2, "shed", 5)], storage)
+            self.assertEqual([j.job_id for j in s.queue.to_list()], [1, 4, 3], storage)
+        log_success("resubmitted job 1 at p100 kept its place; job 2 at p5 was shed instead")
+
+    def test_shed_cost_does_not_scan_the_queue(self):
+        """Shedding one job from a large full queue takes far less than a scan"""
+        s = Scheduler(max_queue=20000, overflow="shed", metrics=False)
+        s.submit_many(range(20000))
+        s.run_batch(10)
+        s.submit_many(range(20000, 20010))
+        started = time.perf_counter()
+        for job_id in range(30000, 31000):
+            s.submit_task(job_id)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(s.queue.size, 20000)
+        self.assertEqual(len(s.history), 10 + 1000)
+        self.assertEqual(s.queue.peek().job_id, 1010)
+        self.assertLess(len(s.shed_order), 2 * 20000 + 64)
+        self.assertLess(elapsed, 1.0)
+        log_success(f"1000 sheds from a 20000-deep queue took {elapsed * 1000:.1f} ms")
+
+    def test_block_until_runner_makes_room(self):
+        """With overflow="block" a submitter waits for a runner thread"""
+        s = ConcurrentScheduler(max_queue=2, overflow="block", block_timeout=5)
+        s.submit_many([1, 2])
+        submitter = threading.Thread(target=s.submit_task, args=(3,))
+        submitter.start()
+        time.sleep(0.05)
+        self.assertTrue(submitter.is_alive())
+        s.run_next_task()
+        submitter.join(5)
+        self.assertFalse(submitter.is_alive())
+        self.assertEqual(s.find_job(3)[0], "queue")
+        stats = s.stats()
+        self.assertEqual(stats["blocked"]["count"], 1)
+        self.assertGreaterEqual(stats["blocked"]["max"], 0.04)
+
+        impatient = ConcurrentScheduler(max_queue=1, overflow="block", block_timeout=0.02)
+        impatient.submit_task(1)
+        with self.assertRaises(QueueFullError):
+            impatient.submit_task(2)
+        log_success(f"submitter blocked {stats['blocked']['max']:.3f}s until a job ran")
+
+    def test_token_bucket(self):
+        """The token bucket spaces submissions out at its rate"""
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=10, burst=2, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual([bucket.acquire(), bucket.acquire()], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.acquire(), 0.1)
+        with self.assertRaises(QueueFullError):
+            bucket.acquire(5, timeout=0.2)
+        now[0] += 1.0
+        self.assertEqual(bucket.acquire(2), 0.0)
+        self.assertEqual(len(slept), 1)
+
+        s = Scheduler(rate_limit=1000, rate_burst=10)
+        start = time.perf_counter()
+        s.submit_many(range(30))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.015)
+        self.assertEqual(s.stats()["throttled"], 1)
+        log_success("token bucket throttled a burst of 30 to 1000 jobs/s")
+
+
+class TestLazyIteration(BaseLoggedTest):
+    def test_history_tail_and_pages(self):
+        """get_last_n, reversed() and page() read the history tail without a full copy"""
+        h = HistoryList()
+        h.extend([Job(i, datetime.now()) for i in range(1, 8)])
+        h.add_to_history(Job(8, datetime.now()))
+        self.assertEqual([j.job_id for j in h.get_last_n(3)], [6, 7, 8])
+        self.assertEqual([j.job_id for j in reversed(h)], list(range(8, 0, -1)))
+        self.assertEqual([j.job_id for j in h], list(range(1, 9)))
+
+        jobs, cursor = h.page(limit=3, reverse=True)
+        self.assertEqual(([j.job_id for j in jobs], cursor), ([8, 7, 6], 6))
+        jobs, cursor = h.page(after=cursor, limit=3, reverse=True)
+        self.assertEqual(([j.job_id for j in jobs], cursor), ([5, 4, 3], 3))
+        jobs, cursor = h.page(after=cursor, limit=3, reverse=True)
+        self.assertEqual(([j.job_id for j in jobs], cursor), ([2, 1], None))
+
+        jobs, cursor = h.page(limit=5)
+        self.assertEqual(([j.job_id for j in jobs], cursor), ([1, 2, 3, 4, 5], 5))
+        jobs, cursor = h.page(after=cursor, limit=5)
+        self.assertEqual(([j.job_id for j in jobs], cursor), ([6, 7, 8], 8))
+        self.assertEqual(h.page(after=cursor), ([], 8))
+        h.add_to_history(Job(9, datetime.now()))
+        self.assertEqual([j.job_id for j in h.page(after=cursor)[0]], [9])
+        with self.assertRaises(ValueError):
+            h.page(limit=0)
+        log_success("history paged forward and backward by cursor")
+
+    def test_sqlite_history_pages_match_memory(self):
+        """SqliteHistory.page and iteration agree with HistoryList"""
+        for storage in ("memory", "sqlite"):
+            s = Scheduler(storage=storage)
+            s.submit_many(range(1, 11))
+            s.run_all()
+            jobs, cursor = s.history.page(limit=4, reverse=True)
+            self.assertEqual([j.job_id for j in jobs], [10, 9, 8, 7])
+            seen = [j.job_id for j in jobs]
+            while cursor is not None:
+                jobs, cursor = s.history.page(after=cursor, limit=4, reverse=True)
+                seen.extend(j.job_id for j in jobs)
+            self.assertEqual(seen, list(range(10, 0, -1)), storage)
+            self.assertEqual([j.job_id for j in s.history], list(range(1, 11)))
+            self.assertEqual([j.job_id for j in reversed(s.history)], list(range(10, 0, -1)))
+            self.assertEqual([j.job_id for j in s.history.page(after=8)[0]], [9, 10])
+            s.shutdown()
+        log_success("memory and sqlite history pages agree")
+
+    def test_queue_iteration_skips_removed_jobs(self):
+        """Iterating a queue yields live jobs in dequeue order for every queue type"""
+        for options in ({}, {"policy": "priority"}, {"storage": "sqlite"}):
+            s = Scheduler(**options)
+            for i in range(1, 6):
+                s.submit_task(i, priority=i)
+            s.cancel(2)
+            s.move_to_front(4)
+            expected = [4, 1, 3, 5] if not options.get("policy") else [4, 5, 3, 1]
+            it = iter(s.queue)
+            self.assertEqual(next(it).job_id, 4)
+            self.assertEqual([j.job_id for j in s.queue], expected, options)
+            self.assertEqual([j.job_id for j in s.queue.to_list()], expected)
+            s.shutdown()
+        w = WorkStealingScheduler(workers=2)
+        w.submit_many(range(4))
+        w.cancel(1)
+        self.assertEqual(sorted(j.job_id for j in w.queue), [0, 2, 3])
+        log_success("queues iterate lazily in dequeue order")
+
+
+class TestBackgroundSave(BaseLoggedTest):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_snapshot_is_point_in_time(self):
+        """save_async captures the state at the call; later work is not in the file"""
+        methods = ["thread"] + (["fork"] if hasattr(os, "fork") else [])
+        for method in methods:
+            for cls in (Scheduler, ConcurrentScheduler):
+                s = cls()
+                s.submit_many(range(100))
+                s.run_batch(60)
+                handle = s.save_async(self.path, method=method)
+                self.assertIsInstance(handle, SnapshotHandle)
+                s.run_all()
+                s.submit_many(range(100, 110))
+                self.assertEqual(handle.result(timeout=30), self.path)
+                self.assertEqual((handle.status, handle.error, handle.method), ("done", None, method))
+
+                restored = Scheduler()
+                restored.load_from_file(self.path)
+                self.assertEqual((len(restored.history), restored.queue.size), (60, 40), method)
+                self.assertEqual(restored.queue.peek().job_id, 60)
+                self.assertFalse(os.path.exists(self.path + ".tmp"))
+        log_success(f"background saves ({', '.join(methods)}) wrote the state as of the call")
+
+    def test_failed_save_reports_error_and_keeps_old_file(self):
+        """A failing write leaves the previous file and surfaces the error"""
+        s = Scheduler()
+        s.submit_many(range(3))
+        s.save_to_file(self.path)
+        s.run_all()
+        bad = os.path.join(self.tmp.name, "missing", "state.json")
+        methods = ["thread"] + (["fork"] if hasattr(os, "fork") else [])
+        for method in methods:
+            handle = s.save_async(bad, method=method)
+            self.assertTrue(handle.wait(30))
+            self.assertEqual(handle.status, "failed")
+            with self.assertRaises(Exception):
+                handle.result()
+        restored = Scheduler()
+        restored.load_from_file(self.path)
+        self.assertEqual(restored.queue.size, 3)
+        with self.assertRaises(ValueError):
+            s.save_async(self.path, method="spawn")
+        with self.assertRaises(ValueError):
+            Scheduler(storage="sqlite").save_async(self.path, method="fork")
+        log_success("failed background save reported its error")
+
+    def test_thread_save_for_sqlite_and_work_stealing(self):
+        """Schedulers that cannot fork safely default to the thread writer"""
+        for s in (Scheduler(storage="sqlite"), WorkStealingScheduler(workers=2)):
+            s.submit_many(range(10))
+            s.run_batch(4)
+            handle = s.save_async(self.path, format="binary")
+            self.assertEqual(handle.method, "thread")
+            s.shutdown()
+            self.assertTrue(handle.done())
+            restored = Scheduler()
+            restored.load_from_file(self.path)
+            self.assertEqual((len(restored.history), restored.queue.size), (4, 6))
+        log_success("sqlite and work-stealing schedulers saved through a thread")
+
+
 class TestCollisionHandling(BaseLoggedTest):
     def test_hash_table_chaining(self):
         """HashTable handles collisions via chaining; search and removal operate correctly"""
@@ -130,5 +1800,56 @@ class TestCollisionHandling(BaseLoggedTest):
         log_success("HashTable chaining stored Jobs [3,6,9]; removal of Job(6) succeeded and others remained retrievable")
 
 
+class TestHashTableResizing(BaseLoggedTest):
+    def test_hash_table_grows_incrementally_and_keeps_items(self):
+        """HashTable grows past max_load_factor and keeps every item findable during rehash"""
+        ht = HashTable(size=3, max_load_factor=1.0, rehash_step=1)
+        jobs = [Job(i) for i in range(200)]
+        for j in jobs:
+            ht.insert(j)
+            # Every previously inserted job stays findable mid-rehash
+            self.assertIs(ht.search(j.job_id), j)
+        ht.finish_rehash()
+        self.assertGreater(ht.size, 3)
+        self.assertLessEqual(ht.load_factor(), 1.0)
+        self.assertEqual(len(ht), 200)
+        for j in jobs:
+            self.assertIs(ht.search(j.job_id), j)
+        with self.assertRaises(ValueError):
+            ht.insert(Job(150))
+        log_success(f"HashTable grew from 3 to {ht.size} buckets with all 200 jobs retrievable")
+
+    def test_hash_table_shrinks_but_not_below_initial_size(self):
+        """HashTable shrinks after removals but never below its initial size"""
+        ht = HashTable(size=5, max_load_factor=1.0, min_load_factor=0.25)
+        for i in range(500):
+            ht.insert(Job(i))
+        ht.finish_rehash()
+        grown = ht.size
+        for i in range(500):
+            self.assertIsNotNone(ht.remove(i))
+        ht.finish_rehash()
+        self.assertLess(ht.size, grown)
+        self.assertEqual(ht.size, 5)
+        self.assertEqual(len(ht), 0)
+        log_success(f"HashTable shrank from {grown} back to 5 buckets after removing all jobs")
+
+    def test_chain_stats_and_fixed_size(self):
+        """chain_stats reports short chains; max_load_factor=None keeps a fixed size"""
+        s = Scheduler(hash_size=7)
+        for i in range(5000):
+            s.submit_task(i)
+        stats = s.hash.chain_stats()
+        self.assertEqual(stats["count"], 5000)
+        self.assertLessEqual(stats["max_chain"], 4)
+
+        fixed = HashTable(size=7, max_load_factor=None)
+        for i in range(100):
+            fixed.insert(Job(i))
+        self.assertEqual(fixed.size, 7)
+        self.assertGreaterEqual(fixed.chain_stats()["max_chain"], 14)
+        log_success(f"Scheduler(7) kept max chain at {stats['max_chain']} for 5000 jobs; fixed table stayed at 7 buckets")
+
+
 if __name__ == "__main__":
     unittest.main()